@@ -18,10 +18,75 @@ class Settings(BaseSettings):
     DATABASE_URL: str
     DATABASE_ECHO: bool = False
     
+    # Database Pool Configuration
+    DATABASE_POOL_ENABLED: bool = True  # False falls back to NullPool
+    DATABASE_POOL_SIZE: int = 10
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_TIMEOUT: float = 30.0
+    DATABASE_POOL_RECYCLE: int = 1800  # seconds, -1 disables recycling
+    DATABASE_POOL_PRE_PING: bool = True
+    
+    # Read Replicas (optional)
+    DATABASE_REPLICA_URLS: list = []
+    DATABASE_REPLICA_MAX_LAG: float = 5.0  # seconds
+    DATABASE_REPLICA_CHECK_INTERVAL: float = 10.0  # seconds
+    
+    # History Writer
+    HISTORY_QUEUE_SIZE: int = 10000
+    HISTORY_BATCH_SIZE: int = 500
+    HISTORY_FLUSH_INTERVAL: float = 2.0  # seconds
+    HISTORY_BACKPRESSURE: str = "drop_oldest"  # drop_oldest or block
+    
+    # Partitioning and Retention (months, 0 keeps data forever)
+    PARTITION_PREMAKE_MONTHS: int = 3
+    HISTORY_RETENTION_MONTHS: int = 12
+    SYMPTOMS_RETENTION_MONTHS: int = 24
+    
     # Redis Configuration
     REDIS_URL: Optional[str] = None
     REDIS_DB: int = 0
     
+    # Two-tier cache defaults
+    CACHE_NEGATIVE_TTL: float = 60.0  # seconds, for keys whose loader found nothing
+    CACHE_TTL_JITTER: float = 0.1  # +-10% of TTL
+    
+    # Language Cache (telegram_id -> language)
+    LANGUAGE_CACHE_SIZE: int = 100000
+    LANGUAGE_CACHE_TTL: float = 3600.0  # seconds
+    
+    # Rendered city listings of clinics/pharmacies/shelters
+    CITY_LISTING_CACHE_TTL: float = 3600.0  # seconds
+    
+    # News feed (rendered pages are keyed by the feed version)
+    NEWS_CACHE_TTL: float = 3600.0  # seconds
+    NEWS_VERSION_TTL: float = 300.0  # seconds, bounds staleness if an invalidation is missed
+    
+    # FSM Storage (Redis when REDIS_URL is set, bounded memory otherwise)
+    FSM_STATE_TTL: int = 24 * 60 * 60  # seconds, for states without own TTL
+    FSM_MEMORY_MAX_ENTRIES: int = 10000
+    
+    # Reminders (dates and times entered by users are in this timezone)
+    REMINDER_TIMEZONE: str = "Asia/Tashkent"
+    REMINDER_DISPATCH_MODE: str = "heap"  # heap (single instance) or lease (several replicas)
+    REMINDER_LEASE_SECONDS: float = 60.0  # lease mode: claimed reminders are retried after this
+    REMINDER_POLL_INTERVAL: float = 1.0  # seconds, lease mode
+    REMINDER_CATCHUP_GRACE: float = 60.0  # seconds overdue before a reminder counts as missed
+    REMINDER_CATCHUP_WINDOW: float = 600.0  # seconds to spread missed reminders over after downtime
+    REMINDER_DIGEST_WINDOW: float = 60.0  # a user's reminders due this many seconds apart share one message
+    REMINDER_RETRY_DELAY: float = 60.0  # seconds before a reminder whose message failed is sent again
+    
+    # Outbound messages (Telegram: ~30 msg/s per bot, 1 msg/s per chat)
+    OUTBOUND_GLOBAL_RATE: float = 30.0  # messages per second
+    OUTBOUND_CHAT_RATE: float = 1.0  # messages per second per chat
+    OUTBOUND_WORKERS: int = 8
+    OUTBOUND_MAX_RETRIES: int = 3  # after TelegramRetryAfter
+    
+    # Broadcasts (/broadcast, admins only)
+    ADMIN_IDS: list = []  # telegram IDs, e.g. [123456789]
+    BROADCAST_SEGMENT_SIZE: int = 10000  # recipients read per query
+    BROADCAST_IN_FLIGHT: int = 100  # messages queued at a time
+    BROADCAST_CHECKPOINT_INTERVAL: float = 5.0  # seconds
+    
     # Application Settings
     DEBUG: bool = False
     LOG_LEVEL: str = "INFO"
@@ -1,11 +1,29 @@
 """Database module"""
 
-from .database import get_db, init_db
-from .models import Base, User, Pet, VetProfile, Clinic, Reminder, Ad, History
+from .database import (
+    get_db,
+    init_db,
+    close_db,
+    get_pool_stats,
+    get_replica_stats,
+    count_queries,
+    use_primary,
+    replica_router,
+    AsyncSessionLocal,
+)
+from .models import Base, User, Pet, VetProfile, Clinic, Reminder, Ad, News, Broadcast, History
+from .read_models import ProfileView, PetView, VetProfileView, ReminderView
 
 __all__ = [
     "get_db",
     "init_db",
+    "close_db",
+    "get_pool_stats",
+    "get_replica_stats",
+    "count_queries",
+    "use_primary",
+    "replica_router",
+    "AsyncSessionLocal",
     "Base",
     "User",
     "Pet",
@@ -13,5 +31,11 @@ __all__ = [
     "Clinic",
     "Reminder",
     "Ad",
+    "News",
+    "Broadcast",
     "History",
+    "ProfileView",
+    "PetView",
+    "VetProfileView",
+    "ReminderView",
 ]
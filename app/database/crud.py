@@ -2,23 +2,47 @@
 CRUD operations for database models
 """
 
-from typing import Optional, List
+from typing import Optional, Dict, List, Tuple
 from datetime import datetime
-from sqlalchemy import select, update, delete
+from sqlalchemy import select, update, delete, insert, tuple_, and_, or_, exists, func, union_all
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload, load_only
 
-from .models import User, Pet, VetProfile, Clinic, Reminder, Ad, History, Symptom
+from .models import User, Pet, VetProfile, Clinic, Reminder, Ad, News, Broadcast, History, Symptom
+from .read_models import ProfileView, PetView, VetProfileView, ReminderView
 
 
 # ==================== USER OPERATIONS ====================
 
+# Key in session.info holding users already loaded by telegram ID
+_USER_CACHE_KEY = "users_by_telegram_id"
+
+
+def _remember_user(session: AsyncSession, telegram_id: int, user: Optional[User]) -> None:
+    """Store user (or its absence) in the session-scoped lookup cache"""
+    session.info.setdefault(_USER_CACHE_KEY, {})[telegram_id] = user
+
+
 async def get_user(session: AsyncSession, telegram_id: int) -> Optional[User]:
-    """Get user by telegram ID"""
+    """
+    Get user by telegram ID
+    
+    Lookups are memoized for the lifetime of the session, so repeated calls
+    within one update cost a single SELECT.
+    """
+    cache = session.info.get(_USER_CACHE_KEY, {})
+    if telegram_id in cache:
+        user = cache[telegram_id]
+        if user is None or user in session:
+            return user
+    
     result = await session.execute(
         select(User).where(User.telegram_id == telegram_id)
     )
-    return result.scalar_one_or_none()
+    user = result.scalar_one_or_none()
+    _remember_user(session, telegram_id, user)
+    return user
 
 
 async def create_user(
@@ -39,6 +63,91 @@ async def create_user(
     )
     session.add(user)
     await session.flush()
+    _remember_user(session, telegram_id, user)
+    return user
+
+
+async def upsert_user(
+    session: AsyncSession,
+    telegram_id: int,
+    username: Optional[str] = None,
+    first_name: Optional[str] = None,
+    last_name: Optional[str] = None,
+    language: str = "ru"
+) -> User:
+    """
+    Create user or refresh Telegram-provided fields in one round trip
+    
+    Uses INSERT ... ON CONFLICT (telegram_id) DO UPDATE, writing only when
+    username or names actually changed. The stored language is never
+    overwritten, since users pick it explicitly. Users who blocked the bot
+    and came back are marked active again.
+    """
+    now = datetime.utcnow()
+    stmt = pg_insert(User).values(
+        telegram_id=telegram_id,
+        username=username,
+        first_name=first_name,
+        last_name=last_name,
+        language=language,
+        created_at=now,
+        updated_at=now,
+    )
+    excluded = stmt.excluded
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[User.telegram_id],
+        set_={
+            "username": excluded.username,
+            "first_name": excluded.first_name,
+            "last_name": excluded.last_name,
+            "updated_at": excluded.updated_at,
+            "is_active": True,
+        },
+        where=or_(
+            User.is_active == False,
+            User.username.is_distinct_from(excluded.username),
+            User.first_name.is_distinct_from(excluded.first_name),
+            User.last_name.is_distinct_from(excluded.last_name),
+        ),
+    )
+    
+    # Unchanged rows are not returned by the upsert, so fall back to the
+    # existing row within the same statement
+    upserted = stmt.returning(*User.__table__.c).cte("upserted")
+    query = select(User).from_statement(
+        union_all(
+            select(upserted),
+            select(User.__table__).where(
+                User.telegram_id == telegram_id,
+                ~exists(select(upserted.c.id)),
+            ),
+        )
+    ).execution_options(populate_existing=True)
+    
+    result = await session.execute(query)
+    user = result.scalar_one_or_none()
+    if user is None:
+        # Row inserted concurrently after this statement's snapshot was taken
+        result = await session.execute(
+            select(User).where(User.telegram_id == telegram_id)
+        )
+        user = result.scalar_one()
+    
+    _remember_user(session, telegram_id, user)
+    return user
+
+
+async def _update_user(session: AsyncSession, telegram_id: int, values: dict) -> Optional[User]:
+    """Apply column updates with a single UPDATE ... RETURNING"""
+    result = await session.execute(
+        update(User)
+        .where(User.telegram_id == telegram_id)
+        .values(**values, updated_at=datetime.utcnow())
+        .returning(User)
+        .execution_options(populate_existing=True)
+    )
+    user = result.scalar_one_or_none()
+    _remember_user(session, telegram_id, user)
     return user
 
 
@@ -50,20 +159,18 @@ async def update_user_profile(
     city: Optional[str] = None,
 ) -> Optional[User]:
     """Update user profile"""
-    user = await get_user(session, telegram_id)
-    if not user:
-        return None
-    
+    values = {}
     if owner_name is not None:
-        user.owner_name = owner_name
+        values["owner_name"] = owner_name
     if owner_phone is not None:
-        user.owner_phone = owner_phone
+        values["owner_phone"] = owner_phone
     if city is not None:
-        user.city = city
+        values["city"] = city
     
-    user.updated_at = datetime.utcnow()
-    await session.flush()
-    return user
+    if not values:
+        return await get_user(session, telegram_id)
+    
+    return await _update_user(session, telegram_id, values)
 
 
 async def update_user_language(
@@ -72,14 +179,107 @@ async def update_user_language(
     language: str
 ) -> Optional[User]:
     """Update user language preference"""
-    user = await get_user(session, telegram_id)
-    if not user:
+    return await _update_user(session, telegram_id, {"language": language})
+
+
+# ==================== PROFILE AGGREGATE ====================
+
+# Recent reminders included in a profile aggregate
+PROFILE_REMINDERS_LIMIT = 5
+
+
+async def get_profile_aggregate(
+    session: AsyncSession,
+    telegram_id: int,
+    reminders_limit: int = PROFILE_REMINDERS_LIMIT
+) -> Optional[ProfileView]:
+    """
+    Get user profile with pets, vet profile and upcoming reminders
+    
+    Two round trips: the user row joined with its vet profile and pets
+    (a handful of rows per user), then the next reminders_limit active
+    reminders by next_fire_at, so users with many reminders load no more
+    rows than are shown. Only the columns shown in the profile are selected.
+    
+    Args:
+        session: Database session
+        telegram_id: User telegram ID
+        reminders_limit: Maximum number of reminders to include
+    
+    Returns:
+        Detached read model or None if the user does not exist
+    """
+    result = await session.execute(
+        select(User)
+        .where(User.telegram_id == telegram_id)
+        .options(
+            load_only(
+                User.id, User.telegram_id, User.language,
+                User.owner_name, User.owner_phone, User.city,
+            ),
+            joinedload(User.vet_profile).load_only(
+                VetProfile.vet_name, VetProfile.vet_phone, VetProfile.vet_city,
+                VetProfile.specialization, VetProfile.experience_years,
+                VetProfile.education, VetProfile.telegram_contact,
+                VetProfile.consultation_price, VetProfile.additional_info,
+                VetProfile.is_active,
+            ),
+            joinedload(User.pets).load_only(
+                Pet.id, Pet.name, Pet.pet_type, Pet.breed, Pet.age,
+            ),
+        )
+    )
+    user = result.unique().scalar_one_or_none()
+    if user is None:
         return None
     
-    user.language = language
-    user.updated_at = datetime.utcnow()
-    await session.flush()
-    return user
+    result = await session.execute(
+        select(
+            Reminder.id, Reminder.text, Reminder.reminder_type,
+            Reminder.reminder_date, Reminder.reminder_time,
+        )
+        .where(Reminder.user_id == user.id, Reminder.is_active == True)
+        .order_by(Reminder.next_fire_at.asc().nulls_last(), Reminder.id)
+        .limit(reminders_limit)
+    )
+    reminders = result.all()
+    
+    vet = user.vet_profile
+    
+    return ProfileView(
+        user_id=user.id,
+        telegram_id=user.telegram_id,
+        language=user.language,
+        owner_name=user.owner_name,
+        owner_phone=user.owner_phone,
+        city=user.city,
+        pets=tuple(
+            PetView(id=p.id, name=p.name, pet_type=p.pet_type, breed=p.breed, age=p.age)
+            for p in sorted(user.pets, key=lambda p: p.id)
+        ),
+        vet_profile=VetProfileView(
+            vet_name=vet.vet_name,
+            vet_phone=vet.vet_phone,
+            vet_city=vet.vet_city,
+            specialization=vet.specialization,
+            experience_years=vet.experience_years,
+            education=vet.education,
+            telegram_contact=vet.telegram_contact,
+            consultation_price=vet.consultation_price,
+            additional_info=vet.additional_info,
+            is_active=vet.is_active,
+        ) if vet else None,
+        reminders=tuple(
+            ReminderView(
+                id=r.id,
+                text=r.text,
+                reminder_type=r.reminder_type,
+                reminder_date=r.reminder_date,
+                reminder_time=r.reminder_time,
+            )
+            for r in reminders
+        ),
+    )
 
 
 # ==================== PET OPERATIONS ====================
@@ -199,6 +399,451 @@ async def get_user_reminders(
     return list(result.scalars().all())
 
 
+async def deactivate_reminder(session: AsyncSession, user_id: int, reminder_id: int) -> bool:
+    """Deactivate user's reminder, returns False if it was not found"""
+    result = await session.execute(
+        update(Reminder)
+        .where(Reminder.id == reminder_id, Reminder.user_id == user_id)
+        .values(is_active=False)
+    )
+    return result.rowcount > 0
+
+
+async def stream_active_reminders(
+    session: AsyncSession,
+    batch_size: int = 10000,
+    only_missing: bool = False
+):
+    """
+    Stream scheduling columns of active reminders
+
+    Rows are fetched with a server-side cursor in batches, so loading a
+    large table does not build every row in memory at once.
+    """
+    query = select(
+        Reminder.id,
+        Reminder.reminder_type,
+        Reminder.reminder_date,
+        Reminder.reminder_time,
+        Reminder.reminder_days,
+        Reminder.last_sent,
+        Reminder.created_at,
+    ).where(Reminder.is_active == True)
+
+    if only_missing:
+        query = query.where(Reminder.next_fire_at.is_(None))
+
+    result = await session.stream(query.execution_options(yield_per=batch_size))
+    async for row in result:
+        yield row
+
+
+async def stream_reminder_fire_times(session: AsyncSession, batch_size: int = 10000):
+    """Stream (id, next_fire_at) of active reminders that have a fire time"""
+    query = (
+        select(Reminder.id, Reminder.next_fire_at)
+        .where(Reminder.is_active == True, Reminder.next_fire_at.is_not(None))
+        .execution_options(yield_per=batch_size)
+    )
+    result = await session.stream(query)
+    async for row in result:
+        yield row
+
+
+async def stream_overdue_reminders(session: AsyncSession, before: datetime, batch_size: int = 10000):
+    """Stream IDs of active, unleased reminders due before the given time, oldest first"""
+    query = (
+        select(Reminder.id)
+        .where(
+            Reminder.is_active == True,
+            Reminder.next_fire_at < before,
+            or_(Reminder.lease_expires_at.is_(None), Reminder.lease_expires_at < before),
+        )
+        .order_by(Reminder.next_fire_at)
+        .execution_options(yield_per=batch_size)
+    )
+    result = await session.stream_scalars(query)
+    async for reminder_id in result:
+        yield reminder_id
+
+
+async def reschedule_reminders(session: AsyncSession, fire_times: List[Tuple[int, datetime]]) -> None:
+    """Move next fire times of reminders in one executemany UPDATE"""
+    if not fire_times:
+        return
+
+    await session.execute(
+        update(Reminder),
+        [{"id": reminder_id, "next_fire_at": fire_at} for reminder_id, fire_at in fire_times]
+    )
+
+
+async def get_due_reminders(
+    session: AsyncSession,
+    reminder_ids: List[int],
+    digest_until: Optional[datetime] = None
+):
+    """
+    Get active reminders by ID together with the owner's telegram_id and language
+
+    When digest_until is given, other active reminders of the same users
+    due before it are returned as well, so they can share one message.
+    """
+    if not reminder_ids:
+        return []
+
+    condition = Reminder.id.in_(reminder_ids)
+    if digest_until is not None:
+        owners = select(Reminder.user_id).where(Reminder.id.in_(reminder_ids))
+        condition = or_(condition, and_(Reminder.user_id.in_(owners), Reminder.next_fire_at <= digest_until))
+
+    query = (
+        select(
+            Reminder.id,
+            Reminder.text,
+            Reminder.reminder_type,
+            Reminder.reminder_date,
+            Reminder.reminder_time,
+            Reminder.reminder_days,
+            Reminder.last_sent,
+            Reminder.created_at,
+            Reminder.next_fire_at,
+            User.telegram_id,
+            User.language,
+        )
+        .join(User, User.id == Reminder.user_id)
+        .where(condition, Reminder.is_active == True)
+    )
+    result = await session.execute(query)
+    return list(result.all())
+
+
+async def claim_due_reminders(
+    session: AsyncSession,
+    owner: str,
+    now: datetime,
+    lease_until: datetime,
+    limit: int,
+    digest_until: Optional[datetime] = None
+):
+    """
+    Lease due reminders to a worker and return them with the owner's telegram_id and language
+
+    One statement: UPDATE ... WHERE id IN (SELECT ... FOR UPDATE SKIP LOCKED)
+    RETURNING. Rows being claimed by another worker at the same moment are
+    skipped instead of waited for, and rows whose lease expired (the worker
+    died before finishing) are claimable again. The caller must commit
+    before delivering so the lease becomes visible to other workers.
+
+    When digest_until is given, unleased reminders of the same users due
+    before it are claimed in the same statement, so they can share one
+    message. They are locked with SKIP LOCKED as well: a row another worker
+    is claiming is left to that worker rather than waited for, which could
+    deadlock two workers claiming each other's digest rows.
+    """
+    unleased = or_(Reminder.lease_expires_at.is_(None), Reminder.lease_expires_at < now)
+    due = (
+        select(Reminder.id, Reminder.user_id)
+        .where(Reminder.is_active == True, Reminder.next_fire_at <= now, unleased)
+        .order_by(Reminder.next_fire_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .cte("due")
+    )
+    condition = Reminder.id.in_(select(due.c.id))
+    if digest_until is not None:
+        # Locked like the due rows: the UPDATE only touches rows this statement holds
+        digest = (
+            select(Reminder.id)
+            .where(
+                Reminder.user_id.in_(select(due.c.user_id)),
+                Reminder.is_active == True,
+                Reminder.next_fire_at <= digest_until,
+                unleased,
+            )
+            .with_for_update(skip_locked=True)
+            .cte("digest")
+        )
+        condition = or_(condition, Reminder.id.in_(select(digest.c.id)))
+    claimed = (
+        update(Reminder)
+        .where(condition)
+        .values(lease_owner=owner, lease_expires_at=lease_until)
+        .returning(
+            Reminder.id,
+            Reminder.user_id,
+            Reminder.text,
+            Reminder.reminder_type,
+            Reminder.reminder_date,
+            Reminder.reminder_time,
+            Reminder.reminder_days,
+            Reminder.last_sent,
+            Reminder.created_at,
+            Reminder.next_fire_at,
+        )
+        .cte("claimed")
+    )
+    query = select(
+        claimed.c.id,
+        claimed.c.text,
+        claimed.c.reminder_type,
+        claimed.c.reminder_date,
+        claimed.c.reminder_time,
+        claimed.c.reminder_days,
+        claimed.c.last_sent,
+        claimed.c.created_at,
+        claimed.c.next_fire_at,
+        User.telegram_id,
+        User.language,
+    ).join(User, User.id == claimed.c.user_id)
+
+    result = await session.execute(query)
+    return list(result.all())
+
+
+async def set_next_fire_times(
+    session: AsyncSession,
+    fire_times: List[Tuple[int, Optional[datetime]]],
+    sent_at: Optional[datetime] = None,
+    lease_owner: Optional[str] = None
+) -> None:
+    """
+    Store next fire times by reminder ID in one executemany UPDATE
+
+    Reminders without a next fire time (None) are deactivated and leases
+    are released. When sent_at is given it is recorded as last_sent of every
+    listed reminder. When lease_owner is given, only rows still leased to
+    that worker are updated; otherwise rows under a live lease are skipped,
+    so a recompute running during dispatch leaves them to their worker.
+    """
+    if not fire_times:
+        return
+
+    values = [
+        {
+            "id": reminder_id,
+            "next_fire_at": fire_at,
+            "is_active": fire_at is not None,
+            "lease_owner": None,
+            "lease_expires_at": None,
+        }
+        for reminder_id, fire_at in fire_times
+    ]
+    if sent_at is not None:
+        for value in values:
+            value["last_sent"] = sent_at
+
+    if lease_owner is not None:
+        condition = Reminder.lease_owner == lease_owner
+    else:
+        condition = or_(Reminder.lease_expires_at.is_(None), Reminder.lease_expires_at < datetime.utcnow())
+    # Rows are not loaded in the session, nothing to synchronize
+    stmt = update(Reminder).where(condition).execution_options(synchronize_session=None)
+    await session.execute(stmt, values)
+
+
+async def mark_reminders_sent(
+    session: AsyncSession,
+    reminder_ids: List[int],
+    sent_at: datetime,
+    next_fire_times: Dict[int, Optional[datetime]],
+    lease_owner: Optional[str] = None
+) -> None:
+    """
+    Store next fire times of dispatched reminders and release their leases
+    
+    last_sent is recorded only for reminder_ids (the delivered ones); the
+    others keep it, with the retry time as their next fire time.
+    """
+    sent = set(reminder_ids)
+    await set_next_fire_times(
+        session, [(i, t) for i, t in next_fire_times.items() if i in sent],
+        sent_at=sent_at, lease_owner=lease_owner
+    )
+    await set_next_fire_times(
+        session, [(i, t) for i, t in next_fire_times.items() if i not in sent],
+        lease_owner=lease_owner
+    )
+
+
+# ==================== NEWS OPERATIONS ====================
+
+async def create_news(
+    session: AsyncSession,
+    body_ru: str,
+    body_en: Optional[str] = None,
+    body_uz: Optional[str] = None
+) -> News:
+    """Create published news item"""
+    now = datetime.utcnow()
+    news = News(
+        body_ru=body_ru,
+        body_en=body_en,
+        body_uz=body_uz,
+        is_published=True,
+        published_at=now,
+        created_at=now,
+        updated_at=now,
+    )
+    session.add(news)
+    await session.flush()
+    return news
+
+
+async def update_news(
+    session: AsyncSession,
+    news_id: int,
+    body_ru: Optional[str] = None,
+    body_en: Optional[str] = None,
+    body_uz: Optional[str] = None,
+    is_published: Optional[bool] = None
+) -> Optional[News]:
+    """Edit news item bodies or (un)publish it; always bumps updated_at"""
+    values = {}
+    if body_ru is not None:
+        values["body_ru"] = body_ru
+    if body_en is not None:
+        values["body_en"] = body_en
+    if body_uz is not None:
+        values["body_uz"] = body_uz
+    if is_published is not None:
+        values["is_published"] = is_published
+    
+    result = await session.execute(
+        update(News)
+        .where(News.id == news_id)
+        .values(**values, updated_at=datetime.utcnow())
+        .returning(News)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one_or_none()
+
+
+async def get_news_page(
+    session: AsyncSession,
+    limit: int = 5,
+    after: Optional[Tuple[datetime, int]] = None
+) -> Tuple[List[News], Optional[Tuple[datetime, int]]]:
+    """
+    Get one page of published news, newest first, using keyset pagination
+    
+    Args:
+        session: Database session
+        limit: Page size
+        after: (published_at, id) key of the last item on the previous page
+    
+    Returns:
+        Items on the page and the key for the next page (None on the last page)
+    """
+    query = select(News).where(News.is_published == True)
+    
+    if after is not None:
+        query = query.where(tuple_(News.published_at, News.id) < tuple_(*after))
+    
+    query = query.order_by(News.published_at.desc(), News.id.desc()).limit(limit + 1)
+    
+    result = await session.execute(query)
+    return _split_page(list(result.scalars().all()), limit, key="published_at")
+
+
+async def get_news_version(session: AsyncSession) -> str:
+    """
+    Version of the published news feed
+    
+    Built from the number of published items and the latest updated_at of
+    any item, so it changes when an item is added, edited, unpublished or
+    deleted.
+    """
+    result = await session.execute(
+        select(func.count().filter(News.is_published == True), func.max(News.updated_at))
+    )
+    count, last_change = result.one()
+    return f"{count}.{last_change:%Y%m%d%H%M%S%f}" if last_change else f"{count}.0"
+
+
+# ==================== BROADCAST OPERATIONS ====================
+
+async def create_broadcast(session: AsyncSession, text: str, created_by: int, total: int) -> Broadcast:
+    """Create broadcast"""
+    broadcast = Broadcast(text=text, created_by=created_by, total=total, status="running",
+                          last_user_id=0, sent=0, failed=0, blocked=0)
+    session.add(broadcast)
+    await session.flush()
+    return broadcast
+
+
+async def get_broadcast(session: AsyncSession, broadcast_id: int) -> Optional[Broadcast]:
+    """Get broadcast by ID"""
+    return await session.get(Broadcast, broadcast_id)
+
+
+async def get_running_broadcasts(session: AsyncSession) -> List[Broadcast]:
+    """Get broadcasts that have not finished (to resume them after restart)"""
+    result = await session.execute(
+        select(Broadcast).where(Broadcast.status == "running").order_by(Broadcast.id)
+    )
+    return list(result.scalars().all())
+
+
+async def save_broadcast_progress(
+    session: AsyncSession,
+    broadcast_id: int,
+    last_user_id: int,
+    sent: int,
+    failed: int,
+    blocked: int,
+    status: Optional[str] = None
+) -> None:
+    """Store broadcast checkpoint and counters, and the final status when given"""
+    values = dict(last_user_id=last_user_id, sent=sent, failed=failed, blocked=blocked)
+    if status is not None:
+        values["status"] = status
+        if status != "running":
+            values["finished_at"] = datetime.utcnow()
+    
+    await session.execute(
+        update(Broadcast).where(Broadcast.id == broadcast_id).values(**values)
+    )
+
+
+async def count_active_users(session: AsyncSession, after_id: int = 0) -> int:
+    """Count users who have not blocked the bot, with ID greater than after_id"""
+    result = await session.execute(
+        select(func.count()).select_from(User).where(User.is_active == True, User.id > after_id)
+    )
+    return result.scalar_one()
+
+
+async def get_active_user_segment(
+    session: AsyncSession,
+    after_id: int,
+    limit: int
+) -> List[Tuple[int, int]]:
+    """
+    Get (id, telegram_id) of the next active users in ID order
+    
+    One keyset page per call, so the caller can end the transaction before
+    working through it.
+    """
+    result = await session.execute(
+        select(User.id, User.telegram_id)
+        .where(User.is_active == True, User.id > after_id)
+        .order_by(User.id)
+        .limit(limit)
+    )
+    return [tuple(row) for row in result.all()]
+
+
+async def deactivate_users(session: AsyncSession, user_ids: List[int]) -> None:
+    """Mark users as inactive (they blocked the bot)"""
+    if not user_ids:
+        return
+    
+    await session.execute(
+        update(User).where(User.id.in_(user_ids)).values(is_active=False)
+    )
+
+
 # ==================== AD OPERATIONS ====================
 
 async def create_ad(
@@ -256,6 +901,37 @@ async def get_all_ads(
     return list(result.scalars().all())
 
 
+async def get_ads_page(
+    session: AsyncSession,
+    limit: int = 5,
+    after: Optional[Tuple[datetime, int]] = None,
+    active_only: bool = True
+) -> Tuple[List[Ad], Optional[Tuple[datetime, int]]]:
+    """
+    Get one page of the ads feed using keyset pagination
+    
+    Args:
+        session: Database session
+        limit: Page size
+        after: (created_at, id) key of the last ad on the previous page
+        active_only: Only include active ads
+    
+    Returns:
+        Ads on the page and the key for the next page (None on the last page)
+    """
+    query = select(Ad)
+    
+    if active_only:
+        query = query.where(Ad.is_active == True)
+    if after is not None:
+        query = query.where(tuple_(Ad.created_at, Ad.id) < tuple_(*after))
+    
+    query = query.order_by(Ad.created_at.desc(), Ad.id.desc()).limit(limit + 1)
+    
+    result = await session.execute(query)
+    return _split_page(list(result.scalars().all()), limit)
+
+
 # ==================== HISTORY OPERATIONS ====================
 
 async def add_history(
@@ -270,13 +946,43 @@ async def add_history(
         user_id=user_id,
         action=action,
         action_type=action_type,
-        metadata=metadata,
+        extra_data=metadata,
     )
     session.add(history)
     await session.flush()
     return history
 
 
+async def add_history_bulk(session: AsyncSession, entries: List[dict]) -> int:
+    """
+    Add many history entries with a single multi-row INSERT
+    
+    Args:
+        session: Database session
+        entries: Dicts with user_id, action, action_type, metadata, created_at
+    
+    Returns:
+        Number of inserted rows
+    """
+    if not entries:
+        return 0
+    
+    await session.execute(
+        insert(History),
+        [
+            {
+                "user_id": entry["user_id"],
+                "action": entry["action"],
+                "action_type": entry.get("action_type"),
+                "extra_data": entry.get("metadata"),
+                "created_at": entry.get("created_at") or datetime.utcnow(),
+            }
+            for entry in entries
+        ],
+    )
+    return len(entries)
+
+
 async def get_user_history(
     session: AsyncSession,
     user_id: int,
@@ -292,6 +998,58 @@ async def get_user_history(
     return list(result.scalars().all())
 
 
+async def clear_user_history(session: AsyncSession, user_id: int) -> int:
+    """
+    Delete all history entries of a user
+    
+    Filtered on user_id only, so every monthly partition is scanned through
+    its user_id index.
+    
+    Returns:
+        Number of deleted entries
+    """
+    result = await session.execute(delete(History).where(History.user_id == user_id))
+    return result.rowcount
+
+
+async def get_user_history_page(
+    session: AsyncSession,
+    user_id: int,
+    limit: int = 10,
+    after: Optional[Tuple[datetime, int]] = None
+) -> Tuple[List[History], Optional[Tuple[datetime, int]]]:
+    """
+    Get one page of user history using keyset pagination
+    
+    Args:
+        session: Database session
+        user_id: Database user ID
+        limit: Page size
+        after: (created_at, id) key of the last entry on the previous page
+    
+    Returns:
+        Entries on the page and the key for the next page (None on the last page)
+    """
+    query = select(History).where(History.user_id == user_id)
+    
+    if after is not None:
+        query = query.where(tuple_(History.created_at, History.id) < tuple_(*after))
+    
+    query = query.order_by(History.created_at.desc(), History.id.desc()).limit(limit + 1)
+    
+    result = await session.execute(query)
+    return _split_page(list(result.scalars().all()), limit)
+
+
+def _split_page(rows: list, limit: int, key: str = "created_at") -> Tuple[list, Optional[Tuple[datetime, int]]]:
+    """Trim the look-ahead row and build the next page key from the key column and id"""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, (getattr(last, key), last.id)
+
+
 # ==================== CLINIC OPERATIONS ====================
 
 async def get_clinics_by_city(
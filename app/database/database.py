@@ -2,49 +2,379 @@
 Database connection and session management
 """
 
-from typing import AsyncGenerator
+import asyncio
+import itertools
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import AsyncGenerator, Dict, Any, Iterator, List, Optional
+from pathlib import Path
+from alembic.config import Config as AlembicConfig
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import Select, event, exc, text
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     AsyncEngine,
     create_async_engine,
     async_sessionmaker,
 )
-from sqlalchemy.pool import NullPool
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool, AsyncAdaptedQueuePool
 
 from app.config import settings
-from .models import Base
 
+# Alembic configuration at the project root
+ALEMBIC_CONFIG_PATH = Path(__file__).resolve().parents[2] / "alembic.ini"
 
-# Create async engine
-engine: AsyncEngine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DATABASE_ECHO,
-    poolclass=NullPool,  # Use NullPool for better async support
-    future=True,
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PoolMetrics:
+    """Counters collected from the connection pool"""
+
+    connections_created: int = 0
+    checkouts: int = 0
+    checkout_wait_total: float = 0.0
+    checkout_wait_max: float = 0.0
+    checkout_timeouts: int = 0
+
+    @property
+    def checkout_wait_avg(self) -> float:
+        """Average time spent waiting for a connection, in seconds"""
+        if not self.checkouts:
+            return 0.0
+        return self.checkout_wait_total / self.checkouts
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that records how long checkouts wait for a free connection
+    """
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            pool_metrics.checkout_timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            pool_metrics.checkouts += 1
+            pool_metrics.checkout_wait_total += waited
+            if waited > pool_metrics.checkout_wait_max:
+                pool_metrics.checkout_wait_max = waited
+
+
+def _create_engine(url: str) -> AsyncEngine:
+    """
+    Create async engine according to pool settings
+
+    Args:
+        url: Database URL
+
+    Returns:
+        Configured AsyncEngine
+    """
+    if not settings.DATABASE_POOL_ENABLED:
+        return create_async_engine(
+            url,
+            echo=settings.DATABASE_ECHO,
+            poolclass=NullPool,
+            future=True,
+        )
+
+    return create_async_engine(
+        url,
+        echo=settings.DATABASE_ECHO,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DATABASE_POOL_SIZE,
+        max_overflow=settings.DATABASE_MAX_OVERFLOW,
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+        pool_recycle=settings.DATABASE_POOL_RECYCLE,
+        pool_pre_ping=settings.DATABASE_POOL_PRE_PING,
+        future=True,
+    )
+
+
+@dataclass
+class QueryCounter:
+    """Number of SQL statements sent to the database within a scope"""
+
+    count: int = 0
+
+
+_query_counter: ContextVar[Optional[QueryCounter]] = ContextVar("query_counter", default=None)
+
+
+def _on_connect(dbapi_connection, connection_record) -> None:
+    """Count physical connections opened by the engine"""
+    pool_metrics.connections_created += 1
+
+
+def _on_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    """Count statements issued inside an active count_queries() scope"""
+    counter = _query_counter.get()
+    if counter is not None:
+        counter.count += 1
+
+
+def _instrument(target: AsyncEngine) -> AsyncEngine:
+    """Attach connection and query counters to an engine"""
+    event.listen(target.sync_engine, "connect", _on_connect)
+    event.listen(target.sync_engine, "before_cursor_execute", _on_execute)
+    return target
+
+
+# Create async engines
+engine: AsyncEngine = _instrument(_create_engine(settings.DATABASE_URL))
+replica_engines: List[AsyncEngine] = [
+    _instrument(_create_engine(url)) for url in settings.DATABASE_REPLICA_URLS
+]
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryCounter]:
+    """
+    Count SQL statements issued in the current context
+
+    Usage:
+        with count_queries() as counter:
+            await crud.get_user(session, telegram_id)
+        print(counter.count)
+    """
+    counter = QueryCounter()
+    token = _query_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _query_counter.reset(token)
+
+
+# Replication lag in seconds; 0 when the replica has replayed everything it received
+REPLICA_LAG_QUERY = text(
+    "SELECT CASE "
+    "WHEN NOT pg_is_in_recovery() "
+    "OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+    "END"
 )
 
+
+@dataclass
+class ReplicaState:
+    """Health and routing counters of a single replica"""
+
+    engine: AsyncEngine
+    healthy: bool = True
+    lag: float = 0.0
+    reads: int = 0
+    ejections: int = 0
+
+
+class ReplicaRouter:
+    """
+    Round-robin selection of healthy read replicas
+
+    A background task periodically measures replication lag and ejects
+    replicas that are unreachable or lag more than max_lag seconds; they
+    rejoin once a later check succeeds.
+    """
+
+    def __init__(
+        self,
+        engines: List[AsyncEngine],
+        max_lag: float = settings.DATABASE_REPLICA_MAX_LAG,
+        check_interval: float = settings.DATABASE_REPLICA_CHECK_INTERVAL,
+    ):
+        self.replicas = [ReplicaState(engine=replica) for replica in engines]
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.task: Optional[asyncio.Task] = None
+        self._next = itertools.count()
+
+    def choose(self) -> Optional[AsyncEngine]:
+        """
+        Pick the next healthy replica
+
+        Returns:
+            Replica engine, or None when reads must go to the primary
+        """
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        replica = healthy[next(self._next) % len(healthy)]
+        replica.reads += 1
+        return replica.engine
+
+    async def check(self) -> None:
+        """Measure lag of every replica and update its health"""
+        for replica in self.replicas:
+            try:
+                async with replica.engine.connect() as conn:
+                    lag = float((await conn.execute(REPLICA_LAG_QUERY)).scalar() or 0)
+                healthy = lag <= self.max_lag
+            except Exception as e:
+                logger.warning(f"Replica {replica.engine.url!r} check failed: {e}")
+                lag, healthy = float("inf"), False
+
+            if replica.healthy and not healthy:
+                replica.ejections += 1
+                logger.warning(f"Replica {replica.engine.url!r} ejected (lag {lag:.1f}s)")
+            elif healthy and not replica.healthy:
+                logger.info(f"Replica {replica.engine.url!r} back in rotation")
+            replica.lag = lag
+            replica.healthy = healthy
+
+    async def start(self):
+        """Start periodic health checks"""
+        if not self.replicas or self.task:
+            return
+        self.task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop periodic health checks"""
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    async def _run(self):
+        """Health check loop"""
+        while True:
+            try:
+                await self.check()
+            except Exception as e:
+                logger.error(f"Error checking replicas: {e}")
+            await asyncio.sleep(self.check_interval)
+
+
+replica_router = ReplicaRouter(replica_engines)
+
+
+# Key in session.info pinning the session to the primary
+_USE_PRIMARY_KEY = "use_primary"
+
+
+class RoutingSession(Session):
+    """
+    Session sending plain SELECTs to replicas and everything else to primary
+
+    Once a session writes (or use_primary() is called on it) all further
+    statements go to the primary, so handlers read their own writes.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self.info.get(_USE_PRIMARY_KEY):
+            return engine.sync_engine
+
+        if self._flushing or not isinstance(clause, Select) or clause._for_update_arg is not None:
+            self.info[_USE_PRIMARY_KEY] = True
+            return engine.sync_engine
+
+        replica = replica_router.choose()
+        return replica.sync_engine if replica else engine.sync_engine
+
+
+def use_primary(session: AsyncSession) -> None:
+    """Route all remaining statements of the session to the primary"""
+    session.info[_USE_PRIMARY_KEY] = True
+
+
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
     engine,
     class_=AsyncSession,
+    sync_session_class=RoutingSession,
     expire_on_commit=False,
     autocommit=False,
     autoflush=False,
 )
 
 
+def get_pool_stats() -> Dict[str, Any]:
+    """
+    Get connection pool statistics for sizing and monitoring
+
+    Returns:
+        Dictionary with pool state and accumulated metrics
+    """
+    pool = engine.pool
+    stats: Dict[str, Any] = {
+        "pool_class": type(pool).__name__,
+        "connections_created": pool_metrics.connections_created,
+        "checkouts": pool_metrics.checkouts,
+        "checkout_wait_avg_ms": pool_metrics.checkout_wait_avg * 1000,
+        "checkout_wait_max_ms": pool_metrics.checkout_wait_max * 1000,
+        "checkout_timeouts": pool_metrics.checkout_timeouts,
+    }
+
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        capacity = pool.size() + max(settings.DATABASE_MAX_OVERFLOW, 0)
+        checked_out = pool.checkedout()
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=checked_out,
+            overflow=pool.overflow(),
+            saturation=checked_out / capacity if capacity else 0.0,
+        )
+
+    return stats
+
+
+def get_replica_stats() -> List[Dict[str, Any]]:
+    """
+    Get health and routing statistics of read replicas
+
+    Returns:
+        One dictionary per configured replica
+    """
+    return [
+        {
+            "url": replica.engine.url.render_as_string(hide_password=True),
+            "healthy": replica.healthy,
+            "lag": replica.lag,
+            "reads": replica.reads,
+            "ejections": replica.ejections,
+        }
+        for replica in replica_router.replicas
+    ]
+
+
 async def init_db() -> None:
     """
-    Initialize database tables
+    Check that the database schema is up to date
+    
+    Tables are managed by Alembic migrations; run `alembic upgrade head`
+    before starting the bot.
     
-    Note: In production, use Alembic migrations instead
+    Raises:
+        RuntimeError: If the database is not at the latest migration
     """
-    async with engine.begin() as conn:
-        # Drop all tables (only for development!)
-        # await conn.run_sync(Base.metadata.drop_all)
-        
-        # Create all tables
-        await conn.run_sync(Base.metadata.create_all)
+    script = ScriptDirectory.from_config(AlembicConfig(str(ALEMBIC_CONFIG_PATH)))
+    expected = set(script.get_heads())
+    
+    async with engine.connect() as conn:
+        current = await conn.run_sync(
+            lambda sync_conn: set(MigrationContext.configure(sync_conn).get_current_heads())
+        )
+    
+    if current != expected:
+        raise RuntimeError(
+            f"Database schema is at revision {sorted(current) or 'none'}, "
+            f"expected {sorted(expected)}. Run `alembic upgrade head`."
+        )
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
@@ -69,4 +399,7 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
 
 async def close_db() -> None:
     """Close database connections"""
+    await replica_router.stop()
+    for replica in replica_engines:
+        await replica.dispose()
     await engine.dispose()
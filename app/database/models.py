@@ -4,7 +4,7 @@ SQLAlchemy database models
 
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import String, Integer, Boolean, DateTime, Text, ForeignKey, JSON
+from sqlalchemy import String, Integer, BigInteger, Boolean, DateTime, Text, ForeignKey, JSON, Index, text
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -18,7 +18,7 @@ class User(Base):
     __tablename__ = "users"
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    telegram_id: Mapped[int] = mapped_column(Integer, unique=True, index=True)
+    telegram_id: Mapped[int] = mapped_column(BigInteger, unique=True, index=True)
     username: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     first_name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     last_name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
@@ -29,6 +29,9 @@ class User(Base):
     owner_phone: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
     city: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
     
+    # False once the user blocked the bot, set again on /start
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True, server_default=text("true"))
+    
     # Timestamps
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -132,6 +135,9 @@ class Reminder(Base):
     
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     last_sent: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    next_fire_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)  # UTC, see app/services/recurrence.py
+    lease_owner: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)  # worker delivering it
+    lease_expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     
     # Relationships
@@ -160,32 +166,139 @@ class Ad(Base):
     user: Mapped["User"] = relationship("User", back_populates="ads")
 
 
+class News(Base):
+    """News item with a body per language (en/uz fall back to ru)"""
+    __tablename__ = "news"
+    
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    
+    # HTML bodies
+    body_ru: Mapped[str] = mapped_column(Text)
+    body_en: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    body_uz: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    
+    is_published: Mapped[bool] = mapped_column(Boolean, default=True)
+    published_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    # Bumped on every edit, including unpublishing; part of the feed version
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class Broadcast(Base):
+    """Message broadcast to all active users, resumable from its checkpoint"""
+    __tablename__ = "broadcasts"
+    
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    text: Mapped[str] = mapped_column(Text)
+    created_by: Mapped[int] = mapped_column(BigInteger)  # admin telegram_id
+    status: Mapped[str] = mapped_column(String(20), default="running")  # running, done
+    
+    # Checkpoint: users up to this ID have been handled
+    last_user_id: Mapped[int] = mapped_column(Integer, default=0)
+    total: Mapped[int] = mapped_column(Integer, default=0)  # active recipients when started
+    sent: Mapped[int] = mapped_column(Integer, default=0)
+    failed: Mapped[int] = mapped_column(Integer, default=0)
+    blocked: Mapped[int] = mapped_column(Integer, default=0)
+    
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+
 class History(Base):
-    """User action history model"""
+    """User action history model (partitioned by month of created_at)"""
     __tablename__ = "history"
+    __table_args__ = {"postgresql_partition_by": "RANGE (created_at)"}
     
-    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
     
     action: Mapped[str] = mapped_column(String(500))
     action_type: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)  # profile, reminder, ad, etc.
-    metadata: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    # "metadata" is reserved by the declarative API, so map the column under another name
+    extra_data: Mapped[Optional[dict]] = mapped_column("metadata", JSON, nullable=True)
     
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    # Part of the primary key because it is the partition key
+    created_at: Mapped[datetime] = mapped_column(DateTime, primary_key=True, default=datetime.utcnow)
     
     # Relationships
     user: Mapped["User"] = relationship("User", back_populates="history")
 
 
 class Symptom(Base):
-    """Symptom check history model"""
+    """Symptom check history model (partitioned by month of created_at)"""
     __tablename__ = "symptoms"
+    __table_args__ = {"postgresql_partition_by": "RANGE (created_at)"}
     
-    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
     
     pet_type: Mapped[str] = mapped_column(String(100))
     symptoms_text: Mapped[str] = mapped_column(Text)
     recommendations: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    # Part of the primary key because it is the partition key
+    created_at: Mapped[datetime] = mapped_column(DateTime, primary_key=True, default=datetime.utcnow)
+
+
+# Tables partitioned by month; partitions are named <table>_YYYY_MM
+# plus a <table>_default catch-all (see app/services/partition_manager.py)
+PARTITIONED_TABLES = ("history", "symptoms")
+
+
+# ==================== QUERY INDEXES ====================
+# Each index matches a filter/order used in crud.py; partial indexes
+# only cover active rows because inactive ones are never listed.
+
+Index("ix_pets_owner_id", Pet.owner_id)
+
+Index("ix_reminders_user_id_is_active", Reminder.user_id, Reminder.is_active)
+Index(
+    "ix_reminders_active_next_fire_at",
+    Reminder.next_fire_at,
+    postgresql_where=text("is_active"),
+)
+
+Index("ix_ads_user_id_is_active", Ad.user_id, Ad.is_active)
+Index(
+    "ix_ads_active_created_at_id",
+    Ad.created_at.desc(),
+    Ad.id.desc(),
+    postgresql_where=text("is_active"),
+)
+
+Index(
+    "ix_news_published_at_id",
+    News.published_at.desc(),
+    News.id.desc(),
+    postgresql_where=text("is_published"),
+)
+
+Index(
+    "ix_history_user_id_created_at_id",
+    History.user_id,
+    History.created_at.desc(),
+    History.id.desc(),
+)
+
+Index(
+    "ix_vet_profiles_active_city",
+    VetProfile.vet_city,
+    postgresql_where=text("is_active"),
+)
+
+Index(
+    "ix_clinics_active_city_type",
+    Clinic.city,
+    Clinic.clinic_type,
+    postgresql_where=text("is_active"),
+)
+
+# Natural key used by the bulk importer's ON CONFLICT upsert
+Index(
+    "uq_clinics_natural_key",
+    Clinic.clinic_type,
+    Clinic.city,
+    Clinic.name,
+    Clinic.address,
+    unique=True,
+)
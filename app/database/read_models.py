@@ -0,0 +1,68 @@
+"""
+Lightweight read models returned by aggregate queries
+
+Plain frozen dataclasses detached from the session, so handlers can render
+them without triggering lazy loads.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional, Tuple
+
+
+@dataclass(frozen=True)
+class PetView:
+    """Pet summary shown in a profile"""
+
+    id: int
+    name: str
+    pet_type: str
+    breed: Optional[str] = None
+    age: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class VetProfileView:
+    """Veterinarian card"""
+
+    vet_name: str
+    vet_phone: str
+    vet_city: str
+    specialization: str
+    experience_years: int
+    education: str
+    telegram_contact: str
+    consultation_price: str
+    additional_info: Optional[str] = None
+    is_active: bool = True
+
+
+@dataclass(frozen=True)
+class ReminderView:
+    """Upcoming reminder summary"""
+
+    id: int
+    text: str
+    reminder_type: str
+    reminder_date: Optional[datetime] = None
+    reminder_time: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class ProfileView:
+    """User profile aggregate: owner data, pets, vet card and reminders"""
+
+    user_id: int
+    telegram_id: int
+    language: str
+    owner_name: Optional[str] = None
+    owner_phone: Optional[str] = None
+    city: Optional[str] = None
+    pets: Tuple[PetView, ...] = field(default_factory=tuple)
+    vet_profile: Optional[VetProfileView] = None
+    reminders: Tuple[ReminderView, ...] = field(default_factory=tuple)
+
+    @property
+    def has_owner_profile(self) -> bool:
+        """Whether the owner part of the profile was filled in"""
+        return bool(self.owner_name or self.pets)
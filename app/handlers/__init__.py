@@ -1,5 +1,5 @@
 """Handlers module"""
 
-from . import start, profile, clinic, reminder, ads, symptoms, other
+from . import start, admin, profile, clinic, reminder, ads, symptoms, other
 
-__all__ = ["start", "profile", "clinic", "reminder", "ads", "symptoms", "other"]
+__all__ = ["start", "admin", "profile", "clinic", "reminder", "ads", "symptoms", "other"]
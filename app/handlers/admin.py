@@ -0,0 +1,78 @@
+"""
+Admin handlers (broadcasts, news)
+"""
+
+from aiogram import Router, types, F
+from aiogram.filters import Command
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.services.broadcast import broadcast_service
+from app.services.news_feed import publish_news
+
+router = Router()
+router.message.filter(F.from_user.id.in_(settings.ADMIN_IDS))
+
+
+@router.message(Command("broadcast"))
+async def cmd_broadcast(message: types.Message):
+    """Send the text after /broadcast to all active users"""
+    # html_text keeps the admin's formatting and escapes everything else
+    parts = message.html_text.split(maxsplit=1)
+    text = parts[1].strip() if len(parts) > 1 else ""
+    if not text:
+        await message.answer("Использование: /broadcast &lt;текст сообщения&gt;")
+        return
+
+    broadcast_id = await broadcast_service.create(text, message.from_user.id)
+    await message.answer(
+        f"📣 Рассылка #{broadcast_id} запущена\n"
+        f"Прогресс: /broadcast_status"
+    )
+
+
+@router.message(Command("broadcast_status"))
+async def cmd_broadcast_status(message: types.Message):
+    """Show progress, throughput and ETA of broadcasts since the bot started"""
+    if not broadcast_service.progress:
+        await message.answer("📭 Рассылок нет")
+        return
+
+    lines = ["📣 <b>Рассылки</b>\n"]
+    for broadcast_id, progress in broadcast_service.progress.items():
+        stats = progress.as_dict()
+        if broadcast_id in broadcast_service.tasks:
+            eta = f"~{stats['eta'] // 60} мин" if stats["eta"] is not None else "?"
+            state = f"{stats['rate']} сообщ./с, осталось {eta}"
+        else:
+            state = "завершена"
+        lines.append(
+            f"#{broadcast_id}: {stats['handled']}/{stats['total']} — {state}\n"
+            f"   ✅ {stats['sent']}  🚫 {stats['blocked']}  ⚠️ {stats['failed']}"
+        )
+    await message.answer("\n".join(lines))
+
+
+@router.message(Command("news"))
+async def cmd_news(message: types.Message, session: AsyncSession):
+    """
+    Publish a news item
+
+    The text after /news is the Russian body; lines starting with "en:" or
+    "uz:" are the translations.
+    """
+    parts = message.html_text.split(maxsplit=1)
+    bodies = {"ru": [], "en": [], "uz": []}
+    language = "ru"
+    for line in (parts[1] if len(parts) > 1 else "").split("\n"):
+        if line[:3].lower() in ("en:", "uz:"):
+            language, line = line[:2].lower(), line[3:]
+        bodies[language].append(line)
+    body_ru, body_en, body_uz = ("\n".join(bodies[lang]).strip() or None for lang in ("ru", "en", "uz"))
+
+    if not body_ru:
+        await message.answer("Использование: /news &lt;текст&gt;\nen: &lt;English text&gt;\nuz: &lt;O'zbekcha matn&gt;")
+        return
+
+    news = await publish_news(session, body_ru, body_en, body_uz)
+    await message.answer(f"📰 Новость #{news.id} опубликована")
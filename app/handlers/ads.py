@@ -2,18 +2,27 @@
 Advertisement handlers
 """
 
+import html
+from typing import Optional
+
 from aiogram import Router, types, F
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.enums import ParseMode
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.database import crud
 from app.locales import get_text
 from app.keyboards.inline import get_ads_menu
 from app.utils.helpers import safe_edit_message
+from app.utils.pagination import encode_cursor, decode_cursor
 
 router = Router()
 
+# Ads shown per feed page
+ADS_PAGE_SIZE = 5
+
 
 class AdStates(StatesGroup):
     waiting_for_ad_title = State()
@@ -143,16 +152,46 @@ async def show_my_ads(callback: types.CallbackQuery, language: str = "ru"):
 
 
 @router.callback_query(F.data == "view_ads")
-async def view_ads(callback: types.CallbackQuery, language: str = "ru"):
-    """View all ads"""
+@router.callback_query(F.data.startswith("ads_page:"))
+async def view_ads(callback: types.CallbackQuery, session: AsyncSession, language: str = "ru"):
+    """View all ads, one keyset page at a time"""
+    after = None
+    if callback.data.startswith("ads_page:"):
+        try:
+            after = decode_cursor(callback.data.split(":", 1)[1])
+        except ValueError:
+            after = None
+    
     user_id = callback.from_user.id
+    ads, next_key = await crud.get_ads_page(session, limit=ADS_PAGE_SIZE, after=after)
     
-    # TODO: Get from database
-    text = "📭 <b>Пока нет объявлений</b>\n\nСтаньте первым, кто опубликует объявление!"
+    if not ads:
+        text = get_text(user_id, "no_ads", language)
+    else:
+        text = get_text(user_id, "ads_feed", language) + "\n\n" + "\n\n".join(
+            f"<b>{html.escape(ad.title)}</b>\n"
+            f"{html.escape(ad.text)}\n"
+            f"💰 {html.escape(ad.price)}\n"
+            f"📞 {html.escape(ad.contact)}"
+            for ad in ads
+        )
     
     await safe_edit_message(
         callback.message,
         text,
-        reply_markup=get_ads_menu(user_id, language)
+        reply_markup=_ads_page_keyboard(user_id, language, encode_cursor(next_key) if next_key else None)
     )
     await callback.answer()
+
+
+def _ads_page_keyboard(user_id: int, language: str, next_cursor: Optional[str]) -> InlineKeyboardMarkup:
+    """Ads menu keyboard with a next page button on top when there is one"""
+    menu = get_ads_menu(user_id, language)
+    if not next_cursor:
+        return menu
+    
+    next_button = InlineKeyboardButton(
+        text=get_text(user_id, "next_page", language),
+        callback_data=f"ads_page:{next_cursor}"
+    )
+    return InlineKeyboardMarkup(inline_keyboard=[[next_button], *menu.inline_keyboard])
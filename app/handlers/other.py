@@ -2,21 +2,30 @@
 Other handlers (news, facts, feeding, language, history, etc.)
 """
 
+import html
 import random
 from aiogram import Router, types, F
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.enums import ParseMode
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.locales import get_text, get_feeding_info
+from app.database import crud
+from app.locales import get_text, get_feeding_info, set_user_language
+from app.locales.loader import LOCALES
 from app.keyboards.inline import (
     create_feeding_keyboard,
     create_domestic_animals_keyboard,
     create_language_keyboard
 )
-from app.utils.helpers import safe_edit_message
+from app.services.news_feed import get_news_page
+from app.utils.helpers import safe_edit_message, format_timestamp
+from app.utils.pagination import encode_cursor, decode_cursor
 
 router = Router()
 
+# History entries shown per page
+HISTORY_PAGE_SIZE = 10
+
 
 # Animal facts
 ANIMAL_FACTS = [
@@ -36,27 +45,37 @@ ANIMAL_FACTS = [
 # ==================== NEWS ====================
 
 @router.callback_query(F.data == "menu_news")
-async def news_menu(callback: types.CallbackQuery, language: str = "ru"):
-    """Show news"""
+@router.callback_query(F.data.startswith("news_page:"))
+async def news_menu(callback: types.CallbackQuery, session: AsyncSession, language: str = "ru"):
+    """Show news, one keyset page at a time (rendered pages are cached)"""
     user_id = callback.from_user.id
     
-    # Sample news
-    news_list = [
-        "📰 <b>Новость 1:</b> В Ташкенте открылся новый приют для бездомных животных",
-        "📰 <b>Новость 2:</b> Бесплатная вакцинация собак от бешенства в Самарканде",
-        "📰 <b>Новость 3:</b> Конкурс на лучший зоомагазин Узбекистана 2024",
-        "📰 <b>Новость 4:</b> Новый закон о защите животных в Узбекистане"
-    ]
+    cursor = None
+    if callback.data.startswith("news_page:"):
+        cursor = callback.data.split(":", 1)[1]
+    
+    try:
+        text, next_cursor = await get_news_page(session, language, cursor)
+    except ValueError:
+        cursor = None
+        text, next_cursor = await get_news_page(session, language)
     
-    text = get_text(user_id, "news_section", language) + "\n\n" + "\n\n".join(news_list)
+    buttons = []
+    if next_cursor:
+        buttons.append([InlineKeyboardButton(
+            text=get_text(user_id, "next_page", language),
+            callback_data=f"news_page:{next_cursor}"
+        )])
+    buttons.append([InlineKeyboardButton(
+        text=get_text(user_id, "refresh_news" if cursor is None else "newest_news", language),
+        callback_data="menu_news"
+    )])
+    buttons.append([InlineKeyboardButton(text=get_text(user_id, "back_to_menu", language), callback_data="back_to_menu")])
     
     await safe_edit_message(
         callback.message,
         text,
-        reply_markup=InlineKeyboardMarkup(inline_keyboard=[
-            [InlineKeyboardButton(text="🔄 Обновить новости", callback_data="menu_news")],
-            [InlineKeyboardButton(text=get_text(user_id, "back_to_menu", language), callback_data="back_to_menu")]
-        ])
+        reply_markup=InlineKeyboardMarkup(inline_keyboard=buttons)
     )
     await callback.answer()
 
@@ -161,15 +180,16 @@ async def language_menu(callback: types.CallbackQuery, language: str = "ru"):
 
 
 @router.callback_query(F.data.startswith("lang_"))
-async def set_language(callback: types.CallbackQuery):
+async def set_language(callback: types.CallbackQuery, session: AsyncSession):
     """Set user language"""
     user_id = callback.from_user.id
     language = callback.data.replace("lang_", "")
+    if language not in LOCALES:
+        await callback.answer()
+        return
     
-    # TODO: Save to database
-    # from app.database import get_db, crud
-    # async with get_db() as session:
-    #     await crud.update_user_language(session, user_id, language)
+    # Write-through: committed to the database, then the language cache
+    await set_user_language(session, user_id, language)
     
     languages = {
         "ru": "🇷🇺 Русский",
@@ -192,31 +212,66 @@ async def set_language(callback: types.CallbackQuery):
 # ==================== HISTORY ====================
 
 @router.callback_query(F.data == "menu_history")
-async def history_menu(callback: types.CallbackQuery, language: str = "ru"):
-    """Show user history"""
+@router.callback_query(F.data.startswith("history_page:"))
+async def history_menu(callback: types.CallbackQuery, session: AsyncSession, language: str = "ru"):
+    """Show user history, one keyset page at a time"""
     user_id = callback.from_user.id
     
-    # TODO: Get from database
-    text = "📭 <b>История пуста</b>\n\nЗдесь будут отображаться ваши действия в боте."
+    after = None
+    if callback.data.startswith("history_page:"):
+        try:
+            after = decode_cursor(callback.data.split(":", 1)[1])
+        except ValueError:
+            after = None
+    
+    entries, next_key = [], None
+    user = await crud.get_user(session, user_id)
+    if user:
+        entries, next_key = await crud.get_user_history_page(
+            session, user.id, limit=HISTORY_PAGE_SIZE, after=after
+        )
+    
+    if not entries:
+        text = get_text(user_id, "history_empty", language)
+    else:
+        text = get_text(user_id, "history_title", language) + "\n\n" + "\n".join(
+            f"• {format_timestamp(entry.created_at)} — {html.escape(entry.action)}"
+            for entry in entries
+        )
+    
+    buttons = []
+    if next_key:
+        buttons.append([InlineKeyboardButton(
+            text=get_text(user_id, "next_page", language),
+            callback_data=f"history_page:{encode_cursor(next_key)}"
+        )])
+    buttons.append([InlineKeyboardButton(
+        text=get_text(user_id, "clear_history", language),
+        callback_data="clear_history"
+    )])
+    buttons.append([InlineKeyboardButton(
+        text=get_text(user_id, "back_to_menu", language),
+        callback_data="back_to_menu"
+    )])
     
     await safe_edit_message(
         callback.message,
         text,
-        reply_markup=InlineKeyboardMarkup(inline_keyboard=[
-            [InlineKeyboardButton(text="🗑️ Очистить историю", callback_data="clear_history")],
-            [InlineKeyboardButton(text="🔙 Назад", callback_data="back_to_menu")]
-        ])
+        reply_markup=InlineKeyboardMarkup(inline_keyboard=buttons)
     )
     await callback.answer()
 
 
 @router.callback_query(F.data == "clear_history")
-async def clear_history(callback: types.CallbackQuery):
+async def clear_history(callback: types.CallbackQuery, session: AsyncSession, language: str = "ru"):
     """Clear user history"""
-    # TODO: Clear from database
+    user_id = callback.from_user.id
+    user = await crud.get_user(session, user_id)
+    if user:
+        await crud.clear_user_history(session, user.id)
     
-    await callback.answer("✅ История очищена!")
-    await history_menu(callback)
+    await callback.answer(get_text(user_id, "history_cleared", language))
+    await history_menu(callback, session, language)
 
 
 # ==================== VET CHAT & APPOINTMENT ====================
@@ -2,12 +2,16 @@
 Profile handlers for pet owners and veterinarians
 """
 
+import html
+
 from aiogram import Router, types, F
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 from aiogram.enums import ParseMode
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.database import crud, ProfileView
 from app.locales import get_text
 from app.keyboards.inline import get_profile_menu
 from app.utils.helpers import safe_edit_message
@@ -166,14 +170,39 @@ async def process_pet_type(message: types.Message, state: FSMContext, language:
     )
 
 
+def _format_owner_profile(profile: ProfileView) -> str:
+    """Render owner profile with pets and upcoming reminders"""
+    lines = [
+        "👤 <b>ПРОФИЛЬ ВЛАДЕЛЬЦА</b>\n",
+        f"👤 <b>Владелец:</b> {html.escape(profile.owner_name or '—')}",
+        f"📞 <b>Телефон:</b> {html.escape(profile.owner_phone or '—')}",
+        f"🌍 <b>Город:</b> {html.escape(profile.city or '—')}",
+    ]
+    
+    for pet in profile.pets:
+        lines.append(f"🐾 <b>Питомец:</b> {html.escape(pet.name)} ({html.escape(pet.pet_type)})")
+    
+    if profile.reminders:
+        lines.append("\n⏰ <b>Напоминания:</b>")
+        for reminder in profile.reminders:
+            when = reminder.reminder_date.strftime("%d.%m.%Y") if reminder.reminder_date else ""
+            if reminder.reminder_time:
+                when = f"{when} {reminder.reminder_time}".strip()
+            lines.append(f"• {html.escape(reminder.text)}" + (f" — {when}" if when else ""))
+    
+    return "\n".join(lines)
+
+
 @router.callback_query(F.data == "profile_view")
-async def view_profile(callback: types.CallbackQuery, language: str = "ru"):
+async def view_profile(callback: types.CallbackQuery, session: AsyncSession, language: str = "ru"):
     """View owner profile"""
     user_id = callback.from_user.id
     
-    # TODO: Get from database
-    # For now, show empty profile
-    text = get_text(user_id, "profile_empty", language)
+    profile = await crud.get_profile_aggregate(session, user_id)
+    if profile and profile.has_owner_profile:
+        text = _format_owner_profile(profile)
+    else:
+        text = get_text(user_id, "profile_empty", language)
     
     await safe_edit_message(
         callback.message,
@@ -352,13 +381,35 @@ async def process_vet_info(message: types.Message, state: FSMContext, language:
     )
 
 
+def _format_vet_profile(profile: ProfileView) -> str:
+    """Render veterinarian card"""
+    vet = profile.vet_profile
+    return (
+        "👨‍⚕️ <b>ПРОФИЛЬ ВЕТЕРИНАРА</b>\n"
+        "═════════════════════════\n"
+        f"<b>👨 Имя:</b> {html.escape(vet.vet_name)}\n"
+        f"<b>📞 Телефон:</b> {html.escape(vet.vet_phone)}\n"
+        f"<b>🏙️ Город:</b> {html.escape(vet.vet_city)}\n"
+        f"<b>🎯 Специализация:</b> {html.escape(vet.specialization)}\n"
+        f"<b>⏳ Опыт работы:</b> {vet.experience_years} лет\n"
+        f"<b>🎓 Образование:</b> {html.escape(vet.education)}\n"
+        f"<b>💬 Telegram:</b> {html.escape(vet.telegram_contact)}\n"
+        f"<b>💰 Консультация:</b> {html.escape(vet.consultation_price)}\n"
+        f"<b>📝 О себе:</b>\n{html.escape(vet.additional_info or '')}\n"
+        "═════════════════════════"
+    )
+
+
 @router.callback_query(F.data == "vet_profile_view")
-async def view_vet_profile(callback: types.CallbackQuery, language: str = "ru"):
+async def view_vet_profile(callback: types.CallbackQuery, session: AsyncSession, language: str = "ru"):
     """View vet profile"""
     user_id = callback.from_user.id
     
-    # TODO: Get from database
-    text = get_text(user_id, "vet_profile_empty", language)
+    profile = await crud.get_profile_aggregate(session, user_id)
+    if profile and profile.vet_profile:
+        text = _format_vet_profile(profile)
+    else:
+        text = get_text(user_id, "vet_profile_empty", language)
     
     await safe_edit_message(
         callback.message,
@@ -2,18 +2,78 @@
 Reminder handlers
 """
 
+import html
+import json
+from datetime import datetime, date
+from typing import List, Optional
+
 from aiogram import Router, types, F
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.enums import ParseMode
 
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import crud, Reminder
 from app.locales import get_text
-from app.keyboards.inline import get_reminders_menu, create_reminder_keyboard
+from app.keyboards.inline import (
+    get_reminders_menu,
+    create_reminder_keyboard,
+    REMINDER_DONE_PREFIX,
+    REMINDER_OFF_PREFIX,
+)
+from app.services.recurrence import DEFAULT_REMINDER_TIME
+from app.services.reminder_scheduler import reminder_scheduler
 from app.utils.helpers import safe_edit_message
 
 router = Router()
 
+# Callback data of the reminder type buttons
+REMINDER_TYPE_CALLBACKS = ("reminder_one_time", "reminder_daily", "reminder_weekly", "reminder_custom")
+
+# Callback prefix of the delete buttons in the reminder list
+REMINDER_DELETE_PREFIX = "rmdel:"
+
+REMINDER_TYPE_TEXT = {
+    "one_time": "Один раз",
+    "daily": "Ежедневно",
+    "weekly": "Еженедельно",
+    "custom": "Настроенное",
+}
+
+WEEKDAY_NAMES = {
+    "пн": 0, "понедельник": 0, "mon": 0, "monday": 0,
+    "вт": 1, "вторник": 1, "tue": 1, "tuesday": 1,
+    "ср": 2, "среда": 2, "wed": 2, "wednesday": 2,
+    "чт": 3, "четверг": 3, "thu": 3, "thursday": 3,
+    "пт": 4, "пятница": 4, "fri": 4, "friday": 4,
+    "сб": 5, "суббота": 5, "sat": 5, "saturday": 5,
+    "вс": 6, "воскресенье": 6, "sun": 6, "sunday": 6,
+}
+
+CANCEL_KEYBOARD = InlineKeyboardMarkup(inline_keyboard=[
+    [InlineKeyboardButton(text="❌ Отмена", callback_data="menu_reminders")]
+])
+
+
+def _parse_date(value: str) -> date:
+    """Parse DD.MM.YYYY date"""
+    return datetime.strptime(value.strip(), "%d.%m.%Y").date()
+
+
+def _parse_time(value: str) -> str:
+    """Validate HH:MM time and return it normalized"""
+    return datetime.strptime(value.strip(), "%H:%M").strftime("%H:%M")
+
+
+def _parse_weekdays(value: str) -> List[int]:
+    """Parse comma separated weekday names to sorted weekday numbers"""
+    days = {WEEKDAY_NAMES[name.strip().lower()] for name in value.split(",") if name.strip()}
+    if not days:
+        raise ValueError("No weekdays given")
+    return sorted(days)
+
 
 class ReminderStates(StatesGroup):
     waiting_for_reminder_type = State()
@@ -50,13 +110,9 @@ async def add_reminder(callback: types.CallbackQuery, state: FSMContext, languag
     await callback.answer()
 
 
-@router.callback_query(F.data.startswith("reminder_"))
+@router.callback_query(F.data.in_(REMINDER_TYPE_CALLBACKS))
 async def process_reminder_type(callback: types.CallbackQuery, state: FSMContext):
     """Process reminder type selection"""
-    if callback.data == "reminder_add":
-        # This is handled by add_reminder
-        return
-    
     reminder_type = callback.data
     await state.update_data(reminder_type=reminder_type)
     await state.set_state(ReminderStates.waiting_for_reminder_text)
@@ -82,7 +138,8 @@ async def process_reminder_text(message: types.Message, state: FSMContext):
     if reminder_type == "reminder_one_time":
         await state.set_state(ReminderStates.waiting_for_reminder_date)
         await message.answer(
-            "📅 Введите дату напоминания (в формате ДД.ММ.ГГГГ, например: 25.12.2024):",
+            "📅 Введите дату напоминания (в формате ДД.ММ.ГГГГ, например: 25.12.2024, "
+            "можно добавить время: 25.12.2024 18:30):",
             reply_markup=InlineKeyboardMarkup(inline_keyboard=[
                 [InlineKeyboardButton(text="❌ Отмена", callback_data="menu_reminders")]
             ])
@@ -113,54 +170,221 @@ async def process_reminder_text(message: types.Message, state: FSMContext):
         )
 
 
-@router.message(ReminderStates.waiting_for_reminder_date)
-async def process_reminder_date(message: types.Message, state: FSMContext, language: str = "ru"):
-    """Process reminder date and save"""
-    user_id = message.from_user.id
+async def _save_reminder(
+    message: types.Message,
+    state: FSMContext,
+    session: AsyncSession,
+    language: str,
+    when: str,
+    **fields
+):
+    """Create reminder, schedule it and confirm to the user"""
+    telegram_id = message.from_user.id
     data = await state.get_data()
-    
-    # TODO: Save to database
-    # from app.database import get_db, crud
-    # async with get_db() as session:
-    #     reminder = await crud.create_reminder(
-    #         session, user_id,
-    #         data.get('reminder_text'),
-    #         data.get('reminder_type'),
-    #         reminder_date=message.text
-    #     )
-    
+    reminder_type = data.get("reminder_type", "reminder_custom").removeprefix("reminder_")
+    text = data.get("reminder_text") or ""
+
+    fire_at = reminder_scheduler.next_fire_time(
+        Reminder(reminder_type=reminder_type, **fields), datetime.utcnow()
+    )
+    if fire_at is None:
+        await message.answer(
+            "❌ Это время уже прошло. Введите дату в будущем:",
+            reply_markup=CANCEL_KEYBOARD
+        )
+        return
+
+    user = await crud.get_user(session, telegram_id)
+    if user is None:
+        user = await crud.upsert_user(
+            session, telegram_id,
+            username=message.from_user.username,
+            first_name=message.from_user.first_name,
+            last_name=message.from_user.last_name,
+            language=language
+        )
+
+    reminder = await crud.create_reminder(
+        session, user.id, text, reminder_type, next_fire_at=fire_at, **fields
+    )
+    # Commit before scheduling, a due reminder is read back right away
+    await session.commit()
+    reminder_scheduler.add(reminder.id, fire_at)
+
     await state.clear()
-    
-    reminder_type_text = {
-        "reminder_one_time": "Один раз",
-        "reminder_daily": "Ежедневно",
-        "reminder_weekly": "Еженедельно",
-        "reminder_custom": "Настроенное"
-    }.get(data.get('reminder_type'), "Настроенное")
-    
     await message.answer(
         f"✅ <b>Напоминание добавлено!</b>\n\n"
-        f"<b>Текст:</b> {data.get('reminder_text')}\n"
-        f"<b>Дата:</b> {message.text}\n"
-        f"<b>Тип:</b> {reminder_type_text}\n\n"
+        f"<b>Текст:</b> {html.escape(text)}\n"
+        f"<b>Когда:</b> {html.escape(when)}\n"
+        f"<b>Тип:</b> {REMINDER_TYPE_TEXT.get(reminder_type, 'Настроенное')}\n\n"
         f"Я напомню вам в указанное время!",
         parse_mode=ParseMode.HTML,
-        reply_markup=get_reminders_menu(user_id, language)
+        reply_markup=get_reminders_menu(telegram_id, language)
+    )
+
+
+@router.message(ReminderStates.waiting_for_reminder_date)
+async def process_reminder_date(
+    message: types.Message,
+    state: FSMContext,
+    session: AsyncSession,
+    language: str = "ru"
+):
+    """Process reminder date (one-time) or dates (custom) and save"""
+    data = await state.get_data()
+    value = (message.text or "").strip()
+
+    try:
+        if data.get("reminder_type") == "reminder_one_time":
+            day, _, at = value.partition(" ")
+            reminder_date = _parse_date(day)
+            reminder_time = _parse_time(at) if at else DEFAULT_REMINDER_TIME.strftime("%H:%M")
+            fields = {
+                "reminder_date": datetime.combine(reminder_date, datetime.min.time()),
+                "reminder_time": reminder_time,
+            }
+            when = f"{reminder_date:%d.%m.%Y} {reminder_time}"
+        else:
+            dates = sorted({_parse_date(day) for day in value.split(",") if day.strip()})
+            if not dates:
+                raise ValueError("No dates given")
+            fields = {
+                "reminder_days": json.dumps([d.isoformat() for d in dates]),
+                "reminder_time": DEFAULT_REMINDER_TIME.strftime("%H:%M"),
+            }
+            when = ", ".join(f"{d:%d.%m.%Y}" for d in dates)
+    except ValueError:
+        await message.answer(
+            "❌ Неверный формат даты. Используйте ДД.ММ.ГГГГ, например: 25.12.2024",
+            reply_markup=CANCEL_KEYBOARD
+        )
+        return
+
+    await _save_reminder(message, state, session, language, when, **fields)
+
+
+@router.message(ReminderStates.waiting_for_reminder_days)
+async def process_reminder_days(message: types.Message, state: FSMContext):
+    """Process weekdays of a weekly reminder"""
+    try:
+        days = _parse_weekdays(message.text or "")
+    except (KeyError, ValueError):
+        await message.answer(
+            "❌ Не удалось распознать дни недели. Пример: ПН,СР,ПТ",
+            reply_markup=CANCEL_KEYBOARD
+        )
+        return
+
+    await state.update_data(reminder_days=days)
+    await state.set_state(ReminderStates.waiting_for_reminder_time)
+    await message.answer(
+        "⏰ Введите время напоминания (в формате ЧЧ:ММ, например: 09:00):",
+        reply_markup=CANCEL_KEYBOARD
     )
 
 
+@router.message(ReminderStates.waiting_for_reminder_time)
+async def process_reminder_time(
+    message: types.Message,
+    state: FSMContext,
+    session: AsyncSession,
+    language: str = "ru"
+):
+    """Process time of a daily or weekly reminder and save"""
+    try:
+        reminder_time = _parse_time(message.text or "")
+    except ValueError:
+        await message.answer(
+            "❌ Неверный формат времени. Используйте ЧЧ:ММ, например: 09:00",
+            reply_markup=CANCEL_KEYBOARD
+        )
+        return
+
+    data = await state.get_data()
+    fields = {"reminder_time": reminder_time}
+    when = f"каждый день в {reminder_time}"
+    days: Optional[List[int]] = data.get("reminder_days")
+    if days:
+        names = ["ПН", "ВТ", "СР", "ЧТ", "ПТ", "СБ", "ВС"]
+        fields["reminder_days"] = json.dumps(days)
+        when = f"{','.join(names[d] for d in days)} в {reminder_time}"
+
+    await _save_reminder(message, state, session, language, when, **fields)
+
+
 @router.callback_query(F.data == "reminder_list")
-async def show_reminders(callback: types.CallbackQuery, language: str = "ru"):
+async def show_reminders(callback: types.CallbackQuery, session: AsyncSession, language: str = "ru"):
     """Show user's reminders"""
     user_id = callback.from_user.id
-    
-    # TODO: Get from database
-    # For now, show empty list
-    text = "📭 <b>У вас нет активных напоминаний</b>"
-    
+
+    user = await crud.get_user(session, user_id)
+    reminders = await crud.get_user_reminders(session, user.id) if user else []
+
+    if not reminders:
+        await safe_edit_message(
+            callback.message,
+            "📭 <b>У вас нет активных напоминаний</b>",
+            reply_markup=get_reminders_menu(user_id, language)
+        )
+        await callback.answer()
+        return
+
+    lines = ["📋 <b>Ваши напоминания:</b>\n"]
+    buttons = []
+    for index, reminder in enumerate(reminders, 1):
+        reminder_type = REMINDER_TYPE_TEXT.get(reminder.reminder_type, "Настроенное")
+        lines.append(f"{index}. {html.escape(reminder.text)} — {reminder_type}")
+        buttons.append([InlineKeyboardButton(
+            text=f"🗑 {index}. {reminder.text[:30]}",
+            callback_data=f"{REMINDER_DELETE_PREFIX}{reminder.id}"
+        )])
+    buttons.append([InlineKeyboardButton(text="🔙 Назад", callback_data="menu_reminders")])
+
     await safe_edit_message(
         callback.message,
-        text,
-        reply_markup=get_reminders_menu(user_id, language)
+        "\n".join(lines),
+        reply_markup=InlineKeyboardMarkup(inline_keyboard=buttons)
     )
     await callback.answer()
+
+
+@router.callback_query(F.data.startswith(REMINDER_DELETE_PREFIX))
+async def delete_reminder(callback: types.CallbackQuery, session: AsyncSession, language: str = "ru"):
+    """Deactivate a reminder and remove it from the scheduler"""
+    reminder_id = int(callback.data[len(REMINDER_DELETE_PREFIX):])
+
+    user = await crud.get_user(session, callback.from_user.id)
+    if user and await crud.deactivate_reminder(session, user.id, reminder_id):
+        reminder_scheduler.cancel(reminder_id)
+        await callback.answer("🗑 Напоминание удалено")
+    else:
+        await callback.answer("Напоминание не найдено")
+
+    await show_reminders(callback, session, language)
+
+
+@router.callback_query(F.data.startswith(REMINDER_DONE_PREFIX) | F.data.startswith(REMINDER_OFF_PREFIX))
+async def handle_delivered_reminder(callback: types.CallbackQuery, session: AsyncSession, language: str = "ru"):
+    """Mark an item of a delivered reminder as done or turn the reminder off"""
+    prefix, _, reminder_id = callback.data.partition(":")
+    reminder_id = int(reminder_id)
+
+    if f"{prefix}:" == REMINDER_OFF_PREFIX:
+        user = await crud.get_user(session, callback.from_user.id)
+        if user and await crud.deactivate_reminder(session, user.id, reminder_id):
+            reminder_scheduler.cancel(reminder_id)
+            await callback.answer(get_text(callback.from_user.id, "reminder_turned_off", language))
+        else:
+            await callback.answer(get_text(callback.from_user.id, "reminder_not_found", language))
+    else:
+        await callback.answer(get_text(callback.from_user.id, "reminder_marked_done", language))
+
+    # Drop the item's buttons, keep the others
+    markup = callback.message.reply_markup
+    rows = [
+        row for row in (markup.inline_keyboard if markup else [])
+        if not any(button.callback_data.endswith(f":{reminder_id}") for button in row)
+    ]
+    await callback.message.edit_reply_markup(
+        reply_markup=InlineKeyboardMarkup(inline_keyboard=rows) if rows else None
+    )
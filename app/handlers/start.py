@@ -5,7 +5,9 @@ Start command and main menu handlers
 from aiogram import Router, types, F
 from aiogram.filters import Command
 from aiogram.fsm.context import FSMContext
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.database import crud
 from app.locales import get_text
 from app.keyboards.main_menu import get_main_menu
 from app.utils.helpers import safe_edit_message
@@ -14,26 +16,23 @@ router = Router()
 
 
 @router.message(Command("start"))
-async def cmd_start(message: types.Message, language: str = "ru"):
+async def cmd_start(message: types.Message, session: AsyncSession, language: str = "ru"):
     """
     Handle /start command
     
     Args:
         message: Incoming message
+        session: Database session from middleware
         language: User's language from middleware
     """
     user_id = message.from_user.id
     user_name = message.from_user.first_name
     
-    # TODO: Initialize user in database if not exists
-    # from app.database import get_db, crud
-    # async with get_db() as session:
-    #     user = await crud.get_user(session, user_id)
-    #     if not user:
-    #         await crud.create_user(
-    #             session, user_id, message.from_user.username,
-    #             user_name, message.from_user.last_name, language
-    #         )
+    # Register user or refresh Telegram profile fields in one statement
+    await crud.upsert_user(
+        session, user_id, message.from_user.username,
+        user_name, message.from_user.last_name, language
+    )
     
     welcome_text = get_text(user_id, "welcome", language, name=user_name)
     
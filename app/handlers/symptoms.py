@@ -10,7 +10,7 @@ from aiogram.enums import ParseMode
 
 from app.locales import get_text
 from app.keyboards.inline import create_animal_type_keyboard
-from app.services.symptom_checker import analyze_symptoms, is_emergency
+from app.services.symptom_checker import analyze_symptoms, is_emergency, match_symptoms
 from app.utils.helpers import safe_edit_message
 
 router = Router()
@@ -79,16 +79,19 @@ async def process_symptoms(message: types.Message, state: FSMContext):
     #         session, user_id, pet_type, symptoms_text
     #     )
     
+    # One scan finds every category and emergency keyword
+    matches = match_symptoms(symptoms_text)
+    
     # Check if emergency
-    if is_emergency(symptoms_text):
+    if is_emergency(symptoms_text, matches):
         emergency_text = (
             "🚨 <b>ЭКСТРЕННАЯ СИТУАЦИЯ!</b>\n\n"
             "Обнаружены симптомы, требующие немедленной медицинской помощи!\n\n"
             "⚠️ <b>СРОЧНО обратитесь к ветеринару или в ближайшую клинику!</b>\n\n"
         )
-        response = emergency_text + analyze_symptoms(symptoms_text, pet_type)
+        response = emergency_text + analyze_symptoms(symptoms_text, pet_type, matches)
     else:
-        response = analyze_symptoms(symptoms_text, pet_type)
+        response = analyze_symptoms(symptoms_text, pet_type, matches)
     
     await state.clear()
     
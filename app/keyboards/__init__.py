@@ -1,5 +1,7 @@
 """Keyboards module"""
 
+from .registry import keyboard_registry, FrozenInlineKeyboardMarkup
+
 from .main_menu import get_main_menu, get_back_to_menu_button
 from .inline import (
     get_profile_menu,
@@ -12,6 +14,8 @@ from .inline import (
 )
 
 __all__ = [
+    "keyboard_registry",
+    "FrozenInlineKeyboardMarkup",
     "get_main_menu",
     "get_back_to_menu_button",
     "get_profile_menu",
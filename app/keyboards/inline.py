@@ -2,8 +2,11 @@
 Inline keyboards for various bot features
 """
 
+from typing import List, Tuple
+
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 from app.locales import get_text
+from app.keyboards.registry import keyboard_registry
 
 
 # Uzbekistan cities for location selection
@@ -13,7 +16,12 @@ UZBEK_CITIES = [
     "jizzakh", "navoi", "termez"
 ]
 
+# Callback prefixes of the buttons under a delivered reminder
+REMINDER_DONE_PREFIX = "rmdone:"
+REMINDER_OFF_PREFIX = "rmoff:"
+
 
+@keyboard_registry.register
 def get_profile_menu(user_id: int, language: str = "ru") -> InlineKeyboardMarkup:
     """Profile menu keyboard"""
     return InlineKeyboardMarkup(inline_keyboard=[
@@ -48,6 +56,7 @@ def get_profile_menu(user_id: int, language: str = "ru") -> InlineKeyboardMarkup
     ])
 
 
+@keyboard_registry.register
 def get_ads_menu(user_id: int, language: str = "ru") -> InlineKeyboardMarkup:
     """Advertisements menu keyboard"""
     return InlineKeyboardMarkup(inline_keyboard=[
@@ -70,6 +79,7 @@ def get_ads_menu(user_id: int, language: str = "ru") -> InlineKeyboardMarkup:
     ])
 
 
+@keyboard_registry.register
 def get_reminders_menu(user_id: int, language: str = "ru") -> InlineKeyboardMarkup:
     """Reminders menu keyboard"""
     return InlineKeyboardMarkup(inline_keyboard=[
@@ -88,6 +98,7 @@ def get_reminders_menu(user_id: int, language: str = "ru") -> InlineKeyboardMark
     ])
 
 
+@keyboard_registry.register
 def create_reminder_keyboard(language: str = "ru") -> InlineKeyboardMarkup:
     """Reminder type selection keyboard"""
     return InlineKeyboardMarkup(inline_keyboard=[
@@ -99,6 +110,7 @@ def create_reminder_keyboard(language: str = "ru") -> InlineKeyboardMarkup:
     ])
 
 
+@keyboard_registry.register
 def create_cities_keyboard(language: str = "ru") -> InlineKeyboardMarkup:
     """Cities selection keyboard for Uzbekistan"""
     buttons = []
@@ -130,6 +142,16 @@ def create_cities_keyboard(language: str = "ru") -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@keyboard_registry.register
+def create_city_listing_keyboard(city_key: str, language: str = "ru") -> InlineKeyboardMarkup:
+    """Keyboard under a city listing of clinics, pharmacies or shelters"""
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [InlineKeyboardButton(text="📍 Показать на карте", callback_data=f"show_on_map_{city_key}")],
+        [InlineKeyboardButton(text="🔙 Назад", callback_data="back_to_menu")]
+    ])
+
+
+@keyboard_registry.register
 def create_animal_type_keyboard(language: str = "ru") -> InlineKeyboardMarkup:
     """Animal type selection keyboard"""
     return InlineKeyboardMarkup(inline_keyboard=[
@@ -142,6 +164,7 @@ def create_animal_type_keyboard(language: str = "ru") -> InlineKeyboardMarkup:
     ])
 
 
+@keyboard_registry.register
 def create_feeding_keyboard(language: str = "ru") -> InlineKeyboardMarkup:
     """Feeding category selection keyboard"""
     return InlineKeyboardMarkup(inline_keyboard=[
@@ -152,6 +175,7 @@ def create_feeding_keyboard(language: str = "ru") -> InlineKeyboardMarkup:
     ])
 
 
+@keyboard_registry.register
 def create_domestic_animals_keyboard(language: str = "ru") -> InlineKeyboardMarkup:
     """Domestic animals selection keyboard for feeding"""
     return InlineKeyboardMarkup(inline_keyboard=[
@@ -165,6 +189,7 @@ def create_domestic_animals_keyboard(language: str = "ru") -> InlineKeyboardMark
     ])
 
 
+@keyboard_registry.register
 def create_language_keyboard(language: str = "ru") -> InlineKeyboardMarkup:
     """Language selection keyboard"""
     return InlineKeyboardMarkup(inline_keyboard=[
@@ -175,8 +200,31 @@ def create_language_keyboard(language: str = "ru") -> InlineKeyboardMarkup:
     ])
 
 
+@keyboard_registry.register
 def create_cancel_button(callback_data: str = "back_to_menu") -> InlineKeyboardMarkup:
     """Create a cancel button"""
     return InlineKeyboardMarkup(inline_keyboard=[
         [InlineKeyboardButton(text="❌ Отмена", callback_data=callback_data)]
     ])
+
+
+def create_reminder_digest_keyboard(items: List[Tuple[int, str]], language: str = "ru") -> InlineKeyboardMarkup:
+    """
+    Per-item buttons under a delivered reminder or reminder digest
+
+    Args:
+        items: (reminder_id, text) in message order
+        language: Language code
+
+    Returns:
+        One row per reminder: mark as done, turn off
+    """
+    numbered = len(items) > 1
+    rows = []
+    for index, (reminder_id, text) in enumerate(items, 1):
+        label = f"{index}. {text[:25]}" if numbered else get_text(0, "reminder_done", language)
+        rows.append([
+            InlineKeyboardButton(text=f"✅ {label}", callback_data=f"{REMINDER_DONE_PREFIX}{reminder_id}"),
+            InlineKeyboardButton(text="🔕", callback_data=f"{REMINDER_OFF_PREFIX}{reminder_id}"),
+        ])
+    return InlineKeyboardMarkup(inline_keyboard=rows)
@@ -4,8 +4,10 @@ Main menu keyboards
 
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 from app.locales import get_text
+from app.keyboards.registry import keyboard_registry
 
 
+@keyboard_registry.register
 def get_main_menu(user_id: int, language: str = "ru") -> InlineKeyboardMarkup:
     """
     Create main menu keyboard with all bot options
@@ -98,6 +100,7 @@ def get_main_menu(user_id: int, language: str = "ru") -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(inline_keyboard=menu_buttons)
 
 
+@keyboard_registry.register
 def get_back_to_menu_button(user_id: int, language: str = "ru") -> InlineKeyboardMarkup:
     """
     Create a simple back to menu button
@@ -0,0 +1,169 @@
+"""
+Registry of memoized, immutable keyboards
+"""
+
+import functools
+import inspect
+import json
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+from pydantic import ConfigDict, PrivateAttr
+
+
+def _without_none(value: Any) -> Any:
+    """Drop None values the same way aiogram does before sending"""
+    if isinstance(value, dict):
+        return {k: _without_none(v) for k, v in value.items() if v is not None}
+    if isinstance(value, list):
+        return [_without_none(v) for v in value if v is not None]
+    return value
+
+
+class FrozenList(list):
+    """List that rejects modification, still serialized as a plain list"""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Registry keyboards are shared and cannot be modified")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = extend = insert = pop = remove = clear = sort = reverse = _readonly
+
+
+class FrozenInlineKeyboardButton(InlineKeyboardButton):
+    """Inline keyboard button that cannot be modified"""
+
+    model_config = ConfigDict(frozen=True)
+
+
+class FrozenInlineKeyboardMarkup(InlineKeyboardMarkup):
+    """
+    Inline keyboard that cannot be modified and carries its request JSON
+
+    Instances are shared between all users of a language, so the markup,
+    its rows and its buttons reject modification; copy the rows into a new
+    keyboard to extend one. The JSON is produced once and sent as is by
+    app.utils.bot_session.PreserializedSession.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    _json: str = PrivateAttr(default="")
+
+    @classmethod
+    def freeze(cls, markup: InlineKeyboardMarkup) -> "FrozenInlineKeyboardMarkup":
+        """
+        Create frozen copy of a keyboard with pre-serialized JSON
+
+        Args:
+            markup: Built keyboard
+
+        Returns:
+            Frozen keyboard
+        """
+        rows = FrozenList(
+            FrozenList(
+                FrozenInlineKeyboardButton(**button.model_dump(exclude_unset=True))
+                for button in row
+            )
+            for row in markup.inline_keyboard
+        )
+        # Validation would copy the rows into plain lists
+        frozen = cls.model_construct(inline_keyboard=rows)
+        frozen._json = json.dumps(
+            _without_none(frozen.model_dump(warnings=False)), ensure_ascii=False
+        )
+        return frozen
+
+    @property
+    def json_payload(self) -> str:
+        """Serialized reply_markup value"""
+        return self._json
+
+
+class KeyboardRegistry:
+    """
+    Keyboard registry
+
+    Keeps one frozen instance per builder and arguments. The user_id
+    argument is ignored, since keyboards depend only on the language.
+    """
+
+    def __init__(self):
+        self.keyboards: Dict[Tuple[str, Hashable], FrozenInlineKeyboardMarkup] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def register(self, builder: Callable[..., InlineKeyboardMarkup]) -> Callable[..., FrozenInlineKeyboardMarkup]:
+        """
+        Decorate keyboard builder so it is built once per distinct arguments
+
+        Args:
+            builder: Function returning InlineKeyboardMarkup
+
+        Returns:
+            Memoized function with the same signature
+        """
+        name = builder.__qualname__
+        signature = inspect.signature(builder)
+        params = list(signature.parameters)
+        user_id_index = params.index("user_id") if "user_id" in params else None
+
+        @functools.wraps(builder)
+        def wrapper(*args, **kwargs):
+            # Fast path for the usual positional call
+            if not kwargs and len(args) == len(params):
+                key_args = args if user_id_index is None else args[:user_id_index] + args[user_id_index + 1:]
+            else:
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                bound.arguments.pop("user_id", None)
+                key_args = tuple(bound.arguments.values())
+
+            key = (name, key_args)
+            keyboard = self.keyboards.get(key)
+            if keyboard is not None:
+                self.hits += 1
+                return keyboard
+
+            self.misses += 1
+            keyboard = FrozenInlineKeyboardMarkup.freeze(builder(*args, **kwargs))
+            self.keyboards[key] = keyboard
+            return keyboard
+
+        wrapper.build_uncached = builder
+        return wrapper
+
+    def warm_up(self, languages) -> int:
+        """
+        Build language-only keyboards ahead of time
+
+        Args:
+            languages: Language codes to build
+
+        Returns:
+            Number of keyboards in the registry
+        """
+        import app.keyboards as keyboards
+
+        for func in vars(keyboards).values():
+            builder = getattr(func, "build_uncached", None)
+            if builder is None:
+                continue
+            params = inspect.signature(builder).parameters
+            if set(params) - {"user_id", "language"}:
+                continue
+            for language in languages:
+                kwargs = {"language": language}
+                if "user_id" in params:
+                    kwargs["user_id"] = 0
+                func(**kwargs)
+        return len(self.keyboards)
+
+    def stats(self) -> Dict[str, int]:
+        """Registry size and hit/miss counters"""
+        return {"keyboards": len(self.keyboards), "hits": self.hits, "misses": self.misses}
+
+
+# Global keyboard registry
+keyboard_registry = KeyboardRegistry()
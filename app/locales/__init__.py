@@ -1,5 +1,17 @@
 """Locales module"""
 
-from .loader import get_text, get_user_language
+from .loader import (
+    get_text,
+    get_feeding_info,
+    get_user_language,
+    set_user_language,
+    get_language_cache_stats,
+)
 
-__all__ = ["get_text", "get_user_language"]
+__all__ = [
+    "get_text",
+    "get_feeding_info",
+    "get_user_language",
+    "set_user_language",
+    "get_language_cache_stats",
+]
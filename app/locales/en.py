@@ -23,6 +23,13 @@ TEXTS = {
     "welcome": "Hello, {name}! 🐾\nI'm PetHelperBot - your digital pet care assistant.\nChoose an option below:",
     "main_menu": "Main menu:",
     "back_to_menu": "🔙 Main Menu",
+    "next_page": "➡️ Next",
+
+    # History
+    "history_title": "📋 <b>Action history</b>",
+    "history_empty": "📭 <b>History is empty</b>\n\nYour actions in the bot will appear here.",
+    "clear_history": "🗑️ Clear history",
+    "history_cleared": "✅ History cleared!",
 
     # Profile
     "profile_section": "👤 <b>My Profile</b>\n\nChoose profile type to create:",
@@ -75,6 +82,13 @@ TEXTS = {
     "daily": "🔄 Daily",
     "weekly": "📆 Weekly",
     "custom": "⚙️ Custom",
+    "reminder_title": "⏰ <b>Reminder</b>",
+    "reminder_digest_title": "⏰ <b>Reminders ({count})</b>",
+    "reminder_missed": "<i>Missed while the bot was unavailable: {count}</i>",
+    "reminder_done": "Done",
+    "reminder_marked_done": "✅ Marked as done",
+    "reminder_turned_off": "🔕 Reminder turned off",
+    "reminder_not_found": "Reminder not found",
 
     # Shelters
     "shelters_section": "🏠 <b>Animal Shelters</b>\n\nChoose city to search shelters:",
@@ -84,10 +98,15 @@ TEXTS = {
     "post_ad": "📝 Post ad",
     "view_ads": "👁️ View ads",
     "my_ads": "📋 My ads",
+    "ads_feed": "📢 <b>Advertisements</b>",
+    "no_ads": "📭 <b>No ads yet</b>\n\nBe the first to post one!",
 
     # News
     "news_section": "📰 <b>Pet News</b>\n\nLatest news from the animal world:",
     "latest_news": "🆕 Latest news",
+    "no_news": "📭 No news yet.",
+    "refresh_news": "🔄 Refresh news",
+    "newest_news": "⏮ Back to latest news",
 
     # Pet shop
     "pet_shop_section": "🛍️ <b>Pet Shops</b>\n\nFind pet shops in your city:",
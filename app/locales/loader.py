@@ -2,9 +2,18 @@
 Locale loader and text retrieval functions
 """
 
-from typing import Dict, Optional
+import logging
+import string
+from typing import Dict, FrozenSet, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.utils.cache import TwoTierCache
 from . import ru, en, uz
 
+logger = logging.getLogger(__name__)
+
 
 # Available locales
 LOCALES: Dict[str, Dict] = {
@@ -23,35 +32,128 @@ FEEDING_LOCALES: Dict[str, Dict] = {
 # Default language
 DEFAULT_LANGUAGE = "ru"
 
+# telegram_id -> language, filled by LanguageMiddleware
+language_cache = TwoTierCache("lang", settings.LANGUAGE_CACHE_SIZE, settings.LANGUAGE_CACHE_TTL)
+
+
+class Template:
+    """Locale text parsed once into literal chunks and format fields"""
+    
+    __slots__ = ("text", "fields", "parts")
+    
+    def __init__(self, text: str):
+        self.text = text
+        parsed = list(string.Formatter().parse(text))
+        self.fields: FrozenSet[str] = frozenset(
+            field for _, field, _, _ in parsed if field is not None
+        )
+        # Plain "{name}" fields are substituted by joining chunks; anything
+        # with a format spec, conversion or attribute access goes to str.format
+        simple = all(
+            field.isidentifier() and not spec and not conversion
+            for _, field, spec, conversion in parsed if field is not None
+        )
+        self.parts = tuple((literal, field) for literal, field, _, _ in parsed) if simple else None
+    
+    def render(self, text_key: str, kwargs: dict) -> str:
+        """
+        Substitute format arguments
+        
+        Args:
+            text_key: Key of the text (for error reporting)
+            kwargs: Format arguments
+        
+        Returns:
+            Formatted text; missing fields are left as placeholders
+        """
+        try:
+            if self.parts is None:
+                return self.text.format_map(kwargs)
+            chunks = []
+            for literal, field in self.parts:
+                chunks.append(literal)
+                if field is not None:
+                    chunks.append(str(kwargs[field]))
+            return "".join(chunks)
+        except KeyError:
+            missing = sorted(self.fields - kwargs.keys())
+            logger.error(f"Missing format arguments {missing} for text '{text_key}'")
+            return self.text.format_map(_KeepMissing(kwargs))
+
+
+class _KeepMissing(dict):
+    """Format mapping that renders unknown fields unchanged"""
+    
+    def __missing__(self, key: str) -> str:
+        return "{" + key + "}"
+
+
+def check_locales(locales: Dict[str, Dict[str, str]]) -> None:
+    """
+    Verify that all locales define the same keys with the same placeholders
+    
+    Args:
+        locales: Language code -> texts
+    
+    Raises:
+        ValueError: Listing every missing key and placeholder mismatch
+    """
+    reference = locales[DEFAULT_LANGUAGE]
+    errors = []
+    for language, texts in locales.items():
+        for key in sorted(reference.keys() - texts.keys()):
+            errors.append(f"{language}: missing key '{key}'")
+        for key in sorted(texts.keys() - reference.keys()):
+            errors.append(f"{language}: unknown key '{key}'")
+        for key in sorted(reference.keys() & texts.keys()):
+            expected = Template(reference[key]).fields
+            actual = Template(texts[key]).fields
+            if expected != actual:
+                errors.append(
+                    f"{language}: placeholders of '{key}' are {sorted(actual)}, "
+                    f"expected {sorted(expected)}"
+                )
+    
+    if errors:
+        raise ValueError("Inconsistent locales:\n" + "\n".join(errors))
+
+
+def _compile(locales: Dict[str, Dict[str, str]]) -> Dict[str, Dict[str, Template]]:
+    """Parse all locale texts into templates"""
+    return {
+        language: {key: Template(text) for key, text in texts.items()}
+        for language, texts in locales.items()
+    }
+
+
+check_locales(LOCALES)
+check_locales(FEEDING_LOCALES)
+
+# Language code -> text key -> template
+TEMPLATES: Dict[str, Dict[str, Template]] = _compile(LOCALES)
+_DEFAULT_TEMPLATES = TEMPLATES[DEFAULT_LANGUAGE]
+
 
 def get_text(user_id: int, text_key: str, language: Optional[str] = None, **kwargs) -> str:
     """
     Get text for the given key in the user's language
     
     Args:
-        user_id: User ID (for future database lookup)
+        user_id: User ID (kept for call compatibility, unused)
         text_key: Key for the text
         language: Language code (ru/en/uz), if None uses default
         **kwargs: Format arguments for the text
     
     Returns:
-        Formatted text string
+        Formatted text string, or the key itself if it is unknown
     """
-    if language is None:
-        language = DEFAULT_LANGUAGE
-    
-    # Get text from locale
-    text_dict = LOCALES.get(language, LOCALES[DEFAULT_LANGUAGE])
-    text = text_dict.get(text_key, text_key)
+    template = TEMPLATES.get(language, _DEFAULT_TEMPLATES).get(text_key)
+    if template is None:
+        return text_key
     
-    # Format if kwargs provided
-    if kwargs:
-        try:
-            text = text.format(**kwargs)
-        except KeyError:
-            pass  # Return unformatted if key missing
-    
-    return text
+    if not kwargs:
+        return template.text
+    return template.render(text_key, kwargs)
 
 
 def get_feeding_info(animal_type: str, language: str = "ru") -> str:
@@ -69,38 +171,60 @@ def get_feeding_info(animal_type: str, language: str = "ru") -> str:
     return feeding_dict.get(animal_type, "Информация обновляется...")
 
 
-def get_user_language(user_id: int) -> str:
+async def get_user_language(user_id: int, session: Optional[AsyncSession] = None) -> Optional[str]:
     """
-    Get user's preferred language from database
+    Get user's preferred language
+    
+    Served by the two-tier language cache; only a miss reaches the database.
     
     Args:
-        user_id: User ID
+        user_id: Telegram user ID
+        session: Database session used on a cache miss
     
     Returns:
-        Language code (ru/en/uz)
-    
-    Note:
-        Currently returns default. Will be implemented with database integration.
+        Language code (ru/en/uz) or None if the user is unknown
     """
-    # TODO: Implement database lookup
-    # from app.database import crud
-    # user = await crud.get_user(user_id)
-    # return user.language if user else DEFAULT_LANGUAGE
-    return DEFAULT_LANGUAGE
+    if session is None:
+        return await language_cache.get(user_id)
+    
+    async def load() -> Optional[str]:
+        from app.database import crud
+        user = await crud.get_user(session, user_id)
+        return user.language if user else None
+    
+    return await language_cache.get_or_load(user_id, load)
 
 
-def set_user_language(user_id: int, language: str) -> None:
+async def cache_user_language(user_id: int, language: str) -> None:
     """
-    Set user's preferred language in database
+    Store resolved language in the cache tiers
     
     Args:
-        user_id: User ID
+        user_id: Telegram user ID
         language: Language code (ru/en/uz)
+    """
+    await language_cache.set(user_id, language)
+
+
+async def set_user_language(session: AsyncSession, user_id: int, language: str) -> None:
+    """
+    Set user's preferred language in database and cache (write-through)
     
-    Note:
-        Currently does nothing. Will be implemented with database integration.
+    The change is committed before the cache is updated, so other updates
+    never read a language from the cache that the database does not hold
+    and a failed commit leaves the cache untouched.
+    
+    Args:
+        session: Database session
+        user_id: Telegram user ID
+        language: Language code (ru/en/uz)
     """
-    # TODO: Implement database update
-    # from app.database import crud
-    # await crud.update_user_language(user_id, language)
-    pass
+    from app.database import crud
+    await crud.update_user_language(session, user_id, language)
+    await session.commit()
+    await cache_user_language(user_id, language)
+
+
+def get_language_cache_stats() -> dict:
+    """Get language cache hit/miss counters"""
+    return {"size": len(language_cache), **language_cache.stats.as_dict()}
@@ -23,6 +23,13 @@ TEXTS = {
     "welcome": "Привет, {name}! 🐾\nЯ PetHelperBot - твой цифровой помощник для заботы о питомце.\nВыбери опцию ниже:",
     "main_menu": "Главное меню:",
     "back_to_menu": "🔙 Главное меню",
+    "next_page": "➡️ Далее",
+
+    # История
+    "history_title": "📋 <b>История действий</b>",
+    "history_empty": "📭 <b>История пуста</b>\n\nЗдесь будут отображаться ваши действия в боте.",
+    "clear_history": "🗑️ Очистить историю",
+    "history_cleared": "✅ История очищена!",
 
     # Профиль
     "profile_section": "👤 <b>Мой профиль</b>\n\nВыберите тип профиля для создания:",
@@ -75,6 +82,13 @@ TEXTS = {
     "daily": "🔄 Ежедневно",
     "weekly": "📆 Еженедельно",
     "custom": "⚙️ Настроить",
+    "reminder_title": "⏰ <b>Напоминание</b>",
+    "reminder_digest_title": "⏰ <b>Напоминания ({count})</b>",
+    "reminder_missed": "<i>Пропущено, пока бот был недоступен: {count}</i>",
+    "reminder_done": "Выполнено",
+    "reminder_marked_done": "✅ Отмечено",
+    "reminder_turned_off": "🔕 Напоминание отключено",
+    "reminder_not_found": "Напоминание не найдено",
 
     # Приюты
     "shelters_section": "🏠 <b>Приюты для животных</b>\n\nВыберите город для поиска приютов:",
@@ -84,10 +98,15 @@ TEXTS = {
     "post_ad": "📝 Подать объявление",
     "view_ads": "👁️ Смотреть объявления",
     "my_ads": "📋 Мои объявления",
+    "ads_feed": "📢 <b>Объявления</b>",
+    "no_ads": "📭 <b>Пока нет объявлений</b>\n\nСтаньте первым, кто опубликует объявление!",
 
     # Новости
     "news_section": "📰 <b>Новости о животных</b>\n\nПоследние новости из мира животных:",
     "latest_news": "🆕 Последние новости",
+    "no_news": "📭 Новостей пока нет.",
+    "refresh_news": "🔄 Обновить новости",
+    "newest_news": "⏮ К свежим новостям",
 
     # Зоомагазин
     "pet_shop_section": "🛍️ <b>Зоомагазины</b>\n\nНайдите зоомагазины в вашем городе:",
@@ -23,6 +23,13 @@ TEXTS = {
     "welcome": "Salom, {name}! 🐾\nMen PetHelperBotman - hayvoningizga g'amxo'rlik qilishda raqamli yordamchingiz.\nQuyidagi variantni tanlang:",
     "main_menu": "Asosiy menyu:",
     "back_to_menu": "🔙 Asosiy menyu",
+    "next_page": "➡️ Keyingi",
+
+    # Tarix
+    "history_title": "📋 <b>Harakatlar tarixi</b>",
+    "history_empty": "📭 <b>Tarix bo'sh</b>\n\nBu yerda botdagi harakatlaringiz ko'rsatiladi.",
+    "clear_history": "🗑️ Tarixni tozalash",
+    "history_cleared": "✅ Tarix tozalandi!",
 
     # Profil
     "profile_section": "👤 <b>Mening profilingiz</b>\n\nYaratish uchun profil turini tanlang:",
@@ -75,6 +82,13 @@ TEXTS = {
     "daily": "🔄 Har kuni",
     "weekly": "📆 Har hafta",
     "custom": "⚙️ Moslashtirish",
+    "reminder_title": "⏰ <b>Eslatma</b>",
+    "reminder_digest_title": "⏰ <b>Eslatmalar ({count})</b>",
+    "reminder_missed": "<i>Bot ishlamay turganda o'tkazib yuborildi: {count}</i>",
+    "reminder_done": "Bajarildi",
+    "reminder_marked_done": "✅ Belgilandi",
+    "reminder_turned_off": "🔕 Eslatma o'chirildi",
+    "reminder_not_found": "Eslatma topilmadi",
 
     # Boshpana uylari
     "shelters_section": "🏠 <b>Hayvonlar boshpana uylari</b>\n\nBoshpana uylarini qidirish uchun shaharni tanlang:",
@@ -84,10 +98,15 @@ TEXTS = {
     "post_ad": "📝 E'lon joylashtirish",
     "view_ads": "👁️ E'lonlarni ko'rish",
     "my_ads": "📋 Mening e'lonlarim",
+    "ads_feed": "📢 <b>E'lonlar</b>",
+    "no_ads": "📭 <b>Hozircha e'lonlar yo'q</b>\n\nBirinchi bo'lib e'lon joylashtiring!",
 
     # Yangiliklar
     "news_section": "📰 <b>Hayvonlar yangiliklari</b>\n\nHayvonlar olamidan so'nggi yangiliklar:",
     "latest_news": "🆕 So'nggi yangiliklar",
+    "no_news": "📭 Hozircha yangiliklar yo'q.",
+    "refresh_news": "🔄 Yangiliklarni yangilash",
+    "newest_news": "⏮ So'nggi yangiliklarga",
 
     # Hayvonlar do'koni
     "pet_shop_section": "🛍️ <b>Hayvonlar do'konlari</b>\n\nShaharingizdagi hayvonlar do'konlarini toping:",
@@ -1,5 +1,6 @@
 """Middlewares module"""
 
+from .database import DatabaseMiddleware
 from .language import LanguageMiddleware
 
-__all__ = ["LanguageMiddleware"]
+__all__ = ["DatabaseMiddleware", "LanguageMiddleware"]
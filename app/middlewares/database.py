@@ -0,0 +1,88 @@
+"""
+Database session middleware (one unit of work per update)
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Callable, Dict, Any, Awaitable
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from app.database import AsyncSessionLocal, count_queries
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class UnitOfWorkStats:
+    """Aggregated per-update database usage"""
+
+    updates: int = 0
+    sessions_used: int = 0
+    queries: int = 0
+    max_queries_per_update: int = 0
+    rollbacks: int = 0
+
+    @property
+    def queries_per_update(self) -> float:
+        """Average number of SQL statements per handled update"""
+        if not self.updates:
+            return 0.0
+        return self.queries / self.updates
+
+
+class DatabaseMiddleware(BaseMiddleware):
+    """
+    Middleware to provide a single database session per update
+
+    The session is created up front but only checks out a connection on the
+    first query, so updates that never touch the database cost nothing.
+    Everything the handler does is committed once after it returns.
+    """
+
+    def __init__(self) -> None:
+        self.stats = UnitOfWorkStats()
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        """
+        Inject database session into handler data
+
+        Args:
+            handler: Handler function
+            event: Telegram event
+            data: Handler data
+
+        Returns:
+            Handler result
+        """
+        with count_queries() as counter:
+            async with AsyncSessionLocal() as session:
+                data["session"] = session
+                try:
+                    result = await handler(event, data)
+                    if session.in_transaction():
+                        await session.commit()
+                except Exception:
+                    self.stats.rollbacks += 1
+                    await session.rollback()
+                    raise
+                finally:
+                    self._record(counter.count)
+
+        return result
+
+    def _record(self, queries: int) -> None:
+        """Update aggregated statistics for a finished update"""
+        self.stats.updates += 1
+        self.stats.queries += queries
+        if queries:
+            self.stats.sessions_used += 1
+        if queries > self.stats.max_queries_per_update:
+            self.stats.max_queries_per_update = queries
+
+        logger.debug(f"Update handled with {queries} database queries")
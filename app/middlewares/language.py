@@ -6,10 +6,41 @@ from typing import Callable, Dict, Any, Awaitable
 from aiogram import BaseMiddleware
 from aiogram.types import TelegramObject, User
 
+from app.locales.loader import LOCALES, DEFAULT_LANGUAGE, get_user_language, cache_user_language
+
+
+def detect_language(user: User) -> str:
+    """
+    Guess language from Telegram client settings
+    
+    Args:
+        user: Telegram user
+    
+    Returns:
+        Language code (ru/en/uz)
+    """
+    language = DEFAULT_LANGUAGE
+    
+    if user.language_code:
+        lang_code = user.language_code.lower()
+        if lang_code in LOCALES:
+            language = lang_code
+        elif lang_code.startswith("uz"):
+            language = "uz"
+        elif lang_code.startswith("en"):
+            language = "en"
+    
+    return language
+
 
 class LanguageMiddleware(BaseMiddleware):
     """
     Middleware to set user language in handler data
+    
+    The stored language is resolved through the language cache, so only the
+    first update of a user within the cache TTL reaches the database (using
+    the session opened by DatabaseMiddleware). Users without a stored
+    language get the one guessed from their Telegram client.
     """
     
     async def __call__(
@@ -32,19 +63,10 @@ class LanguageMiddleware(BaseMiddleware):
         user: User = data.get("event_from_user")
         
         if user:
-            # TODO: Get language from database
-            # For now, use default or user's telegram language
-            language = "ru"  # Default
-            
-            # You can use user.language_code for initial language
-            if hasattr(user, "language_code") and user.language_code:
-                lang_code = user.language_code.lower()
-                if lang_code in ["ru", "en", "uz"]:
-                    language = lang_code
-                elif lang_code.startswith("uz"):
-                    language = "uz"
-                elif lang_code.startswith("en"):
-                    language = "en"
+            language = await get_user_language(user.id, data.get("session"))
+            if language is None:
+                language = detect_language(user)
+                await cache_user_language(user.id, language)
             
             data["language"] = language
             data["user_id"] = user.id
@@ -1,6 +1,22 @@
 """Services module"""
 
 from .symptom_checker import analyze_symptoms
-from .reminder_scheduler import ReminderScheduler
+from .reminder_scheduler import ReminderScheduler, reminder_scheduler
+from .history_writer import HistoryWriter, history_writer
+from .partition_manager import PartitionManager, partition_manager
+from .sender import OutboundSender, outbound_sender
+from .broadcast import BroadcastService, broadcast_service
 
-__all__ = ["analyze_symptoms", "ReminderScheduler"]
+__all__ = [
+    "analyze_symptoms",
+    "ReminderScheduler",
+    "reminder_scheduler",
+    "HistoryWriter",
+    "history_writer",
+    "PartitionManager",
+    "partition_manager",
+    "OutboundSender",
+    "outbound_sender",
+    "BroadcastService",
+    "broadcast_service",
+]
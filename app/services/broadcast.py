@@ -0,0 +1,262 @@
+"""
+Resumable broadcasts to all users
+"""
+
+import asyncio
+import collections
+import time
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional, Tuple
+import logging
+
+from aiogram.exceptions import TelegramForbiddenError
+from aiogram.methods import SendMessage
+
+from app.config import settings
+from app.services.sender import outbound_sender, PRIORITY_BULK
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BroadcastProgress:
+    """Live progress of a running broadcast"""
+
+    broadcast_id: int
+    total: int  # active recipients when the broadcast was created
+    last_user_id: int = 0  # checkpoint: every user up to this ID is handled
+    sent: int = 0
+    failed: int = 0
+    blocked: int = 0
+    resumed_from: int = 0  # messages handled before this run
+    started: float = field(default_factory=time.monotonic)
+
+    @property
+    def handled(self) -> int:
+        return self.sent + self.failed + self.blocked
+
+    @property
+    def rate(self) -> float:
+        """Messages per second in this run"""
+        elapsed = time.monotonic() - self.started
+        return (self.handled - self.resumed_from) / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta(self) -> Optional[float]:
+        """Estimated seconds until the broadcast is finished"""
+        rate = self.rate
+        return max(self.total - self.handled, 0) / rate if rate > 0 else None
+
+    def as_dict(self) -> dict:
+        """Progress for logging and the status command"""
+        eta = self.eta
+        return {
+            "broadcast_id": self.broadcast_id,
+            "handled": self.handled,
+            "total": self.total,
+            "sent": self.sent,
+            "failed": self.failed,
+            "blocked": self.blocked,
+            "rate": round(self.rate, 1),
+            "eta": round(eta) if eta is not None else None,
+        }
+
+
+class BroadcastService:
+    """
+    Broadcast service
+
+    Recipients are read from users in ID order, segment_size rows per
+    query in a transaction that ends before the segment is sent, so no
+    connection or snapshot is held while sending is rate limited. They are
+    sent through outbound_sender with bulk priority, which keeps within
+    Telegram limits and lets reminders and replies overtake the broadcast.
+    At most in_flight messages are queued at a time, so memory does not
+    depend on the number of users.
+
+    Every checkpoint_interval seconds the highest user ID up to which all
+    messages are settled is stored in broadcasts.last_user_id together with
+    the counters, and users who blocked the bot are marked inactive. After
+    a crash the broadcast resumes from its checkpoint, so at most the
+    messages sent after the last checkpoint are sent twice. On a regular
+    shutdown queued messages are settled first, so nothing is repeated.
+    """
+
+    def __init__(
+        self,
+        segment_size: int = settings.BROADCAST_SEGMENT_SIZE,
+        in_flight: int = settings.BROADCAST_IN_FLIGHT,
+        checkpoint_interval: float = settings.BROADCAST_CHECKPOINT_INTERVAL
+    ):
+        self.segment_size = segment_size
+        self.in_flight = in_flight
+        self.checkpoint_interval = checkpoint_interval
+        self.tasks: Dict[int, asyncio.Task] = {}
+        self.progress: Dict[int, BroadcastProgress] = {}
+        self._stopping = asyncio.Event()
+
+    async def start(self):
+        """Resume broadcasts interrupted by a restart"""
+        from app.database import AsyncSessionLocal, crud
+
+        async with AsyncSessionLocal() as session:
+            broadcasts = await crud.get_running_broadcasts(session)
+
+        for broadcast in broadcasts:
+            logger.info(f"Resuming broadcast {broadcast.id} after user {broadcast.last_user_id}")
+            self._launch(broadcast)
+
+    async def stop(self, timeout: float = 5.0):
+        """
+        Stop running broadcasts, storing their checkpoints
+
+        Args:
+            timeout: Seconds to wait for messages already queued
+        """
+        self._stopping.set()
+        tasks = list(self.tasks.values())
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=timeout)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self.tasks.clear()
+
+    async def create(self, text: str, created_by: int) -> int:
+        """
+        Create a broadcast to all active users and start sending it
+
+        Args:
+            text: Message text (HTML)
+            created_by: Telegram ID of the admin
+
+        Returns:
+            Broadcast ID
+        """
+        from app.database import AsyncSessionLocal, crud
+
+        async with AsyncSessionLocal() as session:
+            total = await crud.count_active_users(session)
+            broadcast = await crud.create_broadcast(session, text, created_by, total)
+            await session.commit()
+
+        logger.info(f"Broadcast {broadcast.id} created by {created_by} for {total} users")
+        self._launch(broadcast)
+        return broadcast.id
+
+    def _launch(self, broadcast):
+        progress = BroadcastProgress(
+            broadcast_id=broadcast.id,
+            total=broadcast.total,
+            last_user_id=broadcast.last_user_id,
+            sent=broadcast.sent,
+            failed=broadcast.failed,
+            blocked=broadcast.blocked,
+        )
+        progress.resumed_from = progress.handled
+        self.progress[broadcast.id] = progress
+        self.tasks[broadcast.id] = asyncio.create_task(self._run(broadcast.text, progress))
+
+    # ==================== SENDING ====================
+
+    async def _run(self, text: str, progress: BroadcastProgress):
+        """Send the broadcast from its checkpoint to the last active user"""
+        from app.database import AsyncSessionLocal, crud
+
+        in_flight: Deque[Tuple[int, asyncio.Future]] = collections.deque()
+        blocked_ids: List[int] = []
+        cursor = progress.last_user_id
+        checkpoint_at = time.monotonic() + self.checkpoint_interval
+        status = None
+        try:
+            while not self._stopping.is_set():
+                async with AsyncSessionLocal() as session:
+                    recipients = await crud.get_active_user_segment(session, cursor, self.segment_size)
+
+                for user_id, telegram_id in recipients:
+                    if self._stopping.is_set():
+                        break
+                    cursor = user_id
+                    method = SendMessage(chat_id=telegram_id, text=text)
+                    in_flight.append((user_id, outbound_sender.enqueue(method, PRIORITY_BULK)))
+
+                    await self._settle(in_flight, progress, blocked_ids, keep=self.in_flight - 1)
+                    if time.monotonic() >= checkpoint_at:
+                        await self._checkpoint(progress, blocked_ids)
+                        checkpoint_at = time.monotonic() + self.checkpoint_interval
+
+                if len(recipients) < self.segment_size:
+                    break
+
+            await self._settle(in_flight, progress, blocked_ids, keep=0)
+            if not self._stopping.is_set():
+                status = "done"
+        except asyncio.CancelledError:
+            logger.info(f"Broadcast {progress.broadcast_id} interrupted, will resume after restart")
+            raise
+        except Exception as e:
+            logger.error(f"Broadcast {progress.broadcast_id} stopped: {e}")
+        finally:
+            # Unsettled messages are sent again on resume, do not send them now
+            for _, future in in_flight:
+                future.cancel()
+            try:
+                await self._checkpoint(progress, blocked_ids, status)
+            except Exception as e:
+                logger.error(f"Error saving checkpoint of broadcast {progress.broadcast_id}: {e}")
+            self.tasks.pop(progress.broadcast_id, None)
+            if status == "done":
+                logger.info(f"Broadcast {progress.broadcast_id} finished: {progress.as_dict()}")
+
+    async def _settle(
+        self,
+        in_flight: Deque[Tuple[int, asyncio.Future]],
+        progress: BroadcastProgress,
+        blocked_ids: List[int],
+        keep: int
+    ):
+        """
+        Account finished messages in recipient order
+
+        Waits until at most keep messages are in flight. Finished messages
+        behind an unfinished one are accounted later, so the checkpoint
+        never skips a recipient.
+        """
+        while in_flight and (len(in_flight) > keep or in_flight[0][1].done()):
+            user_id, future = in_flight[0]
+            try:
+                await future
+            except TelegramForbiddenError:
+                progress.blocked += 1
+                blocked_ids.append(user_id)
+            except Exception as e:
+                progress.failed += 1
+                logger.debug(f"Broadcast {progress.broadcast_id} to user {user_id} failed: {e}")
+            else:
+                progress.sent += 1
+            in_flight.popleft()
+            progress.last_user_id = user_id
+
+    async def _checkpoint(self, progress: BroadcastProgress, blocked_ids: List[int], status: Optional[str] = None):
+        """Store progress and deactivate users who blocked the bot"""
+        from app.database import AsyncSessionLocal, crud
+
+        async with AsyncSessionLocal() as session:
+            await crud.deactivate_users(session, blocked_ids)
+            await crud.save_broadcast_progress(
+                session, progress.broadcast_id, progress.last_user_id,
+                progress.sent, progress.failed, progress.blocked, status=status
+            )
+            await session.commit()
+        blocked_ids.clear()
+
+        stats = progress.as_dict()
+        eta = f"{stats['eta'] // 60}m{stats['eta'] % 60:02d}s" if stats["eta"] is not None else "?"
+        logger.info(
+            f"Broadcast {progress.broadcast_id}: {stats['handled']}/{stats['total']} "
+            f"({stats['rate']} msg/s, ETA {eta}, blocked {stats['blocked']}, failed {stats['failed']})"
+        )
+
+
+# Global broadcast service instance
+broadcast_service = BroadcastService()
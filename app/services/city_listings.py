@@ -0,0 +1,131 @@
+"""
+Rendered city listings of clinics, pharmacies and shelters
+"""
+
+import html
+from typing import Dict, List, Optional, Tuple
+
+from aiogram.types import InlineKeyboardMarkup
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import crud
+from app.keyboards.inline import create_city_listing_keyboard
+from app.locales import get_text
+from app.locales.loader import LOCALES
+from app.utils.cache import TwoTierCache
+
+# Sample data shown while a city has no rows in the clinics table
+SAMPLE_LISTINGS: Dict[str, Dict[str, List[str]]] = {
+    "clinic": {
+        "tashkent": [
+            "🏥 <b>Vet Clinic 'Pet Care'</b>\n📍 Mirzo Ulug'bek tumani\n📞 +998 71 123 45 67\n🕒 24/7",
+            "🏥 <b>Animal Hospital Tashkent</b>\n📍 Yunusobod tumani\n📞 +998 71 234 56 78\n🕒 08:00-22:00",
+            "🏥 <b>Doctor Vet Center</b>\n📍 Shayxontohur tumani\n📞 +998 71 345 67 89\n🕒 09:00-20:00"
+        ],
+        "samarkand": [
+            "🏥 <b>Samarkand Vet Clinic</b>\n📍 Registon ko'chasi\n📞 +998 66 123 45 67\n🕒 09:00-19:00",
+            "🏥 <b>Animal Care Samarqand</b>\n📍 Amir Temur ko'chasi\n📞 +998 66 234 56 78\n🕒 08:00-21:00"
+        ]
+    },
+    "pharmacy": {
+        "tashkent": [
+            "💊 <b>Vet Pharmacy #1</b>\n📍 Chilonzor tumani\n📞 +998 71 111 22 33\n🕒 08:00-23:00",
+            "💊 <b>Animal Drugs Center</b>\n📍 Yakkasaroy tumani\n📞 +998 71 222 33 44\n🕒 24/7",
+            "💊 <b>Pet Med Tashkent</b>\n📍 Mirabad tumani\n📞 +998 71 333 44 55\n🕒 09:00-22:00"
+        ]
+    },
+    "shelter": {
+        "tashkent": [
+            "🏠 <b>Tashkent Animal Shelter</b>\n📍 Qibray tumani\n📞 +998 71 444 55 66\n🐕 50+ animals",
+            "🏠 <b>Hope for Pets Shelter</b>\n📍 Olmazor tumani\n📞 +998 71 555 66 77\n🐱 30+ animals"
+        ]
+    },
+}
+
+# clinic_type -> (icon, title template, placeholder template)
+LISTING_FORMATS: Dict[str, Tuple[str, str, str]] = {
+    "clinic": ("🏥", "Ветеринарные клиники в {city}", "В городе {city} информация о клиниках обновляется"),
+    "pharmacy": ("💊", "Ветеринарные аптеки в {city}", "В городе {city} информация об аптеках обновляется"),
+    "shelter": ("🏠", "Приюты для животных в {city}", "В городе {city} информация о приютах обновляется"),
+}
+
+# (city, clinic_type, language) -> (text, markup); markup objects are not
+# JSON serializable, so only the in-process tier is used
+LISTING_CACHE_NAMESPACE = "city_listing"
+_listing_cache = TwoTierCache(
+    LISTING_CACHE_NAMESPACE, maxsize=1024, ttl=settings.CITY_LISTING_CACHE_TTL, use_redis=False
+)
+
+
+def _render_entries(rows, icon: str) -> List[str]:
+    """Render clinic rows as HTML entries"""
+    return [
+        f"{icon} <b>{html.escape(row.name)}</b>\n"
+        f"📍 {html.escape(row.address)}\n"
+        f"📞 {html.escape(row.phone)}\n"
+        f"🕒 {html.escape(row.working_hours)}"
+        for row in rows
+    ]
+
+
+async def get_city_listing(
+    session: AsyncSession,
+    city_key: str,
+    clinic_type: str,
+    language: str
+) -> Tuple[str, InlineKeyboardMarkup]:
+    """
+    Get rendered listing of a city, from cache when possible
+
+    Args:
+        session: Database session (used on cache miss only)
+        city_key: City key (tashkent, samarkand, ...)
+        clinic_type: clinic, pharmacy or shelter
+        language: Language code (ru/en/uz)
+
+    Returns:
+        Tuple of HTML text and keyboard markup
+    """
+    async def render() -> Tuple[str, InlineKeyboardMarkup]:
+        icon, title, placeholder = LISTING_FORMATS[clinic_type]
+        city_name = get_text(0, city_key, language)
+
+        rows = await crud.get_clinics_by_city(session, city_key, clinic_type)
+        entries = _render_entries(rows, icon) or SAMPLE_LISTINGS[clinic_type].get(
+            city_key, [f"{icon} {placeholder.format(city=city_name)}"]
+        )
+
+        text = f"{icon} <b>{title.format(city=city_name)}:</b>\n\n" + "\n\n".join(entries)
+        return text, create_city_listing_keyboard(city_key, language)
+
+    return await _listing_cache.get_or_load((city_key, clinic_type, language), render)
+
+
+async def invalidate_city_listings(city_key: Optional[str] = None, clinic_type: Optional[str] = None) -> int:
+    """
+    Drop cached listings after clinic rows changed, on all instances
+
+    Args:
+        city_key: Only this city (all cities and types if None)
+        clinic_type: Only this type of the city (all types if None)
+
+    Returns:
+        Number of invalidated keys
+    """
+    if city_key is None:
+        dropped = len(_listing_cache)
+        await _listing_cache.invalidate()
+        return dropped
+
+    # Invalidate every possible key, other instances may hold ones this one lacks
+    clinic_types = [clinic_type] if clinic_type else list(LISTING_FORMATS)
+    for listing_type in clinic_types:
+        for language in LOCALES:
+            await _listing_cache.invalidate((city_key, listing_type, language))
+    return len(clinic_types) * len(LOCALES)
+
+
+def get_city_listing_cache_stats() -> dict:
+    """Get listing cache hit/miss counters"""
+    return {"size": len(_listing_cache), **_listing_cache.stats.as_dict()}
@@ -0,0 +1,337 @@
+"""
+Streaming bulk import of clinics, pharmacies and shelters
+
+Usage:
+    python -m app.services.clinic_importer data/clinics/ [--chunk-size 20000]
+
+Reads every *.csv, *.ndjson and *.jsonl file of a directory (or a single
+file) row by row, validates each row, COPYs valid rows into a temporary
+staging table chunk by chunk and upserts them into `clinics` by the natural
+key (clinic_type, city, name, address). Only one chunk is held in memory.
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import logging
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Iterable, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+CLINIC_TYPES = {"clinic", "pharmacy", "shelter"}
+
+# Columns in staging/COPY order
+COLUMNS = (
+    "name", "city", "address", "phone", "working_hours", "clinic_type",
+    "latitude", "longitude", "services", "website", "is_active",
+)
+# Staging also keeps the source row number, so the last duplicate wins
+STAGING_COLUMNS = COLUMNS + ("row_number",)
+REQUIRED = ("name", "city", "address", "phone", "working_hours", "clinic_type")
+NATURAL_KEY = ("clinic_type", "city", "name", "address")
+
+# Max length of string columns, mirrors app.database.models.Clinic
+MAX_LENGTHS = {
+    "name": 255, "city": 100, "address": 500, "phone": 50,
+    "working_hours": 255, "clinic_type": 50, "website": 255,
+}
+
+STAGING_TABLE = "clinics_staging"
+
+CREATE_STAGING_SQL = f"""
+CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} (
+    name VARCHAR(255),
+    city VARCHAR(100),
+    address VARCHAR(500),
+    phone VARCHAR(50),
+    working_hours VARCHAR(255),
+    clinic_type VARCHAR(50),
+    latitude DOUBLE PRECISION,
+    longitude DOUBLE PRECISION,
+    services TEXT,
+    website VARCHAR(255),
+    is_active BOOLEAN,
+    row_number BIGINT
+) ON COMMIT DELETE ROWS
+"""
+
+# DISTINCT ON: a single INSERT ... ON CONFLICT may not touch the same row twice;
+# of duplicates within a chunk the last row in the source wins, as across chunks
+UPSERT_SQL = f"""
+INSERT INTO clinics ({", ".join(COLUMNS)}, created_at)
+SELECT DISTINCT ON ({", ".join(NATURAL_KEY)}) {", ".join(COLUMNS)}, now() AT TIME ZONE 'utc'
+FROM {STAGING_TABLE}
+ORDER BY {", ".join(NATURAL_KEY)}, row_number DESC
+ON CONFLICT ({", ".join(NATURAL_KEY)}) DO UPDATE SET
+    phone = EXCLUDED.phone,
+    working_hours = EXCLUDED.working_hours,
+    latitude = EXCLUDED.latitude,
+    longitude = EXCLUDED.longitude,
+    services = EXCLUDED.services,
+    website = EXCLUDED.website,
+    is_active = EXCLUDED.is_active
+"""
+
+
+class ValidationError(ValueError):
+    """Raised for rows that cannot be imported"""
+
+
+@dataclass
+class ImportStats:
+    """Progress counters of an import run"""
+
+    read: int = 0
+    imported: int = 0
+    invalid: int = 0
+    chunks: int = 0
+    started: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        """Throughput since the import started"""
+        elapsed = time.monotonic() - self.started
+        return self.read / elapsed if elapsed > 0 else 0.0
+
+
+def iter_source_files(path: Path) -> Iterator[Path]:
+    """
+    List importable files
+
+    Args:
+        path: Directory or single file
+
+    Returns:
+        Iterator over CSV/NDJSON files in name order
+    """
+    if path.is_file():
+        yield path
+        return
+    for file in sorted(path.iterdir()):
+        if file.suffix.lower() in (".csv", ".ndjson", ".jsonl"):
+            yield file
+
+
+def iter_rows(file: Path) -> Iterator[Union[dict, "ValidationError"]]:
+    """
+    Stream raw rows of a CSV or NDJSON file
+
+    Lines that cannot be parsed are yielded as ValidationError, so they are
+    counted and skipped like other invalid rows instead of ending the import.
+
+    Args:
+        file: Source file
+
+    Returns:
+        Iterator over row dictionaries (any JSON value for NDJSON lines)
+    """
+    with file.open(encoding="utf-8", newline="") as f:
+        if file.suffix.lower() == ".csv":
+            reader = csv.DictReader(f)
+            while True:
+                try:
+                    yield next(reader)
+                except StopIteration:
+                    return
+                except csv.Error as e:
+                    yield ValidationError(f"{file.name} line {reader.line_num}: {e}")
+        else:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield ValidationError(f"{file.name} line {number}: invalid JSON ({e.msg})")
+
+
+def _optional_float(value, low: float, high: float, field: str) -> Optional[float]:
+    """Parse optional coordinate"""
+    if value in (None, ""):
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValidationError(f"{field} is not a number: {value!r}")
+    if not low <= number <= high:
+        raise ValidationError(f"{field} out of range: {number}")
+    return number
+
+
+def _text(row: dict, field: str) -> str:
+    """Field as stripped text; numbers and other scalars are converted"""
+    value = row.get(field)
+    if type(value) is str:
+        return value.strip()
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        raise ValidationError(f"{field} is not a scalar value")
+    return str(value).strip()
+
+
+def _optional_bool(value) -> bool:
+    """Parse is_active flag, missing means active"""
+    if value in (None, ""):
+        return True
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("1", "true", "yes", "y")
+
+
+def validate_row(row: dict) -> Tuple:
+    """
+    Validate raw row and convert it to a COPY record
+
+    Args:
+        row: Raw row from CSV/NDJSON, or the error of an unparsable line
+
+    Returns:
+        Tuple of values in COLUMNS order
+
+    Raises:
+        ValidationError: If the row is invalid
+    """
+    if isinstance(row, ValidationError):
+        raise row
+    if not isinstance(row, dict):
+        raise ValidationError(f"row is {type(row).__name__}, not an object")
+
+    values = {}
+    for field in REQUIRED:
+        value = _text(row, field)
+        if not value:
+            raise ValidationError(f"missing {field}")
+        values[field] = value
+
+    values["clinic_type"] = values["clinic_type"].lower()
+    values["city"] = values["city"].lower()
+    if values["clinic_type"] not in CLINIC_TYPES:
+        raise ValidationError(f"unknown clinic_type {values['clinic_type']!r}")
+
+    values["latitude"] = _optional_float(row.get("latitude"), -90, 90, "latitude")
+    values["longitude"] = _optional_float(row.get("longitude"), -180, 180, "longitude")
+    values["services"] = _text(row, "services") or None
+    values["website"] = _text(row, "website") or None
+    values["is_active"] = _optional_bool(row.get("is_active"))
+
+    for field, limit in MAX_LENGTHS.items():
+        if values[field] is not None and len(values[field]) > limit:
+            raise ValidationError(f"{field} longer than {limit} characters")
+
+    return tuple(values[column] for column in COLUMNS)
+
+
+def iter_chunks(
+    rows: Iterable[dict],
+    chunk_size: int,
+    stats: ImportStats,
+    max_logged_errors: int = 20
+) -> Iterator[List[Tuple]]:
+    """
+    Validate rows and group valid ones into chunks
+
+    Args:
+        rows: Raw rows
+        chunk_size: Records per chunk
+        stats: Counters to update
+        max_logged_errors: Invalid rows reported individually
+
+    Returns:
+        Iterator over lists of staging records (COPY record and row number)
+    """
+    chunk: List[Tuple] = []
+    for row in rows:
+        stats.read += 1
+        try:
+            chunk.append((*validate_row(row), stats.read))
+        except ValidationError as e:
+            stats.invalid += 1
+            if stats.invalid <= max_logged_errors:
+                logger.warning(f"Row {stats.read} skipped: {e}")
+            continue
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+async def import_clinics(path: Path, chunk_size: int = 20000) -> ImportStats:
+    """
+    Import clinics from a directory or file
+
+    Args:
+        path: Directory with CSV/NDJSON files, or a single file
+        chunk_size: Rows per COPY/upsert transaction
+
+    Returns:
+        Import statistics
+    """
+    from app.database.database import engine
+
+    stats = ImportStats(started=time.monotonic())
+    rows = (row for file in iter_source_files(path) for row in iter_rows(file))
+
+    async with engine.connect() as conn:
+        raw = await conn.get_raw_connection()
+        driver = raw.driver_connection
+        await driver.execute(CREATE_STAGING_SQL)
+
+        for chunk in iter_chunks(rows, chunk_size, stats):
+            async with driver.transaction():
+                await driver.copy_records_to_table(STAGING_TABLE, records=chunk, columns=STAGING_COLUMNS)
+                await driver.execute(UPSERT_SQL)
+            stats.imported += len(chunk)
+            stats.chunks += 1
+            logger.info(
+                f"Chunk {stats.chunks}: {stats.read} read, {stats.imported} imported, "
+                f"{stats.invalid} invalid, {stats.rows_per_second:.0f} rows/s"
+            )
+
+    return stats
+
+
+async def _run_import(path: Path, chunk_size: int) -> ImportStats:
+    """Import, then tell running bot instances to drop cached city listings"""
+    from app.database import close_db
+    from app.services.city_listings import invalidate_city_listings
+    from app.utils.redis_client import close_redis
+
+    try:
+        stats = await import_clinics(path, chunk_size)
+        await invalidate_city_listings()
+    finally:
+        await close_redis()
+        await close_db()
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Import clinics, pharmacies and shelters")
+    parser.add_argument("path", type=Path, help="directory with CSV/NDJSON files or a single file")
+    parser.add_argument("--chunk-size", type=int, default=20000, help="rows per COPY batch")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    if not args.path.exists():
+        logger.error(f"Path not found: {args.path}")
+        return 1
+
+    stats = asyncio.run(_run_import(args.path, args.chunk_size))
+    logger.info(
+        f"✅ Import finished: {stats.imported} imported, {stats.invalid} invalid "
+        f"of {stats.read} rows ({stats.rows_per_second:.0f} rows/s)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
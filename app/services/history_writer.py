@@ -0,0 +1,235 @@
+"""
+Buffered background writer for user action history
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, List
+import logging
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+BACKPRESSURE_DROP_OLDEST = "drop_oldest"
+BACKPRESSURE_BLOCK = "block"
+
+
+@dataclass
+class HistoryWriterStats:
+    """Counters reported by the history writer"""
+
+    enqueued: int = 0
+    dropped: int = 0
+    written: int = 0
+    failed: int = 0
+    batches: int = 0
+    last_batch_size: int = 0
+    last_flush_ms: float = 0.0
+    max_flush_ms: float = 0.0
+
+
+class HistoryWriter:
+    """
+    History writer service
+
+    Entries are accepted through a bounded queue and written in batches with
+    a single multi-row INSERT once the batch is full or the flush interval
+    has passed, so tracking an action never waits for the database.
+    """
+
+    def __init__(
+        self,
+        queue_size: int = settings.HISTORY_QUEUE_SIZE,
+        batch_size: int = settings.HISTORY_BATCH_SIZE,
+        flush_interval: float = settings.HISTORY_FLUSH_INTERVAL,
+        backpressure: str = settings.HISTORY_BACKPRESSURE,
+    ):
+        if backpressure not in (BACKPRESSURE_DROP_OLDEST, BACKPRESSURE_BLOCK):
+            raise ValueError(f"Unknown history backpressure policy: {backpressure}")
+
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.backpressure = backpressure
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.stats = HistoryWriterStats()
+        self.task: Optional[asyncio.Task] = None
+        # Set by stop(); kept out of the queue so drop_oldest cannot evict it
+        self._stopping = asyncio.Event()
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of entries waiting to be written"""
+        return self.queue.qsize()
+
+    async def start(self):
+        """Start the background writer"""
+        if self.task and not self.task.done():
+            logger.warning("History writer already running")
+            return
+
+        self._stopping.clear()
+        self.task = asyncio.create_task(self._run())
+        logger.info("History writer started")
+
+    async def stop(self):
+        """Write all queued entries and stop the writer"""
+        if not self.task:
+            return
+
+        self._stopping.set()
+        await self.task
+        self.task = None
+        logger.info(
+            f"History writer stopped: {self.stats.written} written, "
+            f"{self.stats.dropped} dropped, {self.stats.failed} failed"
+        )
+
+    async def add(
+        self,
+        user_id: int,
+        action: str,
+        action_type: Optional[str] = None,
+        metadata: Optional[dict] = None,
+    ):
+        """
+        Queue a history entry
+
+        Args:
+            user_id: Database user ID
+            action: Action description
+            action_type: Action category (profile, reminder, ad, etc.)
+            metadata: Extra data stored with the entry
+        """
+        entry = {
+            "user_id": user_id,
+            "action": action,
+            "action_type": action_type,
+            "metadata": metadata,
+            "created_at": datetime.utcnow(),
+        }
+
+        if self.backpressure == BACKPRESSURE_BLOCK:
+            if not await self._put(entry):
+                # Nobody would ever make room for it
+                self.stats.dropped += 1
+                return
+        else:
+            while self.queue.full():
+                self.queue.get_nowait()
+                self.stats.dropped += 1
+            self.queue.put_nowait(entry)
+
+        self.stats.enqueued += 1
+
+    async def _put(self, entry: dict) -> bool:
+        """
+        Wait for room in the queue
+
+        Returns:
+            True once queued, False if the queue is full and stop() was called
+        """
+        if not self.queue.full():
+            self.queue.put_nowait(entry)
+            return True
+
+        putter = asyncio.ensure_future(self.queue.put(entry))
+        stopping = asyncio.ensure_future(self._stopping.wait())
+        try:
+            await asyncio.wait((putter, stopping), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            stopping.cancel()
+            if not putter.done():
+                putter.cancel()
+
+        return putter.done() and not putter.cancelled()
+
+    async def _get(self, timeout: Optional[float] = None) -> Optional[dict]:
+        """
+        Wait for the next queued entry
+
+        Args:
+            timeout: Seconds to wait, None to wait until an entry or stop()
+
+        Returns:
+            The entry, or None on timeout or once stop() was called
+        """
+        if not self.queue.empty():
+            return self.queue.get_nowait()
+
+        getter = asyncio.ensure_future(self.queue.get())
+        stopping = asyncio.ensure_future(self._stopping.wait())
+        try:
+            await asyncio.wait((getter, stopping), timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            stopping.cancel()
+            if not getter.done():
+                # A cancelled get leaves the entry in the queue for the drain
+                getter.cancel()
+
+        return getter.result() if getter.done() and not getter.cancelled() else None
+
+    async def _run(self):
+        """Main loop collecting entries into batches"""
+        while not self._stopping.is_set():
+            item = await self._get()
+            if item is None:
+                break
+            batch: List[dict] = [item]
+
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                item = await self._get(timeout)
+                if item is None:
+                    break
+                batch.append(item)
+
+            await self._flush(batch)
+
+        # Drain whatever is still queued
+        batch = []
+        while not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+            if len(batch) >= self.batch_size:
+                await self._flush(batch)
+                batch = []
+        await self._flush(batch)
+
+    async def _flush(self, batch: List[dict]):
+        """
+        Write a batch of entries in one INSERT
+
+        Args:
+            batch: Queued history entries
+        """
+        if not batch:
+            return
+
+        from app.database import AsyncSessionLocal, crud
+
+        started = time.perf_counter()
+        try:
+            async with AsyncSessionLocal() as session:
+                await crud.add_history_bulk(session, batch)
+                await session.commit()
+        except Exception as e:
+            self.stats.failed += len(batch)
+            logger.error(f"Error writing history batch of {len(batch)}: {e}")
+            return
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.stats.written += len(batch)
+        self.stats.batches += 1
+        self.stats.last_batch_size = len(batch)
+        self.stats.last_flush_ms = elapsed_ms
+        if elapsed_ms > self.stats.max_flush_ms:
+            self.stats.max_flush_ms = elapsed_ms
+
+
+# Global writer instance
+history_writer = HistoryWriter()
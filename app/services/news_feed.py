@@ -0,0 +1,139 @@
+"""
+News feed pages rendered from the news table
+"""
+
+from typing import Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import crud, News
+from app.locales import get_text
+from app.utils.cache import TwoTierCache
+from app.utils.pagination import encode_cursor, decode_cursor
+
+# News items per page
+NEWS_PAGE_SIZE = 5
+
+# Current feed version; replaced on every news write, other instances drop their copy
+NEWS_VERSION_NAMESPACE = "news_version"
+_version_cache = TwoTierCache(NEWS_VERSION_NAMESPACE, maxsize=1, ttl=settings.NEWS_VERSION_TTL)
+
+# (language, page cursor, version) -> {"text": ..., "next": cursor}; pages of
+# an old version are never requested again and simply expire
+NEWS_PAGE_NAMESPACE = "news_page"
+_page_cache = TwoTierCache(NEWS_PAGE_NAMESPACE, maxsize=256, ttl=settings.NEWS_CACHE_TTL)
+
+FIRST_PAGE = "first"
+
+
+def _body(news: News, language: str) -> str:
+    """Body in the given language, Russian when there is no translation"""
+    return getattr(news, f"body_{language}", None) or news.body_ru
+
+
+async def get_news_version(session: AsyncSession) -> str:
+    """Current feed version, from cache when possible"""
+    return await _version_cache.get_or_load("current", lambda: crud.get_news_version(session))
+
+
+async def get_news_page(
+    session: AsyncSession,
+    language: str,
+    cursor: Optional[str] = None
+) -> Tuple[str, Optional[str]]:
+    """
+    Get a rendered news page, from cache when possible
+
+    With both the version and the page cached no query is made.
+
+    Args:
+        session: Database session (used on cache miss only)
+        language: Language code (ru/en/uz)
+        cursor: Page cursor from the previous page, None for the newest news
+
+    Returns:
+        Tuple of HTML text and the cursor of the next page (None on the last page)
+
+    Raises:
+        ValueError: If cursor is malformed
+    """
+    after = decode_cursor(cursor) if cursor else None
+    version = await get_news_version(session)
+
+    async def render() -> dict:
+        items, next_key = await crud.get_news_page(session, limit=NEWS_PAGE_SIZE, after=after)
+        header = get_text(0, "news_section", language)
+        if not items:
+            return {"text": f"{header}\n\n{get_text(0, 'no_news', language)}", "next": None}
+
+        entries = [
+            f"📰 <i>{item.published_at:%d.%m.%Y}</i>\n{_body(item, language)}"
+            for item in items
+        ]
+        return {
+            "text": f"{header}\n\n" + "\n\n".join(entries),
+            "next": encode_cursor(next_key) if next_key else None,
+        }
+
+    page = await _page_cache.get_or_load((language, cursor or FIRST_PAGE, version), render)
+    return page["text"], page["next"]
+
+
+async def publish_news(
+    session: AsyncSession,
+    body_ru: str,
+    body_en: Optional[str] = None,
+    body_uz: Optional[str] = None
+) -> News:
+    """
+    Publish a news item and store the new feed version on all instances
+
+    Args:
+        session: Database session (committed here)
+        body_ru: Russian body (HTML)
+        body_en: English body, falls back to Russian
+        body_uz: Uzbek body, falls back to Russian
+
+    Returns:
+        Created news item
+    """
+    news = await crud.create_news(session, body_ru, body_en, body_uz)
+    await session.commit()
+    await _store_version(session)
+    return news
+
+
+async def update_news(
+    session: AsyncSession,
+    news_id: int,
+    body_ru: Optional[str] = None,
+    body_en: Optional[str] = None,
+    body_uz: Optional[str] = None,
+    is_published: Optional[bool] = None
+) -> Optional[News]:
+    """
+    Edit or unpublish a news item and store the new feed version on all instances
+
+    Args:
+        session: Database session (committed here)
+        news_id: News item ID
+        body_ru: New Russian body, unchanged when None
+        body_en: New English body, unchanged when None
+        body_uz: New Uzbek body, unchanged when None
+        is_published: False to hide the item from the feed, True to show it again
+
+    Returns:
+        Updated news item, None if there is no such item
+    """
+    news = await crud.update_news(session, news_id, body_ru, body_en, body_uz, is_published)
+    await session.commit()
+    await _store_version(session)
+    return news
+
+
+async def _store_version(session: AsyncSession) -> None:
+    """Cache the feed version after a committed news write"""
+    # Stored, not just dropped: a version load still running keeps its old result to itself
+    await _version_cache.set("current", await crud.get_news_version(session))
+
@@ -0,0 +1,232 @@
+"""
+Monthly partition maintenance for append-only tables
+"""
+
+import asyncio
+import re
+from datetime import date, datetime
+from typing import Optional, Dict, List
+import logging
+
+from sqlalchemy import text
+
+from app.config import settings
+from app.database.models import PARTITIONED_TABLES
+
+logger = logging.getLogger(__name__)
+
+# Run maintenance once per day
+MAINTENANCE_INTERVAL = 24 * 60 * 60
+
+_MONTH_SUFFIX = re.compile(r"_(\d{4})_(\d{2})$")
+
+
+def _add_months(month_start: date, months: int) -> date:
+    """Shift first day of month by a number of months"""
+    index = month_start.year * 12 + month_start.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+async def _partitions(conn, table: str) -> List[str]:
+    """Names of the partitions attached to a table"""
+    result = await conn.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = :table"
+        ),
+        {"table": table},
+    )
+    return list(result.scalars())
+
+
+class PartitionManager:
+    """
+    Partition manager service
+
+    Keeps monthly partitions of history/symptoms created ahead of time and
+    enforces retention by dropping whole partitions instead of DELETEs.
+    """
+
+    def __init__(
+        self,
+        premake_months: int = settings.PARTITION_PREMAKE_MONTHS,
+        retention_months: Optional[Dict[str, int]] = None,
+    ):
+        self.premake_months = premake_months
+        self.retention_months = retention_months or {
+            "history": settings.HISTORY_RETENTION_MONTHS,
+            "symptoms": settings.SYMPTOMS_RETENTION_MONTHS,
+        }
+        self.running = False
+        self.task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Start periodic partition maintenance"""
+        if self.running:
+            logger.warning("Partition manager already running")
+            return
+
+        self.running = True
+        self.task = asyncio.create_task(self._run())
+        logger.info("Partition manager started")
+
+    async def stop(self):
+        """Stop periodic partition maintenance"""
+        self.running = False
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+        logger.info("Partition manager stopped")
+
+    async def _run(self):
+        """Main maintenance loop"""
+        while self.running:
+            try:
+                await self.maintain()
+            except Exception as e:
+                logger.error(f"Error maintaining partitions: {e}")
+
+            await asyncio.sleep(MAINTENANCE_INTERVAL)
+
+    async def maintain(self, today: Optional[date] = None):
+        """
+        Create upcoming partitions and drop expired ones for all tables
+
+        Args:
+            today: Reference date (defaults to current UTC date)
+        """
+        today = today or datetime.utcnow().date()
+        current_month = today.replace(day=1)
+
+        for table in PARTITIONED_TABLES:
+            await self.ensure_partitions(table, current_month)
+            retention = self.retention_months.get(table, 0)
+            if retention > 0:
+                await self.drop_expired(table, _add_months(current_month, -retention))
+
+    async def ensure_partitions(self, table: str, current_month: date) -> List[str]:
+        """
+        Create partitions from the current month up to premake_months ahead
+
+        Months with rows in the default partition (written while their
+        partition was missing) get a partition too, and the rows are moved
+        into it, so retention can drop them and the default stays empty.
+
+        Args:
+            table: Partitioned table name
+            current_month: First day of the current month
+
+        Returns:
+            Names of created partitions
+        """
+        from app.database.database import engine
+
+        months = {_add_months(current_month, offset) for offset in range(self.premake_months + 1)}
+        async with engine.connect() as conn:
+            existing = set(await _partitions(conn, table))
+            result = await conn.execute(text(
+                f"SELECT DISTINCT date_trunc('month', created_at)::date FROM {table}_default "
+                f"WHERE created_at IS NOT NULL"
+            ))
+            months.update(result.scalars())
+
+        created = []
+        for month_start in sorted(months):
+            name = f"{table}_{month_start:%Y_%m}"
+            if name in existing:
+                continue
+            try:
+                moved = await self._create_partition(table, name, month_start)
+            except Exception as e:
+                logger.error(f"Could not create partition {name}: {e}")
+                continue
+            created.append(name)
+            if moved:
+                logger.warning(f"Created partition {name}, moved {moved} rows from {table}_default")
+            else:
+                logger.info(f"Created partition {name}")
+
+        await self._check_default(table)
+        return created
+
+    async def _create_partition(self, table: str, name: str, month_start: date) -> int:
+        """
+        Create a monthly partition, moving its rows out of the default partition
+
+        Returns:
+            Number of moved rows
+        """
+        from app.database.database import engine
+
+        month_end = _add_months(month_start, 1)
+        bounds = f"FOR VALUES FROM ('{month_start}') TO ('{month_end}')"
+        in_month = f"created_at >= '{month_start}' AND created_at < '{month_end}'"
+
+        async with engine.begin() as conn:
+            result = await conn.execute(text(f"SELECT EXISTS (SELECT 1 FROM {table}_default WHERE {in_month})"))
+            if not result.scalar():
+                await conn.execute(text(f"CREATE TABLE {name} PARTITION OF {table} {bounds}"))
+                return 0
+
+            # The new partition may not overlap rows in the default one, so
+            # they are moved while it is detached; writes wait for the commit
+            await conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {table}_default"))
+            await conn.execute(text(f"CREATE TABLE {name} PARTITION OF {table} {bounds}"))
+            result = await conn.execute(text(
+                f"WITH moved AS (DELETE FROM {table}_default WHERE {in_month} RETURNING *) "
+                f"INSERT INTO {name} SELECT * FROM moved"
+            ))
+            await conn.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {table}_default DEFAULT"))
+            return result.rowcount
+
+    async def _check_default(self, table: str) -> int:
+        """Warn when rows are left in the default partition"""
+        from app.database.database import engine
+
+        async with engine.connect() as conn:
+            rows = (await conn.execute(text(f"SELECT count(*) FROM {table}_default"))).scalar()
+        if rows:
+            logger.warning(f"{table}_default holds {rows} rows outside monthly partitions")
+        return rows
+
+    async def drop_expired(self, table: str, cutoff_month: date) -> List[str]:
+        """
+        Detach and drop partitions that end on or before the cutoff month
+
+        Args:
+            table: Partitioned table name
+            cutoff_month: First month that must be kept
+
+        Returns:
+            Names of dropped partitions
+        """
+        from app.database.database import engine
+
+        dropped = []
+        async with engine.connect() as conn:
+            partitions = await _partitions(conn, table)
+
+        for name in partitions:
+            match = _MONTH_SUFFIX.search(name)
+            if not match:
+                continue
+            month_start = date(int(match.group(1)), int(match.group(2)), 1)
+            if _add_months(month_start, 1) > cutoff_month:
+                continue
+
+            async with engine.begin() as conn:
+                await conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+                await conn.execute(text(f"DROP TABLE {name}"))
+            dropped.append(name)
+            logger.info(f"Dropped expired partition {name}")
+
+        return dropped
+
+
+# Global partition manager instance
+partition_manager = PartitionManager()
@@ -0,0 +1,362 @@
+"""
+Reminder recurrence engine
+
+Usage:
+    python -m app.services.recurrence [--missing-only] [--batch-size 100000]
+
+Reminder dates, times and weekdays are wall-clock values in
+REMINDER_TIMEZONE; fire times are naive UTC like the rest of the database.
+
+next_fire_time() derives the next fire time of a single reminder and is
+used by the scheduler and the handlers. next_fire_times() does the same for
+whole columns of reminders with NumPy, converting every distinct wall-clock
+value between the timezone and UTC only once, and backs the command line
+recompute of reminders.next_fire_at after a timezone rule (DST) change.
+Restart the bot afterwards so the scheduler reloads the new fire times.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from datetime import datetime, date, time as dt_time, timedelta, timezone as dt_timezone
+from typing import Callable, List, Optional, Sequence, Tuple
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Wall-clock time used when a reminder has a date but no time
+DEFAULT_REMINDER_TIME = dt_time(9, 0)
+
+# UTC offsets only change on quarter hours, so offsets of "after" values
+# are looked up once per quarter hour
+_OFFSET_RESOLUTION_MINUTES = 15
+
+_NAT = np.datetime64("NaT", "us")
+_DAY = np.timedelta64(1, "D")
+_NO_FIRE = np.iinfo(np.int64).max
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def parse_time(value: Optional[str]) -> dt_time:
+    """Parse "HH:MM" reminder time"""
+    if not value:
+        return DEFAULT_REMINDER_TIME
+    hours, minutes = value.split(":")
+    return dt_time(int(hours), int(minutes))
+
+
+def to_utc(local: datetime, tz: ZoneInfo) -> datetime:
+    """Convert wall-clock time in the given timezone to naive UTC"""
+    return local.replace(tzinfo=tz).astimezone(dt_timezone.utc).replace(tzinfo=None)
+
+
+def to_local(utc: datetime, tz: ZoneInfo) -> datetime:
+    """Convert naive UTC to wall-clock time in the given timezone"""
+    return utc.replace(tzinfo=dt_timezone.utc).astimezone(tz).replace(tzinfo=None)
+
+
+def next_fire_time(reminder, after: datetime, tz: ZoneInfo) -> Optional[datetime]:
+    """
+    Calculate the first fire time of a reminder after the given moment
+
+    Args:
+        reminder: Object with reminder_type, reminder_date, reminder_time
+            and reminder_days attributes
+        after: Naive UTC time (last delivery, creation or now)
+        tz: Timezone of the reminder's wall-clock values
+
+    Returns:
+        Next fire time (naive UTC) or None if the reminder is finished
+    """
+    reminder_type = reminder.reminder_type
+    at = parse_time(reminder.reminder_time) if reminder.reminder_time else None
+
+    if reminder_type == "one_time":
+        if reminder.reminder_date is None:
+            return None
+        local = reminder.reminder_date
+        if at is not None:
+            local = datetime.combine(local.date(), at)
+        fire_at = to_utc(local, tz)
+        return fire_at if fire_at > after else None
+
+    at = at or DEFAULT_REMINDER_TIME
+    local_after = to_local(after, tz)
+
+    if reminder_type == "daily":
+        candidate = datetime.combine(local_after.date(), at)
+        if to_utc(candidate, tz) <= after:
+            candidate += timedelta(days=1)
+        return to_utc(candidate, tz)
+
+    if reminder_type == "weekly":
+        days = set(json.loads(reminder.reminder_days or "[]"))
+        if not days:
+            return None
+        for offset in range(8):
+            candidate = datetime.combine(local_after.date() + timedelta(days=offset), at)
+            if candidate.weekday() in days and to_utc(candidate, tz) > after:
+                return to_utc(candidate, tz)
+        return None
+
+    if reminder_type == "custom":
+        dates = sorted(date.fromisoformat(d) for d in json.loads(reminder.reminder_days or "[]"))
+        for day in dates:
+            fire_at = to_utc(datetime.combine(day, at), tz)
+            if fire_at > after:
+                return fire_at
+        return None
+
+    return None
+
+
+def count_occurrences(reminder, after: datetime, until: datetime, tz: ZoneInfo, limit: int = 1000) -> int:
+    """
+    Count fire times of a reminder in (after, until]
+
+    Args:
+        reminder: Object with the scheduling attributes
+        after: Naive UTC start (exclusive), usually last delivery
+        until: Naive UTC end (inclusive)
+        tz: Timezone of the reminder's wall-clock values
+        limit: Stop counting at this number
+
+    Returns:
+        Number of occurrences, at most limit
+    """
+    count = 0
+    fire_at = next_fire_time(reminder, after, tz)
+    while fire_at is not None and fire_at <= until and count < limit:
+        count += 1
+        fire_at = next_fire_time(reminder, fire_at, tz)
+    return count
+
+
+# ==================== BULK ====================
+
+def _convert_unique(values: np.ndarray, convert: Callable[[datetime], datetime]) -> np.ndarray:
+    """Apply a scalar datetime conversion once per distinct value"""
+    values = values.astype("datetime64[us]")
+    result = np.full(values.shape, _NAT)
+    valid = ~np.isnat(values)
+    if not valid.any():
+        return result
+
+    unique, inverse = np.unique(values[valid], return_inverse=True)
+    converted = np.array([convert(value) for value in unique.astype(object)], dtype="datetime64[us]")
+    result[valid] = converted[inverse]
+    return result
+
+
+def _to_datetime64(values: Sequence[Optional[datetime]]) -> np.ndarray:
+    """Naive datetimes (None for NaT) to datetime64[us], several times faster than np.asarray"""
+    nat = _NAT.astype(np.int64)
+    return np.fromiter(
+        ((value - _EPOCH) // _MICROSECOND if value is not None else nat for value in values),
+        dtype=np.int64,
+        count=len(values)
+    ).view("datetime64[us]")
+
+
+def _weekday(days: np.ndarray) -> np.ndarray:
+    """Weekday (Monday is 0) of datetime64[D] values"""
+    # 1970-01-01 was a Thursday
+    return (days.astype(np.int64) + 3) % 7
+
+
+def next_fire_times(
+    reminder_types: Sequence[str],
+    reminder_dates: Sequence[Optional[datetime]],
+    reminder_times: Sequence[Optional[str]],
+    reminder_days: Sequence[Optional[str]],
+    after: Sequence[datetime],
+    tz: ZoneInfo
+) -> np.ndarray:
+    """
+    Vectorized next_fire_time() over columns of reminders
+
+    Args:
+        reminder_types: reminder_type of each reminder
+        reminder_dates: reminder_date of each reminder
+        reminder_times: reminder_time of each reminder
+        reminder_days: reminder_days (JSON) of each reminder
+        after: Naive UTC moment to search after, per reminder
+        tz: Timezone of the reminders' wall-clock values
+
+    Returns:
+        datetime64[us] array of next fire times, NaT for finished reminders
+    """
+    count = len(reminder_types)
+    result = np.full(count, _NAT)
+    if not count:
+        return result
+
+    def utc(local: np.ndarray) -> np.ndarray:
+        return _convert_unique(local, lambda value: to_utc(value, tz))
+
+    types = np.asarray(reminder_types, dtype=object)
+    after = _to_datetime64(after)
+
+    minutes_of = {}
+    for value in set(reminder_times):
+        at = parse_time(value)
+        minutes_of[value] = at.hour * 60 + at.minute
+    minutes = np.array([minutes_of[value] for value in reminder_times], dtype="timedelta64[m]")
+    has_time = np.array([value is not None for value in reminder_times])
+
+    # Wall-clock day of "after"
+    after_floor = (
+        after.astype("datetime64[m]").astype(np.int64) // _OFFSET_RESOLUTION_MINUTES * _OFFSET_RESOLUTION_MINUTES
+    ).astype("datetime64[m]")
+    offsets = _convert_unique(after_floor, lambda value: to_local(value, tz)) - after_floor
+    local_day = (after + offsets).astype("datetime64[D]")
+
+    one_time = np.flatnonzero(types == "one_time")
+    if one_time.size:
+        dates = _to_datetime64([reminder_dates[i] for i in one_time])
+        local = np.where(has_time[one_time], dates.astype("datetime64[D]") + minutes[one_time], dates)
+        fire_at = utc(local)
+        result[one_time] = np.where(fire_at > after[one_time], fire_at, _NAT)
+
+    daily = np.flatnonzero(types == "daily")
+    if daily.size:
+        local = local_day[daily] + minutes[daily]
+        fire_at = utc(local)
+        late = ~(fire_at > after[daily])
+        fire_at[late] = utc(local[late] + _DAY)
+        result[daily] = fire_at
+
+    weekly = np.flatnonzero(types == "weekly")
+    if weekly.size:
+        mask_of = {}
+        for value in {reminder_days[i] for i in weekly}:
+            mask_of[value] = sum(1 << day for day in set(json.loads(value or "[]")))
+        masks = np.array([mask_of[reminder_days[i]] for i in weekly], dtype=np.int64)
+        pending = np.ones(weekly.size, dtype=bool)
+        for offset in range(8):
+            days = local_day[weekly] + offset
+            hit = pending & ((masks >> _weekday(days)) & 1).astype(bool)
+            if not hit.any():
+                continue
+            rows = weekly[hit]
+            fire_at = utc(days[hit] + minutes[rows])
+            ok = fire_at > after[rows]
+            result[rows[ok]] = fire_at[ok]
+            pending[np.flatnonzero(hit)[ok]] = False
+
+    custom = np.flatnonzero(types == "custom")
+    if custom.size:
+        owners: List[int] = []
+        days: List[str] = []
+        for i in custom:
+            for day in json.loads(reminder_days[i] or "[]"):
+                owners.append(i)
+                days.append(day)
+        if days:
+            owner = np.array(owners, dtype=np.int64)
+            fire_at = utc(np.array(days, dtype="datetime64[D]") + minutes[owner])
+            ok = fire_at > after[owner]
+            earliest = np.full(count, _NO_FIRE, dtype=np.int64)
+            np.minimum.at(earliest, owner[ok], fire_at[ok].astype(np.int64))
+            found = earliest != _NO_FIRE
+            result[found] = earliest[found].astype("datetime64[us]")
+
+    return result
+
+
+# ==================== RECOMPUTE ====================
+
+async def recompute_next_fire_times(
+    only_missing: bool = False,
+    batch_size: int = 100000,
+    timezone: str = settings.REMINDER_TIMEZONE
+) -> Tuple[int, int]:
+    """
+    Re-derive reminders.next_fire_at of active reminders
+
+    Reminders without a next occurrence are deactivated.
+
+    Args:
+        only_missing: Only rows whose next_fire_at is not set yet
+        batch_size: Rows computed and written per batch
+        timezone: Timezone of the reminders' wall-clock values
+
+    Returns:
+        Tuple of updated and deactivated reminder counts
+    """
+    from app.database import AsyncSessionLocal, crud
+
+    tz = ZoneInfo(timezone)
+    now = datetime.utcnow()
+    updated = finished = 0
+
+    async def flush(rows) -> None:
+        nonlocal updated, finished
+        fire_at = next_fire_times(
+            [row.reminder_type for row in rows],
+            [row.reminder_date for row in rows],
+            [row.reminder_time for row in rows],
+            [row.reminder_days for row in rows],
+            [row.last_sent or row.created_at or now for row in rows],
+            tz
+        )
+        values = list(zip([row.id for row in rows], fire_at.tolist()))
+        async with AsyncSessionLocal() as session:
+            await crud.set_next_fire_times(session, values)
+            await session.commit()
+        updated += len(values)
+        finished += int(np.isnat(fire_at).sum())
+
+    async with AsyncSessionLocal() as session:
+        batch = []
+        async for row in crud.stream_active_reminders(session, batch_size, only_missing=only_missing):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                await flush(batch)
+                batch = []
+        if batch:
+            await flush(batch)
+
+    return updated, finished
+
+
+async def _run_recompute(only_missing: bool, batch_size: int, timezone: str) -> Tuple[int, int]:
+    """Recompute, then release database connections"""
+    from app.database import close_db
+
+    try:
+        return await recompute_next_fire_times(only_missing, batch_size, timezone)
+    finally:
+        await close_db()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Recompute next fire times of active reminders")
+    parser.add_argument("--missing-only", action="store_true", help="only rows without next_fire_at")
+    parser.add_argument("--batch-size", type=int, default=100000, help="rows per update batch")
+    parser.add_argument("--timezone", default=settings.REMINDER_TIMEZONE, help="timezone of reminder times")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    started = time.perf_counter()
+    updated, finished = asyncio.run(_run_recompute(args.missing_only, args.batch_size, args.timezone))
+    elapsed = time.perf_counter() - started
+    logger.info(
+        f"✅ Recomputed {updated} reminders ({finished} finished) "
+        f"in {elapsed:.1f}s ({updated / elapsed if elapsed else 0:.0f} rows/s)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,35 +3,130 @@ Reminder scheduling service
 """
 
 import asyncio
+import heapq
+import html
+import socket
+import uuid
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
+from zoneinfo import ZoneInfo
 import logging
 
+from app.config import settings
+from app.services import recurrence
+from app.services.sender import outbound_sender, PRIORITY_NOTIFICATION
+
 logger = logging.getLogger(__name__)
 
+# Reminders fetched per dispatch query
+DISPATCH_BATCH_SIZE = 500
+
+
+@dataclass
+class ReminderStats:
+    """Reminder delivery counters"""
+
+    reminders: int = 0  # reminders delivered
+    messages: int = 0  # Telegram messages they were delivered in
+    digests: int = 0  # messages carrying more than one reminder
+    failed: int = 0  # messages that could not be sent
+
+    @property
+    def call_reduction(self) -> float:
+        """Share of API calls saved by digests compared to one message per reminder"""
+        return 1 - self.messages / self.reminders if self.reminders else 0.0
+
+    def as_dict(self) -> dict:
+        """Counters for logging/metrics export"""
+        return {
+            "reminders": self.reminders,
+            "messages": self.messages,
+            "digests": self.digests,
+            "failed": self.failed,
+            "call_reduction": round(self.call_reduction, 3),
+        }
+
 
 class ReminderScheduler:
     """
     Reminder scheduler service
-    
-    Note: This is a basic implementation. For production, consider using
-    APScheduler or Celery for more robust scheduling.
+
+    Keeps the next fire time of every active reminder in a min-heap and
+    sleeps exactly until the earliest one is due. Handlers notify the
+    scheduler about new and cancelled reminders, so the database is only
+    queried for reminders that are actually due.
+
+    Fire times are persisted in reminders.next_fire_at and computed by
+    app.services.recurrence.
+
+    With several bot replicas use mode "lease" instead: each replica
+    claims batches of due reminders with FOR UPDATE SKIP LOCKED and a lease
+    expiry, so every reminder is delivered by exactly one replica, and
+    reminders of a replica that died mid-delivery are claimed again once
+    their lease expires.
+
+    After downtime, reminders that became due while the bot was down are
+    not sent in one burst: on start they are rescheduled evenly over a
+    catch-up window, and each is sent once, saying how many occurrences
+    were missed since its last delivery.
+
+    Reminders of one user due at the same time, or within the digest
+    window of each other, are sent as a single digest message with
+    per-item buttons; stats.call_reduction shows the API calls saved.
+
+    Reminders whose message could not be sent stay active and are retried
+    after retry_delay seconds.
     """
-    
-    def __init__(self):
+
+    def __init__(
+        self,
+        timezone: str = settings.REMINDER_TIMEZONE,
+        mode: str = settings.REMINDER_DISPATCH_MODE,
+        lease_seconds: float = settings.REMINDER_LEASE_SECONDS,
+        poll_interval: float = settings.REMINDER_POLL_INTERVAL,
+        catchup_grace: float = settings.REMINDER_CATCHUP_GRACE,
+        catchup_window: float = settings.REMINDER_CATCHUP_WINDOW,
+        digest_window: float = settings.REMINDER_DIGEST_WINDOW,
+        retry_delay: float = settings.REMINDER_RETRY_DELAY
+    ):
+        if mode not in ("heap", "lease"):
+            raise ValueError(f"Unknown reminder dispatch mode: {mode}")
+
+        self.timezone = ZoneInfo(timezone)
+        self.mode = mode
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.catchup_grace = catchup_grace
+        self.catchup_window = catchup_window
+        self.digest_window = digest_window
+        self.retry_delay = retry_delay
+        self.worker_id = f"{socket.gethostname()}:{uuid.uuid4().hex[:12]}"[-64:]
         self.running = False
         self.task: Optional[asyncio.Task] = None
-    
+
+        # (fire_at, reminder_id); entries not matching self.scheduled are stale
+        self.heap: List[Tuple[datetime, int]] = []
+        self.scheduled: Dict[int, datetime] = {}
+        self._wakeup = asyncio.Event()
+        self.stats = ReminderStats()
+
     async def start(self):
-        """Start the reminder scheduler"""
+        """Start the reminder scheduler (reminders are sent via outbound_sender)"""
         if self.running:
             logger.warning("Reminder scheduler already running")
             return
-        
+
+        await self.load()
+
         self.running = True
-        self.task = asyncio.create_task(self._check_reminders())
-        logger.info("Reminder scheduler started")
-    
+        if self.mode == "lease":
+            self.task = asyncio.create_task(self._claim_reminders())
+            logger.info(f"Reminder scheduler started in lease mode as {self.worker_id}")
+        else:
+            self.task = asyncio.create_task(self._check_reminders())
+            logger.info(f"Reminder scheduler started with {len(self.scheduled)} reminders")
+
     async def stop(self):
         """Stop the reminder scheduler"""
         self.running = False
@@ -41,65 +136,363 @@ class ReminderScheduler:
                 await self.task
             except asyncio.CancelledError:
                 pass
-        logger.info("Reminder scheduler stopped")
-    
+        logger.info(f"Reminder scheduler stopped: {self.stats.as_dict()}")
+
+    # ==================== HEAP ====================
+
+    def add(self, reminder_id: int, fire_at: Optional[datetime]):
+        """
+        Schedule (or reschedule) a reminder
+
+        Args:
+            reminder_id: Reminder ID
+            fire_at: Next fire time (naive UTC), None cancels the reminder
+        """
+        if self.mode == "lease":
+            # Fire times live in the database; only hurry up for due ones
+            if fire_at is not None and fire_at <= datetime.utcnow():
+                self._wakeup.set()
+            return
+
+        if fire_at is None:
+            self.cancel(reminder_id)
+            return
+
+        self.scheduled[reminder_id] = fire_at
+        heapq.heappush(self.heap, (fire_at, reminder_id))
+        if self.heap[0][1] == reminder_id and self.heap[0][0] == fire_at:
+            # New earliest item: wake the loop so it sleeps for the new delay
+            self._wakeup.set()
+
+    def cancel(self, reminder_id: int):
+        """
+        Unschedule a reminder; its heap entry is dropped lazily
+
+        Args:
+            reminder_id: Reminder ID
+        """
+        self.scheduled.pop(reminder_id, None)
+
+    def next_due(self) -> Optional[datetime]:
+        """Earliest scheduled fire time, discarding stale heap entries"""
+        while self.heap:
+            fire_at, reminder_id = self.heap[0]
+            if self.scheduled.get(reminder_id) == fire_at:
+                return fire_at
+            heapq.heappop(self.heap)
+        return None
+
+    def pop_due(self, now: datetime, limit: int = DISPATCH_BATCH_SIZE) -> List[int]:
+        """
+        Remove and return reminders due at the given time
+
+        Args:
+            now: Current time (naive UTC)
+            limit: Maximum number of reminders to return
+
+        Returns:
+            Reminder IDs in fire time order
+        """
+        return [reminder_id for _, reminder_id in self._pop_due_entries(now, limit)]
+
+    def _pop_due_entries(self, now: datetime, limit: int = DISPATCH_BATCH_SIZE) -> List[Tuple[datetime, int]]:
+        """Remove and return (fire_at, reminder_id) of due reminders in fire time order"""
+        due = []
+        while len(due) < limit:
+            fire_at = self.next_due()
+            if fire_at is None or fire_at > now:
+                break
+            entry = heapq.heappop(self.heap)
+            del self.scheduled[entry[1]]
+            due.append(entry)
+        return due
+
+    # ==================== LOOP ====================
+
     async def _check_reminders(self):
-        """Main loop to check and send reminders"""
+        """Main loop: sleep until the next fire time, then dispatch"""
         while self.running:
+            self._wakeup.clear()
+            next_due = self.next_due()
+            timeout = None
+            if next_due is not None:
+                timeout = (next_due - datetime.utcnow()).total_seconds()
+
+            if timeout is None or timeout > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
             try:
                 await self._process_reminders()
             except Exception as e:
                 logger.error(f"Error processing reminders: {e}")
-            
-            # Check every minute
-            await asyncio.sleep(60)
-    
-    async def _process_reminders(self):
+                await asyncio.sleep(1)
+
+    async def _claim_reminders(self):
+        """Lease mode loop: claim due reminders in batches, poll while idle"""
+        while self.running:
+            self._wakeup.clear()
+            try:
+                claimed = await self._process_claimed()
+            except Exception as e:
+                logger.error(f"Error processing claimed reminders: {e}")
+                claimed = 0
+
+            if claimed < DISPATCH_BATCH_SIZE:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def load(self):
+        """Fill the heap with next fire times of all active reminders"""
+        from app.database import AsyncSessionLocal, crud
+
+        # Rows created before next_fire_at existed
+        updated, _ = await recurrence.recompute_next_fire_times(only_missing=True, timezone=self.timezone.key)
+        if updated:
+            logger.info(f"Computed next fire time of {updated} reminders")
+
+        await self.catch_up()
+
+        if self.mode == "lease":
+            return
+
+        self.heap = []
+        self.scheduled = {}
+        async with AsyncSessionLocal() as session:
+            async for reminder_id, fire_at in crud.stream_reminder_fire_times(session):
+                self.scheduled[reminder_id] = fire_at
+                self.heap.append((fire_at, reminder_id))
+        heapq.heapify(self.heap)
+
+    async def catch_up(self, now: Optional[datetime] = None) -> int:
         """
-        Process due reminders
-        
-        Note: This needs database integration to fetch and update reminders
-        """
-        # TODO: Implement database query for due reminders
-        # from app.database import get_db, crud
-        # async with get_db() as session:
-        #     reminders = await crud.get_due_reminders(session)
-        #     for reminder in reminders:
-        #         await self._send_reminder(reminder)
-        pass
-    
-    async def _send_reminder(self, reminder: Dict):
-        """
-        Send a reminder to user
-        
+        Spread reminders missed during downtime over the catch-up window
+
+        Reminders overdue by more than the grace period get evenly spaced
+        fire times starting now, oldest first. The window is stretched when
+        the outbound global rate could not send them all within it.
+
         Args:
-            reminder: Reminder data
+            now: Current time (naive UTC)
+
+        Returns:
+            Number of rescheduled reminders
         """
-        # TODO: Implement reminder sending via bot
-        pass
-    
-    def calculate_next_reminder(
+        from app.database import AsyncSessionLocal, crud
+
+        now = now or datetime.utcnow()
+        async with AsyncSessionLocal() as session:
+            overdue = [
+                reminder_id
+                async for reminder_id in crud.stream_overdue_reminders(
+                    session, now - timedelta(seconds=self.catchup_grace)
+                )
+            ]
+        if not overdue:
+            return 0
+
+        window = max(self.catchup_window, len(overdue) / settings.OUTBOUND_GLOBAL_RATE)
+        step = window / len(overdue)
+        fire_times = [(reminder_id, now + timedelta(seconds=i * step)) for i, reminder_id in enumerate(overdue)]
+
+        async with AsyncSessionLocal() as session:
+            for start in range(0, len(fire_times), DISPATCH_BATCH_SIZE * 20):
+                await crud.reschedule_reminders(session, fire_times[start:start + DISPATCH_BATCH_SIZE * 20])
+            await session.commit()
+
+        logger.info(f"Catching up {len(overdue)} missed reminders over {window:.0f}s")
+        return len(overdue)
+
+    async def _process_reminders(self):
+        """Deliver due reminders and schedule their next occurrence"""
+        from app.database import AsyncSessionLocal, crud
+
+        now = datetime.utcnow()
+        due = self._pop_due_entries(now)
+        if not due:
+            return
+
+        rows = []
+        try:
+            async with AsyncSessionLocal() as session:
+                rows = await crud.get_due_reminders(
+                    session, [reminder_id for _, reminder_id in due], self._digest_until(now)
+                )
+                # Reminders pulled into a digest early leave the heap until rescheduled
+                for row in rows:
+                    self.cancel(row.id)
+                next_fire = await self._deliver(session, rows, now)
+        except Exception:
+            # Put them back, otherwise they are lost until the next restart
+            for row in rows:
+                self.add(row.id, row.next_fire_at)
+            for fire_at, reminder_id in due:
+                self.add(reminder_id, fire_at)
+            raise
+
+        for reminder_id, fire_at in next_fire.items():
+            self.add(reminder_id, fire_at)
+
+    async def _process_claimed(self) -> int:
+        """
+        Claim a batch of due reminders and deliver it (lease mode)
+
+        Returns:
+            Number of claimed reminders
+        """
+        from app.database import AsyncSessionLocal, crud
+
+        now = datetime.utcnow()
+        async with AsyncSessionLocal() as session:
+            rows = await crud.claim_due_reminders(
+                session, self.worker_id, now, now + timedelta(seconds=self.lease_seconds), DISPATCH_BATCH_SIZE,
+                digest_until=self._digest_until(now)
+            )
+            await session.commit()
+            if rows:
+                await self._deliver(session, rows, now, lease_owner=self.worker_id)
+        return len(rows)
+
+    async def _deliver(
         self,
-        reminder_type: str,
-        current_time: datetime
-    ) -> Optional[datetime]:
+        session,
+        rows,
+        now: datetime,
+        lease_owner: Optional[str] = None
+    ) -> Dict[int, Optional[datetime]]:
         """
-        Calculate next reminder time based on type
-        
+        Send reminders, then store their next fire times in one transaction
+
+        Rows of the same user are sent as one message. Sent reminders move
+        to their next occurrence; reminders whose message failed stay
+        active and are due again after the retry delay.
+
         Args:
-            reminder_type: Type of reminder (one_time, daily, weekly, custom)
-            current_time: Current datetime
-        
+            session: Database session
+            rows: Due reminder rows with the user's telegram_id and next_fire_at
+            now: Dispatch time (naive UTC)
+            lease_owner: Worker ID the rows are leased to (lease mode)
+
         Returns:
-            Next reminder datetime or None
-        """
-        if reminder_type == "one_time":
-            return None  # One-time reminders don't repeat
-        
-        elif reminder_type == "daily":
-            return current_time + timedelta(days=1)
-        
-        elif reminder_type == "weekly":
-            return current_time + timedelta(weeks=1)
-        
-        return None
+            Next fire time of each reminder (None when finished)
+        """
+        from app.database import crud
+
+        by_chat: Dict[int, list] = {}
+        for row in rows:
+            by_chat.setdefault(row.telegram_id, []).append(row)
+        groups = list(by_chat.values())
+
+        # Queued together, the outbound sender paces them
+        results = await asyncio.gather(*(self._send_reminders(group, now) for group in groups))
+        delivered = {row.id for group, sent in zip(groups, results) if sent for row in group}
+
+        retry_at = now + timedelta(seconds=self.retry_delay)
+        next_fire = {}
+        for row in rows:
+            if row.id not in delivered:
+                next_fire[row.id] = max(retry_at, row.next_fire_at) if row.next_fire_at else retry_at
+                continue
+            # Digest items due shortly after now must not fire again
+            after = max(now, row.next_fire_at) if row.next_fire_at else now
+            next_fire[row.id] = self.next_fire_time(row, after)
+
+        await crud.mark_reminders_sent(session, list(delivered), now, next_fire, lease_owner=lease_owner)
+        await session.commit()
+        return next_fire
+
+    def _digest_until(self, now: datetime) -> Optional[datetime]:
+        """Latest fire time a reminder may have to join a digest sent now"""
+        return now + timedelta(seconds=self.digest_window) if self.digest_window > 0 else None
+
+    async def _send_reminders(self, reminders: list, now: datetime) -> bool:
+        """
+        Send one user's due reminders in a single message
+
+        Args:
+            reminders: Due reminder rows of one user with the telegram_id and language
+            now: Dispatch time (naive UTC)
+
+        Returns:
+            True if the message was sent
+        """
+        from app.keyboards.inline import create_reminder_digest_keyboard
+
+        language = reminders[0].language
+        try:
+            await outbound_sender.send_message(
+                reminders[0].telegram_id,
+                self.reminder_text(reminders, now, language),
+                priority=PRIORITY_NOTIFICATION,
+                reply_markup=create_reminder_digest_keyboard([(r.id, r.text) for r in reminders], language)
+            )
+        except Exception as e:
+            logger.error(f"Error sending reminders {[r.id for r in reminders]}: {e}")
+            self.stats.failed += 1
+            return False
+
+        self.stats.reminders += len(reminders)
+        self.stats.messages += 1
+        if len(reminders) > 1:
+            self.stats.digests += 1
+        return True
+
+    def reminder_text(self, reminders: list, now: datetime, language: str = "ru") -> str:
+        """
+        Build the message for one user's reminders
+
+        Each reminder mentions occurrences missed since its last delivery.
+
+        Args:
+            reminders: Due reminder rows of one user
+            now: Dispatch time (naive UTC)
+            language: Language code of the user
+
+        Returns:
+            Message text (HTML)
+        """
+        from app.locales import get_text
+
+        if len(reminders) == 1:
+            reminder = reminders[0]
+            title = get_text(0, "reminder_title", language)
+            return f"{title}{self._missed_note(reminder, now, language)}\n\n{html.escape(reminder.text)}"
+
+        lines = [get_text(0, "reminder_digest_title", language, count=len(reminders)) + "\n"]
+        for index, reminder in enumerate(reminders, 1):
+            lines.append(f"{index}. {html.escape(reminder.text)}{self._missed_note(reminder, now, language)}")
+        return "\n".join(lines)
+
+    def _missed_note(self, reminder, now: datetime, language: str = "ru") -> str:
+        """Note on occurrences missed while the bot was down, empty if none"""
+        from app.locales import get_text
+
+        after = reminder.last_sent or reminder.created_at
+        if after is None:
+            return ""
+        missed = recurrence.count_occurrences(reminder, after, now, self.timezone)
+        if missed > 1:
+            return "\n" + get_text(0, "reminder_missed", language, count=missed)
+        return ""
+
+    def next_fire_time(self, reminder, after: datetime) -> Optional[datetime]:
+        """
+        Calculate the first fire time of a reminder after the given moment
+
+        Args:
+            reminder: Reminder or row with its scheduling columns
+            after: Naive UTC time (last delivery, creation or now)
+
+        Returns:
+            Next fire time (naive UTC) or None if the reminder is finished
+        """
+        return recurrence.next_fire_time(reminder, after, self.timezone)
+
+
+# Global scheduler instance
+reminder_scheduler = ReminderScheduler()
@@ -0,0 +1,427 @@
+"""
+Rate-limited outbound message pipeline
+
+Telegram allows about 30 messages per second per bot and one message per
+second per chat. Bulk traffic (reminders, broadcasts, notifications) is
+queued in OutboundSender by priority and released by a global token bucket
+and per-chat buckets. Interactive replies of handlers are not queued; they
+pass InteractiveRateLimitMiddleware, which charges the same buckets so
+queued traffic slows down around them.
+"""
+
+import asyncio
+import contextvars
+import itertools
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import SendMessage, TelegramMethod
+from aiogram.methods.base import Response, TelegramType
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Priority classes, lower is sent first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_NOTIFICATION = 1
+PRIORITY_BULK = 2
+
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: "interactive",
+    PRIORITY_NOTIFICATION: "notification",
+    PRIORITY_BULK: "bulk",
+}
+
+# Idle per-chat buckets are dropped once there are more than this
+CHAT_BUCKETS_PRUNE_AT = 10000
+
+# Set while a queued request is sent, so the middleware does not charge it twice
+_from_queue: contextvars.ContextVar[bool] = contextvars.ContextVar("outbound_from_queue", default=False)
+
+
+class TokenBucket:
+    """
+    Token bucket on the event loop clock
+
+    Tokens may go negative: interactive requests are never delayed, the
+    debt is paid by queued traffic.
+    """
+
+    __slots__ = ("rate", "capacity", "tokens", "updated", "paused_until", "last_sent")
+
+    def __init__(self, rate: float, capacity: float, now: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+        self.paused_until = 0.0
+        self.last_sent = float("-inf")
+
+    def _refill(self, now: float):
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def delay(self, now: float) -> float:
+        """Seconds until a token is available (0 if available now)"""
+        self._refill(now)
+        wait = 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+        return max(wait, self.paused_until - now)
+
+    def consume(self, now: float):
+        """Take one token"""
+        self._refill(now)
+        self.tokens -= 1
+
+    def spacing(self, now: float) -> float:
+        """Seconds left until 1/rate has passed since the last actual send"""
+        return max(0.0, self.last_sent + 1 / self.rate - now)
+
+    def pause(self, seconds: float, now: float):
+        """Hand out no tokens for the given time (flood control)"""
+        self._refill(now)
+        self.paused_until = max(self.paused_until, now + seconds)
+        self.tokens = min(self.tokens, 0)
+
+    def is_idle(self, now: float) -> bool:
+        """Bucket is full again, forgetting it changes nothing"""
+        self._refill(now)
+        return self.tokens >= self.capacity and now >= self.paused_until
+
+
+@dataclass
+class OutboundStats:
+    """Outbound pipeline counters"""
+
+    sent: int = 0
+    failed: int = 0
+    retry_after: int = 0
+    deferred: int = 0  # re-queued because the chat's bucket was empty
+    interactive: int = 0  # replies charged by the middleware
+    sent_by_priority: Dict[str, int] = field(default_factory=dict)
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+    @property
+    def avg_wait(self) -> float:
+        """Average seconds between enqueue and send"""
+        return self.total_wait / self.sent if self.sent else 0.0
+
+    def as_dict(self) -> dict:
+        """Counters for logging/metrics export"""
+        return {
+            "sent": self.sent,
+            "failed": self.failed,
+            "retry_after": self.retry_after,
+            "deferred": self.deferred,
+            "interactive": self.interactive,
+            "sent_by_priority": dict(self.sent_by_priority),
+            "avg_wait": round(self.avg_wait, 3),
+            "max_wait": round(self.max_wait, 3),
+        }
+
+
+@dataclass
+class OutboundItem:
+    """Queued request"""
+
+    chat_id: Any
+    method: TelegramMethod
+    priority: int
+    future: asyncio.Future
+    enqueued_at: float
+    attempts: int = 0
+    chat_token: bool = False  # token of the chat already taken while deferred
+
+
+class OutboundSender:
+    """
+    Outbound request queue
+
+    Worker tasks take requests by (priority, enqueue order). A request
+    whose chat has no token reserves the chat's next token and is put back
+    when it is due, so one busy chat does not hold back the others; then the
+    worker waits for a global token and sends. The global bucket holds a
+    single token, spreading requests evenly over each second.
+    TelegramRetryAfter pauses both buckets and retries the request.
+    """
+
+    def __init__(
+        self,
+        global_rate: float = settings.OUTBOUND_GLOBAL_RATE,
+        chat_rate: float = settings.OUTBOUND_CHAT_RATE,
+        workers: int = settings.OUTBOUND_WORKERS,
+        max_retries: int = settings.OUTBOUND_MAX_RETRIES
+    ):
+        self.global_rate = global_rate
+        self.chat_rate = chat_rate
+        self.worker_count = workers
+        self.max_retries = max_retries
+
+        self.bot: Optional[Bot] = None
+        self.queue: Optional[asyncio.PriorityQueue] = None
+        self.global_bucket: Optional[TokenBucket] = None
+        self.chat_buckets: Dict[Any, TokenBucket] = {}
+        self.workers = []
+        self.stats = OutboundStats()
+        self._sequence = itertools.count()
+        self._pending = 0
+
+    @property
+    def running(self) -> bool:
+        return bool(self.workers)
+
+    async def start(self, bot: Bot):
+        """
+        Start worker tasks and rate limiting of interactive replies
+
+        Args:
+            bot: Bot instance requests are sent with
+        """
+        if self.running:
+            logger.warning("Outbound sender already running")
+            return
+
+        loop = asyncio.get_running_loop()
+        self.bot = bot
+        self.queue = asyncio.PriorityQueue()
+        self.global_bucket = TokenBucket(self.global_rate, 1, loop.time())
+        bot.session.middleware(InteractiveRateLimitMiddleware(self))
+        self.workers = [asyncio.create_task(self._worker()) for _ in range(self.worker_count)]
+        logger.info(f"Outbound sender started ({self.global_rate:g} msg/s, {self.worker_count} workers)")
+
+    async def stop(self, timeout: float = 10.0):
+        """
+        Send what is queued (up to timeout), then stop workers
+
+        Args:
+            timeout: Seconds to wait for the queue to drain
+        """
+        if not self.running:
+            return
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while self._pending and loop.time() < deadline:
+            await asyncio.sleep(0.1)
+        if self._pending:
+            logger.warning(f"Outbound sender stopped with {self._pending} requests unsent")
+
+        for task in self.workers:
+            task.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+        while not self.queue.empty():
+            _, _, item = self.queue.get_nowait()
+            item.future.cancel()
+        logger.info(f"Outbound sender stopped: {self.stats.as_dict()}")
+
+    # ==================== QUEUE ====================
+
+    def enqueue(self, method: TelegramMethod, priority: int = PRIORITY_BULK) -> asyncio.Future:
+        """
+        Queue a request
+
+        Args:
+            method: Telegram method, e.g. SendMessage
+            priority: PRIORITY_INTERACTIVE, PRIORITY_NOTIFICATION or PRIORITY_BULK
+
+        Returns:
+            Future with the method result (or its exception)
+        """
+        if not self.running:
+            raise RuntimeError("Outbound sender is not started")
+
+        loop = asyncio.get_running_loop()
+        item = OutboundItem(
+            chat_id=getattr(method, "chat_id", None),
+            method=method,
+            priority=priority,
+            future=loop.create_future(),
+            enqueued_at=loop.time(),
+        )
+        self._pending += 1
+        item.future.add_done_callback(self._finished)
+        self.queue.put_nowait((priority, next(self._sequence), item))
+        return item.future
+
+    def _finished(self, future: asyncio.Future):
+        self._pending -= 1
+
+    async def send(self, method: TelegramMethod, priority: int = PRIORITY_BULK):
+        """Queue a request and wait for its result"""
+        return await self.enqueue(method, priority)
+
+    async def send_message(self, chat_id: int, text: str, priority: int = PRIORITY_BULK, **kwargs):
+        """
+        Queue a text message and wait until it is sent
+
+        Args:
+            chat_id: Target chat
+            text: Message text
+            priority: Priority class
+            **kwargs: Other SendMessage fields (reply_markup, parse_mode, ...)
+
+        Returns:
+            Sent message
+        """
+        return await self.send(SendMessage(chat_id=chat_id, text=text, **kwargs), priority)
+
+    def qsize(self) -> int:
+        """Number of requests not sent yet"""
+        return self._pending
+
+    # ==================== BUCKETS ====================
+
+    def chat_bucket(self, chat_id: Any, now: float) -> TokenBucket:
+        """Get (or create) the bucket of a chat"""
+        bucket = self.chat_buckets.get(chat_id)
+        if bucket is None:
+            if len(self.chat_buckets) >= CHAT_BUCKETS_PRUNE_AT:
+                self._prune_chat_buckets(now)
+            bucket = self.chat_buckets[chat_id] = TokenBucket(self.chat_rate, 1, now)
+        return bucket
+
+    def _prune_chat_buckets(self, now: float):
+        idle = [chat_id for chat_id, bucket in self.chat_buckets.items() if bucket.is_idle(now)]
+        for chat_id in idle:
+            del self.chat_buckets[chat_id]
+
+    def charge(self, chat_id: Any):
+        """Account a request sent outside the queue"""
+        now = asyncio.get_running_loop().time()
+        self.global_bucket.consume(now)
+        if chat_id is not None:
+            bucket = self.chat_bucket(chat_id, now)
+            bucket.consume(now)
+            bucket.last_sent = now
+        self.stats.interactive += 1
+
+    def flood_wait(self, chat_id: Any, seconds: float):
+        """Apply a RetryAfter received from Telegram"""
+        now = asyncio.get_running_loop().time()
+        self.stats.retry_after += 1
+        self.global_bucket.pause(seconds, now)
+        if chat_id is not None:
+            self.chat_bucket(chat_id, now).pause(seconds, now)
+        logger.warning(f"Flood control: retry after {seconds}s (chat {chat_id})")
+
+    # ==================== WORKERS ====================
+
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            entry = await self.queue.get()
+            priority, sequence, item = entry
+            if item.future.done():
+                # Cancelled by the caller
+                continue
+
+            bucket = None
+            if item.chat_id is not None:
+                now = loop.time()
+                bucket = self.chat_bucket(item.chat_id, now)
+                if not item.chat_token:
+                    wait = bucket.delay(now)
+                    bucket.consume(now)
+                    item.chat_token = True
+                    if wait > 0:
+                        self._defer(entry, wait)
+                        continue
+
+            while (wait := self.global_bucket.delay(loop.time())) > 0:
+                await asyncio.sleep(wait)
+
+            now = loop.time()
+            if bucket is not None:
+                # The global wait may have moved this send close to the previous one
+                wait = bucket.spacing(now)
+                if wait > 0:
+                    self._defer(entry, wait)
+                    continue
+                bucket.last_sent = now
+            self.global_bucket.consume(now)
+            item.chat_token = False
+
+            await self._deliver(item, entry)
+
+    def _defer(self, entry: tuple, wait: float):
+        """Put a request back into the queue after wait seconds"""
+        self.stats.deferred += 1
+        asyncio.get_running_loop().call_later(wait, self.queue.put_nowait, entry)
+
+    async def _deliver(self, item: OutboundItem, entry: tuple):
+        loop = asyncio.get_running_loop()
+        token = _from_queue.set(True)
+        try:
+            result = await self.bot(item.method)
+        except TelegramRetryAfter as e:
+            self.flood_wait(item.chat_id, e.retry_after)
+            item.attempts += 1
+            if item.attempts > self.max_retries:
+                self.stats.failed += 1
+                self._resolve(item.future, exception=e)
+            else:
+                self.queue.put_nowait(entry)
+        except Exception as e:
+            self.stats.failed += 1
+            self._resolve(item.future, exception=e)
+        else:
+            wait = loop.time() - item.enqueued_at
+            self.stats.sent += 1
+            self.stats.total_wait += wait
+            self.stats.max_wait = max(self.stats.max_wait, wait)
+            name = PRIORITY_NAMES.get(item.priority, str(item.priority))
+            self.stats.sent_by_priority[name] = self.stats.sent_by_priority.get(name, 0) + 1
+            self._resolve(item.future, result=result)
+        finally:
+            _from_queue.reset(token)
+
+    @staticmethod
+    def _resolve(future: asyncio.Future, result: Any = None, exception: Optional[BaseException] = None):
+        """Set the outcome unless the caller cancelled the future meanwhile"""
+        if future.done():
+            return
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(result)
+
+
+class InteractiveRateLimitMiddleware(BaseRequestMiddleware):
+    """
+    Bot session middleware accounting requests made outside the queue
+
+    Handler replies (message.answer, edits, ...) are sent right away but
+    consume tokens, and a RetryAfter is waited out and retried once.
+    """
+
+    def __init__(self, sender: OutboundSender):
+        self.sender = sender
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        chat_id = getattr(method, "chat_id", None)
+        if _from_queue.get() or chat_id is None:
+            return await make_request(bot, method)
+
+        self.sender.charge(chat_id)
+        try:
+            return await make_request(bot, method)
+        except TelegramRetryAfter as e:
+            self.sender.flood_wait(chat_id, e.retry_after)
+            await asyncio.sleep(e.retry_after)
+            return await make_request(bot, method)
+
+
+# Global outbound sender
+outbound_sender = OutboundSender()
@@ -2,99 +2,210 @@
 Symptom checking service
 """
 
-from typing import Dict, List
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
 
+# Label of the emergency keywords in the matcher
+EMERGENCY = "emergency"
 
-def analyze_symptoms(symptoms_text: str, pet_type: str = "unknown") -> str:
+# category -> (keywords, advice block); blocks are shown in this order
+SYMPTOM_CATEGORIES: Dict[str, Tuple[Tuple[str, ...], str]] = {
+    "digestive": (
+        ('рвота', 'понос', 'диарея', 'vomit', 'diarrhea'),
+        "⚠️ <b>Симптомы могут указывать на отравление или инфекцию.</b>\n"
+        "• Обеспечьте доступ к воде\n"
+        "• Не кормите 12-24 часа\n"
+        "• Срочно обратитесь к ветеринару\n\n",
+    ),
+    "appetite": (
+        ('не ест', 'аппетит', 'отказ', 'not eating', 'appetite'),
+        "⚠️ <b>Отказ от еды может быть признаком различных заболеваний.</b>\n"
+        "• Проверьте температуру\n"
+        "• Предложите любимое лакомство\n"
+        "• Если не ест более 24 часов - к врачу\n\n",
+    ),
+    "skin": (
+        ('чешется', 'зуд', 'аллергия', 'itching', 'scratch', 'allergy'),
+        "⚠️ <b>Возможна аллергия или кожное заболевание.</b>\n"
+        "• Проверьте на блох и клещей\n"
+        "• Исключите новые продукты\n"
+        "• Консультация дерматолога\n\n",
+    ),
+    "respiratory": (
+        ('кашель', 'чихает', 'дышит', 'cough', 'sneeze', 'breathing'),
+        "⚠️ <b>Проблемы с дыханием требуют внимания.</b>\n"
+        "• Проверьте температуру\n"
+        "• Обеспечьте покой\n"
+        "• При затрудненном дыхании - срочно к врачу\n\n",
+    ),
+    "pain": (
+        ('боль', 'хромает', 'скулит', 'pain', 'limping', 'whining'),
+        "⚠️ <b>Признаки боли или дискомфорта.</b>\n"
+        "• Ограничьте физическую активность\n"
+        "• Осмотрите на наличие травм\n"
+        "• Консультация ветеринара обязательна\n\n",
+    ),
+}
+
+EMERGENCY_SYMPTOMS: Tuple[str, ...] = (
+    'кровь', 'blood', 'судороги', 'seizure', 'не дышит', 'not breathing',
+    'потеря сознания', 'unconscious', 'травма', 'injury', 'яд', 'poison'
+)
+
+GENERAL_ADVICE = (
+    "ℹ️ <b>Общие рекомендации:</b>\n"
+    "• Наблюдайте за состоянием\n"
+    "• Измерьте температуру\n"
+    "• При ухудшении - обратитесь к ветеринару\n\n"
+)
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton finding labelled keywords in one pass over a text
+
+    Keywords are matched as substrings, overlapping ones included (e.g.
+    "дышит" inside "не дышит"), so the result equals testing every keyword
+    with `in`, but the cost depends on the text length only.
+    """
+
+    __slots__ = ("goto", "fail", "output")
+
+    def __init__(self, keywords: Iterable[Tuple[str, str]]):
+        """
+        Build the automaton
+
+        Args:
+            keywords: (keyword, label) pairs; keywords are matched lowercase
+        """
+        self.goto: List[Dict[str, int]] = [{}]
+        outputs: List[set] = [set()]
+        for keyword, label in keywords:
+            state = 0
+            for char in keyword.lower():
+                next_state = self.goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][char] = next_state
+                    self.goto.append({})
+                    outputs.append(set())
+                state = next_state
+            outputs[state].add(label)
+
+        # Breadth-first, so fail targets (shorter suffixes) are complete
+        # before their labels are merged into longer states
+        self.fail = [0] * len(self.goto)
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                outputs[next_state] |= outputs[self.fail[next_state]]
+                queue.append(next_state)
+
+        self.output: List[Optional[FrozenSet[str]]] = [frozenset(labels) or None for labels in outputs]
+
+    def find(self, text: str) -> FrozenSet[str]:
+        """
+        Find labels of all keywords occurring in the text
+
+        Args:
+            text: Text to scan (lowercased here)
+
+        Returns:
+            Labels of the matched keywords
+        """
+        goto, fail, output = self.goto, self.fail, self.output
+        found = set()
+        state = 0
+        for char in text.lower():
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state] is not None:
+                found |= output[state]
+        return frozenset(found)
+
+
+# Built once at import: every category keyword and the emergency keywords
+_matcher = KeywordMatcher(
+    [(keyword, category) for category, (keywords, _) in SYMPTOM_CATEGORIES.items() for keyword in keywords]
+    + [(keyword, EMERGENCY) for keyword in EMERGENCY_SYMPTOMS]
+)
+
+
+def match_symptoms(symptoms_text: str) -> FrozenSet[str]:
+    """
+    Find symptom categories and emergency keywords in a single pass
+
+    Args:
+        symptoms_text: Description of symptoms
+
+    Returns:
+        Matched category keys, plus EMERGENCY if emergency keywords occur
+    """
+    return _matcher.find(symptoms_text)
+
+
+def analyze_symptoms(
+    symptoms_text: str,
+    pet_type: str = "unknown",
+    matches: Optional[FrozenSet[str]] = None
+) -> str:
     """
     Analyze pet symptoms and provide basic recommendations
-    
+
     Args:
         symptoms_text: Description of symptoms
         pet_type: Type of pet (dog, cat, etc.)
-    
+        matches: Result of match_symptoms for the text, to avoid scanning it again
+
     Returns:
-        Recommendations text
-    
+        Recommendations text with a block for every matched category
+
     Note:
         This is a basic rule-based system. For production, consider
         integrating with a veterinary API or ML model.
     """
-    symptoms_lower = symptoms_text.lower()
+    if matches is None:
+        matches = match_symptoms(symptoms_text)
+
     response = "🩺 <b>Рекомендации по симптомам:</b>\n\n"
-    
-    # Check for digestive issues
-    if any(word in symptoms_lower for word in ['рвота', 'понос', 'диарея', 'vomit', 'diarrhea']):
-        response += "⚠️ <b>Симптомы могут указывать на отравление или инфекцию.</b>\n"
-        response += "• Обеспечьте доступ к воде\n"
-        response += "• Не кормите 12-24 часа\n"
-        response += "• Срочно обратитесь к ветеринару\n\n"
-    
-    # Check for appetite issues
-    elif any(word in symptoms_lower for word in ['не ест', 'аппетит', 'отказ', 'not eating', 'appetite']):
-        response += "⚠️ <b>Отказ от еды может быть признаком различных заболеваний.</b>\n"
-        response += "• Проверьте температуру\n"
-        response += "• Предложите любимое лакомство\n"
-        response += "• Если не ест более 24 часов - к врачу\n\n"
-    
-    # Check for skin issues
-    elif any(word in symptoms_lower for word in ['чешется', 'зуд', 'аллергия', 'itching', 'scratch', 'allergy']):
-        response += "⚠️ <b>Возможна аллергия или кожное заболевание.</b>\n"
-        response += "• Проверьте на блох и клещей\n"
-        response += "• Исключите новые продукты\n"
-        response += "• Консультация дерматолога\n\n"
-    
-    # Check for respiratory issues
-    elif any(word in symptoms_lower for word in ['кашель', 'чихает', 'дышит', 'cough', 'sneeze', 'breathing']):
-        response += "⚠️ <b>Проблемы с дыханием требуют внимания.</b>\n"
-        response += "• Проверьте температуру\n"
-        response += "• Обеспечьте покой\n"
-        response += "• При затрудненном дыхании - срочно к врачу\n\n"
-    
-    # Check for pain/discomfort
-    elif any(word in symptoms_lower for word in ['боль', 'хромает', 'скулит', 'pain', 'limping', 'whining']):
-        response += "⚠️ <b>Признаки боли или дискомфорта.</b>\n"
-        response += "• Ограничьте физическую активность\n"
-        response += "• Осмотрите на наличие травм\n"
-        response += "• Консультация ветеринара обязательна\n\n"
-    
-    # General recommendations
-    else:
-        response += "ℹ️ <b>Общие рекомендации:</b>\n"
-        response += "• Наблюдайте за состоянием\n"
-        response += "• Измерьте температуру\n"
-        response += "• При ухудшении - обратитесь к ветеринару\n\n"
-    
+
+    blocks = [advice for category, (_, advice) in SYMPTOM_CATEGORIES.items() if category in matches]
+    response += "".join(blocks) or GENERAL_ADVICE
+
     response += "<b>⚠️ ВНИМАНИЕ:</b> Это только общие рекомендации. "
     response += "Для точного диагноза обратитесь к ветеринару!"
-    
+
     return response
 
 
 def get_emergency_symptoms() -> List[str]:
     """
     Get list of emergency symptoms that require immediate attention
-    
+
     Returns:
         List of emergency symptom keywords
     """
-    return [
-        'кровь', 'blood', 'судороги', 'seizure', 'не дышит', 'not breathing',
-        'потеря сознания', 'unconscious', 'травма', 'injury', 'яд', 'poison'
-    ]
+    return list(EMERGENCY_SYMPTOMS)
 
 
-def is_emergency(symptoms_text: str) -> bool:
+def is_emergency(symptoms_text: str, matches: Optional[FrozenSet[str]] = None) -> bool:
     """
     Check if symptoms indicate an emergency
-    
+
     Args:
         symptoms_text: Description of symptoms
-    
+        matches: Result of match_symptoms for the text, to avoid scanning it again
+
     Returns:
         True if emergency symptoms detected
     """
-    symptoms_lower = symptoms_text.lower()
-    emergency_keywords = get_emergency_symptoms()
-    
-    return any(keyword in symptoms_lower for keyword in emergency_keywords)
+    if matches is None:
+        matches = match_symptoms(symptoms_text)
+    return EMERGENCY in matches
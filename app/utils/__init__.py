@@ -1,5 +1,6 @@
 """Utils module"""
 
 from .helpers import add_to_history, safe_edit_message
+from .pagination import encode_cursor, decode_cursor
 
-__all__ = ["add_to_history", "safe_edit_message"]
+__all__ = ["add_to_history", "safe_edit_message", "encode_cursor", "decode_cursor"]
@@ -0,0 +1,44 @@
+"""
+Bot HTTP session sending pre-serialized keyboards as is
+"""
+
+from typing import Dict
+
+from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.methods import TelegramMethod
+from aiogram.methods.base import TelegramType
+from aiogram.types import InputFile
+from aiohttp import FormData
+
+from app.keyboards.registry import FrozenInlineKeyboardMarkup
+
+
+class PreserializedSession(AiohttpSession):
+    """
+    Aiohttp session that skips dumping registry keyboards
+
+    Keyboards from app.keyboards.registry already hold their JSON, so the
+    markup is neither dumped to a dict nor encoded again for every request.
+    """
+
+    def build_form_data(self, bot: Bot, method: TelegramMethod[TelegramType]) -> FormData:
+        markup = getattr(method, "reply_markup", None)
+        if not isinstance(markup, FrozenInlineKeyboardMarkup):
+            return super().build_form_data(bot, method)
+
+        form = FormData(quote_fields=False)
+        files: Dict[str, InputFile] = {}
+        for key, value in method.model_dump(warnings=False, exclude={"reply_markup"}).items():
+            value = self.prepare_value(value, bot=bot, files=files)
+            if not value:
+                continue
+            form.add_field(key, value)
+        form.add_field("reply_markup", markup.json_payload)
+        for key, value in files.items():
+            form.add_field(
+                key,
+                value.read(bot),
+                filename=value.filename or key,
+            )
+        return form
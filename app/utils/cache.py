@@ -0,0 +1,502 @@
+"""
+Caching: in-process LRU cache and a two-tier (LRU + Redis) cache
+"""
+
+import asyncio
+import json
+import logging
+import random
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+from app.config import settings
+from app.utils.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters of a cache"""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups served from the cache"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> dict:
+        """Counters for logging/metrics export"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+
+class TTLCache:
+    """
+    Bounded LRU cache whose entries expire after a fixed time
+
+    Not thread-safe; meant to be used from the event loop only.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get cached value and mark it as recently used
+
+        Args:
+            key: Cache key
+            default: Returned on miss
+
+        Returns:
+            Cached value or default
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return default
+
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store value, evicting the least recently used entry when full
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Lifetime in seconds, defaults to the cache TTL
+        """
+        self._data[key] = (value, time.monotonic() + (self.ttl if ttl is None else ttl))
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.stats.evictions += 1
+
+    def keys(self) -> List[Hashable]:
+        """Snapshot of stored keys, including expired ones not yet purged"""
+        return list(self._data)
+
+    def delete(self, key: Hashable) -> None:
+        """Remove key if present"""
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries"""
+        self._data.clear()
+
+
+# ==================== TWO-TIER CACHE ====================
+
+# Redis channel carrying invalidations between bot instances
+INVALIDATION_CHANNEL = "cache:invalidate"
+
+# Identifies this process, so it skips its own invalidation messages
+INSTANCE_ID = uuid.uuid4().hex
+
+# Stored for keys whose loader returned None
+_NEGATIVE = object()
+_REDIS_NEGATIVE = ""
+
+# Missing marker for local lookups
+_ABSENT = object()
+
+# namespace -> cache, used to route invalidation messages
+_caches: Dict[str, "TwoTierCache"] = {}
+
+
+@dataclass
+class TwoTierStats:
+    """Counters of a two-tier cache"""
+
+    local_hits: int = 0
+    redis_hits: int = 0
+    negative_hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    loads: int = 0
+    load_errors: int = 0
+    stale_loads: int = 0
+    load_ms_total: float = 0.0
+    load_ms_max: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups served without calling the loader"""
+        hits = self.local_hits + self.redis_hits + self.negative_hits
+        lookups = hits + self.misses
+        return hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> dict:
+        """Counters for logging/metrics export"""
+        return {
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "loads": self.loads,
+            "load_errors": self.load_errors,
+            "stale_loads": self.stale_loads,
+            "load_ms_avg": round(self.load_ms_total / self.loads, 3) if self.loads else 0.0,
+            "load_ms_max": round(self.load_ms_max, 3),
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+
+class TwoTierCache:
+    """
+    In-process LRU tier in front of an optional Redis tier
+
+    Misses are loaded once per key no matter how many callers wait for it
+    (single-flight); set() and invalidate() detach a running load, so its
+    result is returned to its callers but never stored over the newer state.
+    None results are cached for a shorter negative TTL and
+    all TTLs are jittered so entries filled together do not expire together.
+    Invalidations are published over Redis pub/sub to the other instances.
+
+    Values stored in Redis must be JSON serializable; pass use_redis=False
+    for caches of arbitrary objects (they still receive invalidations).
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        maxsize: int,
+        ttl: float,
+        negative_ttl: float = settings.CACHE_NEGATIVE_TTL,
+        jitter: float = settings.CACHE_TTL_JITTER,
+        use_redis: bool = True,
+    ):
+        if namespace in _caches:
+            raise ValueError(f"Cache namespace already registered: {namespace}")
+
+        self.namespace = namespace
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.jitter = jitter
+        self.use_redis = use_redis
+        self.local = TTLCache(maxsize, ttl)
+        self.stats = TwoTierStats()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # Bumped by every set/invalidation, checked before filling from Redis
+        self._writes = 0
+        _caches[namespace] = self
+
+    def __len__(self) -> int:
+        return len(self.local)
+
+    @staticmethod
+    def _key(key: Hashable) -> str:
+        """Normalize key to the string used in both tiers"""
+        if isinstance(key, tuple):
+            return ":".join(str(part) for part in key)
+        return str(key)
+
+    def _redis_key(self, key: str) -> str:
+        return f"cache:{self.namespace}:{key}"
+
+    def _jittered(self, ttl: float) -> float:
+        return ttl * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def _redis(self):
+        return get_redis() if self.use_redis else None
+
+    def _store_local(self, key: str, value: Any) -> None:
+        if value is None:
+            self.local.set(key, _NEGATIVE, self._jittered(self.negative_ttl))
+        else:
+            self.local.set(key, value, self._jittered(self.ttl))
+
+    async def _store_redis(self, key: str, value: Any) -> None:
+        redis = self._redis()
+        if redis is None:
+            return
+        try:
+            if value is None:
+                await redis.set(self._redis_key(key), _REDIS_NEGATIVE, ex=max(1, int(self._jittered(self.negative_ttl))))
+            else:
+                await redis.set(self._redis_key(key), json.dumps(value), ex=max(1, int(self._jittered(self.ttl))))
+        except Exception as e:
+            logger.warning(f"Cache {self.namespace}: Redis store failed: {e}")
+
+    async def _lookup(self, key: str) -> Any:
+        """Look key up in both tiers; returns _ABSENT on miss"""
+        value = self.local.get(key, _ABSENT)
+        if value is not _ABSENT:
+            if value is _NEGATIVE:
+                self.stats.negative_hits += 1
+                return None
+            self.stats.local_hits += 1
+            return value
+
+        redis = self._redis()
+        if redis is not None:
+            writes = self._writes
+            try:
+                raw = await redis.get(self._redis_key(key))
+            except Exception as e:
+                logger.warning(f"Cache {self.namespace}: Redis lookup failed: {e}")
+                raw = None
+            if raw is not None:
+                value = None if raw == _REDIS_NEGATIVE else json.loads(raw)
+                if self._writes == writes:
+                    self._store_local(key, value)
+                if value is None:
+                    self.stats.negative_hits += 1
+                else:
+                    self.stats.redis_hits += 1
+                return value
+
+        return _ABSENT
+
+    async def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get cached value without loading it
+
+        Args:
+            key: Cache key
+            default: Returned on miss (also for negatively cached keys)
+
+        Returns:
+            Cached value or default
+        """
+        value = await self._lookup(self._key(key))
+        if value is _ABSENT:
+            self.stats.misses += 1
+            return default
+        return default if value is None else value
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Get cached value, loading it once on a miss
+
+        Concurrent callers missing the same key share a single loader call.
+
+        Args:
+            key: Cache key
+            loader: Coroutine function producing the value (None is cached negatively)
+
+        Returns:
+            Cached or loaded value
+        """
+        key = self._key(key)
+        value = await self._lookup(key)
+        if value is not _ABSENT:
+            return value
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.stats.coalesced += 1
+        else:
+            self.stats.misses += 1
+            task = asyncio.ensure_future(self._load(key, loader))
+            self._inflight[key] = task
+            task.add_done_callback(
+                lambda done: self._inflight.pop(key) if self._inflight.get(key) is done else None
+            )
+
+        # A cancelled caller must not cancel the load other callers wait for
+        return await asyncio.shield(task)
+
+    async def _load(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Run loader and fill both tiers unless the key changed meanwhile"""
+        started = time.perf_counter()
+        try:
+            value = await loader()
+        except Exception:
+            self.stats.load_errors += 1
+            raise
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.stats.loads += 1
+            self.stats.load_ms_total += elapsed_ms
+            if elapsed_ms > self.stats.load_ms_max:
+                self.stats.load_ms_max = elapsed_ms
+
+        # set()/invalidate() during the load detached this task from the key
+        if self._inflight.get(key) is not asyncio.current_task():
+            self.stats.stale_loads += 1
+            return value
+
+        self._store_local(key, value)
+        await self._store_redis(key, value)
+        return value
+
+    def _detach(self, key: Optional[str]) -> None:
+        """Keep loads running for key (None: every key) from storing their result"""
+        self._writes += 1
+        if key is None:
+            self._inflight.clear()
+        else:
+            self._inflight.pop(key, None)
+
+    async def set(self, key: Hashable, value: Any) -> None:
+        """
+        Store value in both tiers and drop stale copies on other instances
+
+        Args:
+            key: Cache key
+            value: Value to store (None caches the key negatively)
+        """
+        key = self._key(key)
+        self._detach(key)
+        self._store_local(key, value)
+        await self._store_redis(key, value)
+        await publish_invalidation(self.namespace, key)
+
+    async def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """
+        Drop key (or the whole namespace) everywhere
+
+        Args:
+            key: Cache key, None drops every entry of this cache
+        """
+        redis = self._redis()
+        if key is None:
+            self.local.clear()
+        else:
+            key = self._key(key)
+            self.local.delete(key)
+        self._detach(key)
+
+        if redis is not None:
+            try:
+                if key is None:
+                    async for redis_key in redis.scan_iter(match=self._redis_key("*"), count=1000):
+                        await redis.delete(redis_key)
+                else:
+                    await redis.delete(self._redis_key(key))
+            except Exception as e:
+                logger.warning(f"Cache {self.namespace}: Redis delete failed: {e}")
+        await publish_invalidation(self.namespace, key)
+
+    def invalidate_local(self, key: Optional[str] = None) -> None:
+        """Drop key (or everything) from the in-process tier only"""
+        self._detach(key)
+        if key is None:
+            self.local.clear()
+        else:
+            self.local.delete(key)
+
+
+async def publish_invalidation(namespace: str, key: Optional[str] = None) -> None:
+    """
+    Tell other instances to drop a key (or a whole namespace) locally
+
+    Args:
+        namespace: Cache namespace
+        key: Normalized cache key, None for the whole namespace
+    """
+    redis = get_redis()
+    if redis is None:
+        return
+    message = json.dumps({"origin": INSTANCE_ID, "ns": namespace, "key": key})
+    try:
+        await redis.publish(INVALIDATION_CHANNEL, message)
+    except Exception as e:
+        logger.warning(f"Cache invalidation publish failed: {e}")
+
+
+def get_cache_stats() -> Dict[str, dict]:
+    """Get counters of all two-tier caches"""
+    return {
+        namespace: {"size": len(cache), **cache.stats.as_dict()}
+        for namespace, cache in _caches.items()
+    }
+
+
+class CacheInvalidationListener:
+    """
+    Cache invalidation listener
+
+    Subscribes to the invalidation channel and drops local entries that
+    other instances (or the CLI tools) invalidated.
+    """
+
+    def __init__(self):
+        self.pubsub = None
+        self.task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Subscribe to invalidations (no-op without Redis)"""
+        redis = get_redis()
+        if redis is None or self.task:
+            return
+
+        self.pubsub = redis.pubsub(ignore_subscribe_messages=True)
+        await self.pubsub.subscribe(INVALIDATION_CHANNEL)
+        self.task = asyncio.create_task(self._run())
+        logger.info("Cache invalidation listener started")
+
+    async def stop(self):
+        """Unsubscribe and stop listening"""
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+        if self.pubsub is not None:
+            await self.pubsub.aclose()
+            self.pubsub = None
+        logger.info("Cache invalidation listener stopped")
+
+    async def _run(self):
+        """Main loop applying invalidation messages"""
+        while True:
+            try:
+                async for message in self.pubsub.listen():
+                    self.handle(message.get("data"))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Cache invalidation listener error: {e}")
+                await asyncio.sleep(1)
+
+    @staticmethod
+    def handle(data: Any) -> None:
+        """Apply one invalidation message"""
+        try:
+            message = json.loads(data)
+        except (TypeError, ValueError):
+            return
+        if message.get("origin") == INSTANCE_ID:
+            return
+        cache = _caches.get(message.get("ns"))
+        if cache is not None:
+            cache.invalidate_local(message.get("key"))
+
+
+# Global invalidation listener
+cache_invalidation_listener = CacheInvalidationListener()
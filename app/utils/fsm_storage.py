@@ -0,0 +1,184 @@
+"""
+FSM storage with expiry of abandoned flows
+"""
+
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StateType, StorageKey
+from aiogram.fsm.storage.redis import RedisStorage
+
+from app.config import settings
+from app.utils.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Lifetime of unfinished flows per states group (seconds); other states use
+# settings.FSM_STATE_TTL
+STATE_GROUP_TTLS: Dict[str, int] = {
+    "ProfileStates": 30 * 60,
+    "VetProfileStates": 60 * 60,
+    "AdStates": 30 * 60,
+    "ReminderStates": 15 * 60,
+    "SymptomsStates": 15 * 60,
+}
+
+
+def state_ttl(state: Optional[str]) -> int:
+    """
+    Get lifetime of a state
+
+    Args:
+        state: State name like "ProfileStates:waiting_for_city"
+
+    Returns:
+        TTL in seconds
+    """
+    if state:
+        group = state.split(":", 1)[0]
+        if group in STATE_GROUP_TTLS:
+            return STATE_GROUP_TTLS[group]
+    return settings.FSM_STATE_TTL
+
+
+def _dumps(data: Dict[str, Any]) -> str:
+    """Compact JSON without whitespace or escaped non-ASCII text"""
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+class TTLRedisStorage(RedisStorage):
+    """
+    Redis FSM storage whose keys expire with the current state's TTL
+
+    State and data keys are both (re)written with the current state's TTL on
+    every state change and data update, so a flow expires as a whole and
+    abandoned flows disappear from Redis.
+    """
+
+    def __init__(self, redis, **kwargs):
+        super().__init__(
+            redis,
+            state_ttl=settings.FSM_STATE_TTL,
+            json_dumps=_dumps,
+            **kwargs,
+        )
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        state_name = state.state if isinstance(state, State) else state
+        state_key = self.key_builder.build(key, "state")
+        if state_name is None:
+            await self.redis.delete(state_key)
+            return
+
+        ttl = state_ttl(state_name)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.set(state_key, state_name, ex=ttl)
+            pipe.expire(self.key_builder.build(key, "data"), ttl)
+            await pipe.execute()
+
+    async def set_data(self, key: StorageKey, data: Dict[str, Any]) -> None:
+        data_key = self.key_builder.build(key, "data")
+        if not data:
+            await self.redis.delete(data_key)
+            return
+
+        ttl = state_ttl(await self.get_state(key))
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.set(data_key, self.json_dumps(data), ex=ttl)
+            pipe.expire(self.key_builder.build(key, "state"), ttl)
+            await pipe.execute()
+
+    async def close(self) -> None:
+        # Shared client is closed by app.utils.redis_client.close_redis
+        pass
+
+
+@dataclass
+class _Record:
+    state: Optional[str] = None
+    data: Dict[str, Any] = field(default_factory=dict)
+    expires_at: float = 0.0
+
+
+class BoundedMemoryStorage(BaseStorage):
+    """
+    In-process FSM storage with per-state TTL and LRU eviction
+
+    Used when Redis is not configured. Holds at most max_entries flows, so
+    memory stays flat no matter how many flows are abandoned.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self.evictions = 0
+        self.storage: "OrderedDict[StorageKey, _Record]" = OrderedDict()
+
+    def _get(self, key: StorageKey) -> Optional[_Record]:
+        """Get live record and mark it as recently used"""
+        record = self.storage.get(key)
+        if record is None:
+            return None
+        if record.expires_at <= time.monotonic():
+            del self.storage[key]
+            return None
+        self.storage.move_to_end(key)
+        return record
+
+    def _put(self, key: StorageKey) -> _Record:
+        """Get or create record, evicting least recently used ones when full"""
+        record = self._get(key)
+        if record is None:
+            record = self.storage[key] = _Record()
+            while len(self.storage) > self.max_entries:
+                self.storage.popitem(last=False)
+                self.evictions += 1
+        return record
+
+    def _drop_if_empty(self, key: StorageKey, record: _Record) -> None:
+        """Forget finished flows right away"""
+        if record.state is None and not record.data:
+            self.storage.pop(key, None)
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        record = self._put(key)
+        record.state = state.state if isinstance(state, State) else state
+        record.expires_at = time.monotonic() + state_ttl(record.state)
+        self._drop_if_empty(key, record)
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        record = self._get(key)
+        return record.state if record else None
+
+    async def set_data(self, key: StorageKey, data: Dict[str, Any]) -> None:
+        record = self._put(key)
+        record.data = data.copy()
+        record.expires_at = time.monotonic() + state_ttl(record.state)
+        self._drop_if_empty(key, record)
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        record = self._get(key)
+        return record.data.copy() if record else {}
+
+    async def close(self) -> None:
+        self.storage.clear()
+
+
+def create_fsm_storage() -> BaseStorage:
+    """
+    Create FSM storage for the dispatcher
+
+    Returns:
+        Redis storage when REDIS_URL is configured, bounded memory storage otherwise
+    """
+    redis = get_redis()
+    if redis is not None:
+        logger.info("Using Redis FSM storage")
+        return TTLRedisStorage(redis)
+
+    logger.info(f"Using in-memory FSM storage (max {settings.FSM_MEMORY_MAX_ENTRIES} flows)")
+    return BoundedMemoryStorage(settings.FSM_MEMORY_MAX_ENTRIES)
@@ -8,6 +8,8 @@ from aiogram.types import Message
 from aiogram.enums import ParseMode
 from aiogram.types import InlineKeyboardMarkup
 
+from app.services.history_writer import history_writer
+
 
 async def safe_edit_message(
     message: Message,
@@ -46,6 +48,24 @@ async def safe_edit_message(
             return False
 
 
+async def add_to_history(
+    user_id: int,
+    action: str,
+    action_type: Optional[str] = None,
+    metadata: Optional[dict] = None
+) -> None:
+    """
+    Record user action in history without waiting for the database
+    
+    Args:
+        user_id: Database user ID
+        action: Action description
+        action_type: Action category (profile, reminder, ad, etc.)
+        metadata: Extra data stored with the entry
+    """
+    await history_writer.add(user_id, action, action_type, metadata)
+
+
 def format_timestamp(dt: datetime, format_str: str = "%d.%m.%Y %H:%M") -> str:
     """
     Format datetime to string
@@ -0,0 +1,51 @@
+"""
+Keyset pagination cursors
+"""
+
+import base64
+import struct
+from datetime import datetime, timedelta
+from typing import Tuple
+
+# Cursor payload: created_at as microseconds since epoch + row id
+_CURSOR_FORMAT = ">qI"
+_EPOCH = datetime(1970, 1, 1)
+
+PageKey = Tuple[datetime, int]
+
+
+def encode_cursor(key: PageKey) -> str:
+    """
+    Encode (created_at, id) page key into a short callback-safe string
+    
+    Args:
+        key: Tuple of row creation time and row ID
+    
+    Returns:
+        16-character URL-safe cursor
+    """
+    created_at, row_id = key
+    micros = (created_at - _EPOCH) // timedelta(microseconds=1)
+    raw = struct.pack(_CURSOR_FORMAT, micros, row_id)
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> PageKey:
+    """
+    Decode cursor produced by encode_cursor
+    
+    Args:
+        cursor: Encoded cursor
+    
+    Returns:
+        Tuple of row creation time and row ID
+    
+    Raises:
+        ValueError: If cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        micros, row_id = struct.unpack(_CURSOR_FORMAT, raw)
+    except (ValueError, struct.error) as e:
+        raise ValueError(f"Invalid page cursor: {cursor!r}") from e
+    return _EPOCH + timedelta(microseconds=micros), row_id
@@ -0,0 +1,39 @@
+"""
+Shared Redis connection (optional)
+"""
+
+import logging
+from typing import Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_redis = None
+
+
+def get_redis():
+    """
+    Get shared Redis client
+
+    The client is created lazily and connects on first command.
+
+    Returns:
+        redis.asyncio.Redis instance or None if REDIS_URL is not configured
+    """
+    global _redis
+    if _redis is None and settings.REDIS_URL:
+        from redis.asyncio import Redis
+
+        _redis = Redis.from_url(settings.REDIS_URL, db=settings.REDIS_DB, decode_responses=True)
+        logger.info("Redis client created")
+    return _redis
+
+
+async def close_redis():
+    """Close shared Redis client"""
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
+        logger.info("Redis client closed")
@@ -0,0 +1,166 @@
+"""
+Broadcast to 1M users with a crash and a graceful stop in between
+
+Seeds 1M users (pass another count as the second argument) and serves a
+fake Bot API in this process that has no rate limit and answers 403 to
+every 50th chat. A broadcast runs in a child process with the outbound rate
+lifted:
+- crash: the child is killed with SIGKILL after 60 s, a second child
+  resumes the broadcast from its checkpoint;
+- graceful stop: with 20k users the child calls broadcast_service.stop()
+  after 5 s, a second child resumes it.
+Reports recipients reached, duplicates, blocked users deactivated,
+throughput and peak RSS of the broadcasting process.
+"""
+
+import asyncio
+import collections
+import multiprocessing
+import resource
+import sys
+import time
+
+from aiohttp import web
+from sqlalchemy import text
+
+from app.config import settings
+from app.database import AsyncSessionLocal, close_db
+from benchmarks import require_postgres
+
+USERS = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000
+BLOCKED_EVERY = 50
+CRASH_AFTER = 60
+STOP_AFTER = 5
+STOP_USERS = 20000
+PORT = 8090
+UNLIMITED = 10**6
+
+
+class FakeTelegram:
+    """sendMessage answering 403 to every BLOCKED_EVERY-th chat"""
+
+    def __init__(self):
+        self.received = collections.Counter()
+
+    async def handle(self, request: web.Request) -> web.Response:
+        data = await request.post()
+        chat_id = int(data["chat_id"])
+        self.received[chat_id] += 1
+        if chat_id % BLOCKED_EVERY == 0:
+            return web.json_response(
+                {"ok": False, "error_code": 403, "description": "Forbidden: bot was blocked by the user"}, status=403
+            )
+        return web.json_response({"ok": True, "result": {
+            "message_id": 1, "date": int(time.time()), "chat": {"id": chat_id, "type": "private"}, "text": data["text"],
+        }})
+
+
+async def broadcast(resume: bool, stop_after: float, results: multiprocessing.Queue):
+    """Child process: send a new broadcast or resume the running one"""
+    from aiogram import Bot
+    from aiogram.client.session.aiohttp import AiohttpSession
+    from aiogram.client.telegram import TelegramAPIServer
+    from app.services import broadcast_service, outbound_sender
+
+    bot = Bot("123456:BENCH", session=AiohttpSession(api=TelegramAPIServer.from_base(f"http://127.0.0.1:{PORT}")))
+    outbound_sender.global_rate = outbound_sender.chat_rate = UNLIMITED
+    await outbound_sender.start(bot)
+    if resume:
+        await broadcast_service.start()
+    else:
+        await broadcast_service.create("Новости <b>PetHelper</b>", 1)
+    if stop_after:
+        await asyncio.sleep(stop_after)
+        await broadcast_service.stop()
+    while broadcast_service.tasks:
+        await asyncio.sleep(0.5)
+
+    await outbound_sender.stop()
+    await bot.session.close()
+    await close_db()
+    results.put(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // 1024)
+
+
+def run_broadcast(resume: bool, stop_after: float, results: multiprocessing.Queue):
+    asyncio.run(broadcast(resume, stop_after, results))
+
+
+async def child(resume: bool, stop_after: float = 0, kill_after: float = 0) -> tuple:
+    """Run a broadcasting process; returns (seconds, peak RSS in MB or None if killed)"""
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=run_broadcast, args=(resume, stop_after, results))
+    started = time.monotonic()
+    process.start()
+    if kill_after:
+        await asyncio.sleep(kill_after)
+        process.kill()
+        await asyncio.to_thread(process.join)
+        return time.monotonic() - started, None
+    rss = await asyncio.to_thread(results.get)
+    await asyncio.to_thread(process.join)
+    return time.monotonic() - started, rss
+
+
+async def seed(count: int):
+    async with AsyncSessionLocal() as session:
+        await session.execute(text("TRUNCATE broadcasts, reminders, users RESTART IDENTITY CASCADE"))
+        await session.execute(text(
+            "INSERT INTO users (telegram_id, language, is_active, created_at, updated_at) "
+            "SELECT 10000000 + g, 'ru', true, now(), now() FROM generate_series(1, CAST(:count AS integer)) g"
+        ), {"count": count})
+        await session.commit()
+
+
+async def checkpoint() -> int:
+    async with AsyncSessionLocal() as session:
+        return await session.scalar(text("SELECT last_user_id FROM broadcasts ORDER BY id DESC LIMIT 1"))
+
+
+async def report(name: str, telegram: FakeTelegram, count: int, runs: list):
+    async with AsyncSessionLocal() as session:
+        last_user_id, status, sent, blocked = (await session.execute(text(
+            "SELECT last_user_id, status, sent, blocked FROM broadcasts ORDER BY id DESC LIMIT 1"
+        ))).one()
+        inactive = await session.scalar(text("SELECT count(*) FROM users WHERE NOT is_active"))
+    missed = count - len(telegram.received)
+    duplicates = sum(received - 1 for received in telegram.received.values())
+    messages = sum(telegram.received.values())
+    elapsed = sum(seconds for seconds, _ in runs)
+    rss = max(rss for _, rss in runs if rss is not None)
+    print(
+        f"{name}: {status} at user {last_user_id}, {len(telegram.received)} reached ({sent} sent, {blocked} blocked), "
+        f"{missed} missed, {duplicates} duplicates, {inactive} deactivated; "
+        f"{messages / elapsed:.0f} msg/s, peak RSS {rss} MB"
+    )
+
+
+async def main():
+    require_postgres(settings.DATABASE_URL)
+    telegram = FakeTelegram()
+    app = web.Application()
+    app.router.add_post("/bot{token}/sendMessage", telegram.handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", PORT).start()
+
+    print(f"{USERS} users, every {BLOCKED_EVERY}th blocked the bot")
+    await seed(USERS)
+    crashed = await child(resume=False, kill_after=CRASH_AFTER)
+    print(f"killed after {CRASH_AFTER} s: {sum(telegram.received.values())} received, checkpoint at user {await checkpoint()}")
+    resumed = await child(resume=True)
+    await report("crash", telegram, USERS, [crashed, resumed])
+
+    telegram.received.clear()
+    await seed(STOP_USERS)
+    stopped = await child(resume=False, stop_after=STOP_AFTER)
+    print(f"stopped after {STOP_AFTER} s: {sum(telegram.received.values())} received, checkpoint at user {await checkpoint()}")
+    resumed = await child(resume=True)
+    await report("graceful stop", telegram, STOP_USERS, [stopped, resumed])
+
+    await runner.cleanup()
+    await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,116 @@
+"""
+Catch-up after a 6 hour outage with 100k reminders
+
+Seeds 100k daily/weekly/custom/one-time reminders (pass another count as
+the second argument) whose fire times stopped advancing 6 hours ago; 10%
+also missed fires in an earlier 3-day outage. Reports how many were due at
+restart, the catch_up time, how the missed reminders were spread and the
+missed-count distribution of the texts of every reminder firing within
+the catch-up window.
+"""
+
+import asyncio
+import json
+import random
+import re
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, insert, select, text
+
+from app.config import settings
+from app.database import AsyncSessionLocal, close_db, crud
+from app.database.models import Reminder, User
+from app.services.reminder_scheduler import ReminderScheduler
+from benchmarks import require_postgres
+
+REMINDERS = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+USERS = 2000
+OUTAGE = timedelta(hours=6)
+
+
+def reminder_rows(rnd: random.Random, scheduler: ReminderScheduler, down_at: datetime) -> list:
+    """Reminders as they were when the bot went down"""
+    rows = []
+    created = down_at - timedelta(days=14)
+    for i in range(REMINDERS):
+        kind = rnd.choices(["daily", "weekly", "custom", "one_time"], [60, 25, 10, 5])[0]
+        reminder_time = f"{rnd.randrange(24):02d}:{rnd.choice([0, 15, 30, 45]):02d}"
+        reminder_date = days = None
+        if kind == "weekly":
+            days = json.dumps(sorted(rnd.sample(range(7), rnd.randint(1, 3))))
+        elif kind == "custom":
+            start = (down_at - timedelta(days=3)).date()
+            days = json.dumps(sorted({(start + timedelta(days=rnd.randrange(10))).isoformat() for _ in range(4)}))
+        elif kind == "one_time":
+            reminder_date = (down_at + timedelta(minutes=rnd.randrange(-60, 600))).replace(second=0, microsecond=0)
+            reminder_time = None
+        reminder = Reminder(reminder_type=kind, reminder_date=reminder_date, reminder_time=reminder_time,
+                            reminder_days=days)
+
+        # Delivered up to the outage (10% only up to an earlier one)
+        last_up = down_at - timedelta(days=3) if rnd.random() < 0.1 else down_at
+        last_sent = None
+        fire_at = scheduler.next_fire_time(reminder, created)
+        while fire_at is not None and fire_at <= last_up:
+            last_sent, fire_at = fire_at, scheduler.next_fire_time(reminder, fire_at)
+        if fire_at is None:
+            continue
+        rows.append({
+            "user_id": rnd.randrange(1, USERS + 1), "text": f"r{i}", "reminder_type": kind,
+            "reminder_date": reminder_date, "reminder_time": reminder_time, "reminder_days": days,
+            "created_at": created, "last_sent": last_sent, "next_fire_at": fire_at, "is_active": True,
+        })
+    return rows
+
+
+async def main():
+    require_postgres(sys.argv[1] if len(sys.argv) > 1 else "")
+    scheduler = ReminderScheduler()
+    now = datetime.utcnow().replace(microsecond=0)
+    rows = reminder_rows(random.Random(21), scheduler, now - OUTAGE)
+
+    async with AsyncSessionLocal() as session:
+        await session.execute(text("TRUNCATE reminders, users RESTART IDENTITY CASCADE"))
+        await session.execute(insert(User), [{"telegram_id": 10**6 + i, "language": "ru"} for i in range(USERS)])
+        for start in range(0, len(rows), 10000):
+            await session.execute(insert(Reminder), rows[start:start + 10000])
+        await session.commit()
+        missed_ids = list(await session.scalars(
+            select(Reminder.id).where(Reminder.is_active == True, Reminder.next_fire_at <= now)
+        ))
+    print(f"{len(rows)} active reminders, {len(missed_ids)} due at restart (sent as one burst without catch-up)")
+
+    started = time.perf_counter()
+    count = await scheduler.catch_up(now)
+    print(f"catch_up rescheduled {count} in {time.perf_counter() - started:.2f} s")
+
+    window_end = now + timedelta(seconds=max(scheduler.catchup_window, count / settings.OUTBOUND_GLOBAL_RATE) + 1)
+    async with AsyncSessionLocal() as session:
+        overdue = await session.scalar(
+            select(func.count()).select_from(Reminder).where(Reminder.is_active == True, Reminder.next_fire_at < now)
+        )
+        peak, first, last = (await session.execute(text(
+            "SELECT max(c), min(ts), max(ts) FROM (SELECT date_trunc('second', next_fire_at) ts, count(*) c "
+            "FROM reminders WHERE id = ANY(:ids) AND next_fire_at >= :now GROUP BY 1) x"
+        ), {"ids": missed_ids, "now": now})).one()
+        ids = list(await session.scalars(
+            select(Reminder.id).where(Reminder.is_active == True, Reminder.next_fire_at <= window_end)
+        ))
+        due = []
+        for start in range(0, len(ids), 10000):
+            due += await crud.get_due_reminders(session, ids[start:start + 10000])
+    print(f"{overdue} left overdue (within the grace period), rescheduled spread over {last - first}, peak {peak} per second")
+
+    started = time.perf_counter()
+    texts = [scheduler.reminder_text([row], now + timedelta(hours=1)) for row in due]
+    elapsed = time.perf_counter() - started
+    missed = Counter(int(match.group(1)) if (match := re.search(r": (\d+)</i>", text)) else 1 for text in texts)
+    print(f"{len(texts)} messages built in {elapsed:.2f} s, missed counts {sorted(missed.items())}")
+    await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,92 @@
+"""
+Clinic import throughput
+
+Writes 1M rows (pass another count as the second argument) to a CSV and an
+NDJSON file, half each, with 1% invalid rows and 5% duplicate natural keys,
+imports the directory with import_clinics and reports rows per second,
+once into an empty table and once more over the existing rows (upsert).
+"""
+
+import asyncio
+import csv
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import text
+
+from app.config import settings
+from app.database.database import engine
+from app.services.clinic_importer import REQUIRED, import_clinics
+from benchmarks import require_postgres
+
+ROWS = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000
+CHUNK_SIZE = 20000
+CITIES = 500
+FIELDS = REQUIRED + ("latitude", "longitude", "services", "website", "is_active")
+
+
+def make_row(rnd: random.Random, i: int) -> dict:
+    # Every 20th row repeats an earlier natural key
+    n = rnd.randrange(i) if i and i % 20 == 0 else i
+    row = {
+        "name": f"Clinic {n}",
+        "city": f"City {n % CITIES}",
+        "address": f"Street {n}",
+        "phone": f"+99890{n:07d}",
+        "working_hours": "9:00-18:00",
+        "clinic_type": ("clinic", "pharmacy", "shelter")[n % 3],
+        "latitude": round(rnd.uniform(37, 45), 6),
+        "longitude": round(rnd.uniform(56, 73), 6),
+        "services": "vaccination, surgery",
+        "website": f"https://clinic{n}.example",
+        "is_active": "true",
+    }
+    if i % 100 == 99:
+        row["clinic_type"] = "zoo"
+    return row
+
+
+def write_files(directory: Path):
+    rnd = random.Random(9)
+    half = ROWS // 2
+    with (directory / "a.csv").open("w", newline="") as f:
+        writer = csv.DictWriter(f, FIELDS)
+        writer.writeheader()
+        for i in range(half):
+            writer.writerow(make_row(rnd, i))
+    with (directory / "b.ndjson").open("w") as f:
+        for i in range(half, ROWS):
+            f.write(json.dumps(make_row(rnd, i)) + "\n")
+
+
+async def main():
+    require_postgres(settings.DATABASE_URL)
+    async with engine.begin() as conn:
+        await conn.execute(text("TRUNCATE clinics RESTART IDENTITY"))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        write_files(directory)
+        size = sum(file.stat().st_size for file in directory.iterdir()) / 2**20
+        print(f"{ROWS} rows, {size:.0f} MB, chunks of {CHUNK_SIZE}")
+
+        for run in ("insert", "upsert"):
+            started = time.perf_counter()
+            stats = await import_clinics(directory, CHUNK_SIZE)
+            elapsed = time.perf_counter() - started
+            print(
+                f"{run}: {elapsed:.1f} s, {stats.read / elapsed:,.0f} rows/s, "
+                f"{stats.imported} imported, {stats.invalid} invalid"
+            )
+
+    async with engine.connect() as conn:
+        print(f"clinics: {await conn.scalar(text('SELECT count(*) FROM clinics'))}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
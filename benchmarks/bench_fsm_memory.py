@@ -0,0 +1,43 @@
+"""
+Memory of the in-process FSM storage under abandoned flows
+
+Starts 1M profile flows (pass another count as the first argument) that
+never finish, each with a state and some data, and reports traced memory
+and the number of stored flows at a few checkpoints. With LRU eviction at
+FSM_MEMORY_MAX_ENTRIES the memory stays flat.
+"""
+
+import asyncio
+import gc
+import sys
+import tracemalloc
+
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+
+from app.config import settings
+from app.handlers.profile import ProfileStates
+from app.utils.fsm_storage import BoundedMemoryStorage
+
+FLOWS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+CHECKPOINTS = {FLOWS // 50, FLOWS // 5, FLOWS}
+
+
+async def main():
+    storage = BoundedMemoryStorage(settings.FSM_MEMORY_MAX_ENTRIES)
+    tracemalloc.start()
+
+    print(f"max {storage.max_entries} flows")
+    print(f"{'flows':>9} {'stored':>7} {'traced MB':>10}")
+    for i in range(1, FLOWS + 1):
+        context = FSMContext(storage, StorageKey(bot_id=1, chat_id=i, user_id=i))
+        await context.set_state(ProfileStates.waiting_for_owner_phone)
+        await context.update_data(owner_name=f"name {i}")
+        if i in CHECKPOINTS:
+            gc.collect()
+            traced = tracemalloc.get_traced_memory()[0] / 2**20
+            print(f"{i:>9} {len(storage.storage):>7} {traced:>10.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,45 @@
+"""
+Keyboard build and request serialization cost: builder vs registry
+
+Times calling each keyboard builder directly against the memoized registry
+function, and building the editMessageText form data with aiogram's session
+against PreserializedSession. Needs no database.
+"""
+
+import timeit
+
+from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.methods import EditMessageText
+
+from app.keyboards import create_cities_keyboard, get_main_menu, keyboard_registry
+from app.locales.loader import LOCALES
+from app.utils.bot_session import PreserializedSession
+
+CALLS = 20000
+REQUESTS = 5000
+
+
+def per_call_us(func, number: int) -> float:
+    return timeit.timeit(func, number=number) / number * 1e6
+
+
+def main():
+    keyboard_registry.warm_up(LOCALES)
+    bot = Bot("1:bench")
+    plain, preserialized = AiohttpSession(), PreserializedSession()
+
+    def request(markup) -> EditMessageText:
+        return EditMessageText(chat_id=1, message_id=1, text="text", reply_markup=markup)
+
+    print(f"{'keyboard':<24} {'build us':>9} {'cached us':>10} {'form us':>8} {'cached form us':>15}")
+    for builder, args in ((get_main_menu, (123, "en")), (create_cities_keyboard, ("en",))):
+        build = per_call_us(lambda: builder.build_uncached(*args), CALLS)
+        cached = per_call_us(lambda: builder(*args), CALLS)
+        form = per_call_us(lambda: plain.build_form_data(bot, request(builder.build_uncached(*args))), REQUESTS)
+        cached_form = per_call_us(lambda: preserialized.build_form_data(bot, request(builder(*args))), REQUESTS)
+        print(f"{builder.__name__:<24} {build:>9.1f} {cached:>10.2f} {form:>8.1f} {cached_form:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
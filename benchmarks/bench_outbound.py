@@ -0,0 +1,90 @@
+"""
+Outbound sender against a fake Bot API at Telegram's limits
+
+Runs OutboundSender with the default rates (30 msg/s, 1 msg/s per chat)
+against a local sendMessage server that answers 429 above 30 messages per
+1 s window or to two messages for one chat within 0.95 s:
+- mixed load: 300 bulk messages for 100 chats, 20 notifications queued 2 s
+  later, 10 interactive replies and one injected flood wait;
+- one busy chat: 5 messages to one chat among 30 for other chats;
+- 100 notifications for 50 chats, like a due batch of reminders.
+Needs no database.
+"""
+
+import asyncio
+import time
+
+from aiogram.methods import SendMessage
+
+from app.services.sender import PRIORITY_BULK, PRIORITY_NOTIFICATION, OutboundSender
+from tests.test_outbound_sender import FakeTelegram, start_fake_bot
+
+
+async def run(scenario) -> None:
+    telegram = FakeTelegram()
+    bot = await start_fake_bot(telegram)
+    sender = OutboundSender(global_rate=30, chat_rate=1, workers=8, max_retries=3)
+    await sender.start(bot)
+    try:
+        started = time.monotonic()
+        summary = await scenario(telegram, sender, bot)
+        elapsed = time.monotonic() - started
+        print(
+            f"{scenario.__name__}: {len(telegram.accepted)} delivered in {elapsed:.1f} s, "
+            f"{telegram.rejected} rejected, peak {telegram.peak_per_second()} per 1 s window; {summary}"
+        )
+    finally:
+        await sender.stop()
+        await bot.session.close()
+        await telegram.stop()
+
+
+async def mixed_load(telegram: FakeTelegram, sender: OutboundSender, bot) -> str:
+    telegram.force_flood = {5}
+    bulk = [sender.enqueue(SendMessage(chat_id=1000 + i % 100, text=f"bulk{i}"), PRIORITY_BULK) for i in range(300)]
+    await asyncio.sleep(2)
+    notes = [sender.enqueue(SendMessage(chat_id=5 + i, text=f"note{i}"), PRIORITY_NOTIFICATION) for i in range(20)]
+
+    latencies = []
+    for i in range(10):
+        await asyncio.sleep(0.3)
+        started = time.monotonic()
+        await bot.send_message(9000 + i, f"reply{i}")
+        latencies.append(time.monotonic() - started)
+
+    results = await asyncio.gather(*bulk, *notes, return_exceptions=True)
+    errors = sum(1 for result in results if isinstance(result, Exception))
+    texts = [text for _, _, text in telegram.accepted]
+    last_note = max(i for i, text in enumerate(texts) if text.startswith("note"))
+    overtaken = sum(1 for text in texts[last_note:] if text.startswith("bulk"))
+    return (
+        f"{errors} errors, {sender.stats.retry_after} retry_after, notifications overtook {overtaken} bulk, "
+        f"interactive reply max {max(latencies) * 1000:.0f} ms"
+    )
+
+
+async def busy_chat(telegram: FakeTelegram, sender: OutboundSender, bot) -> str:
+    busy = [sender.enqueue(SendMessage(chat_id=1, text=f"busy{i}")) for i in range(5)]
+    others = [sender.enqueue(SendMessage(chat_id=100 + i, text=f"other{i}")) for i in range(30)]
+    await asyncio.gather(*busy, *others)
+
+    busy_times = [at for at, chat_id, _ in telegram.accepted if chat_id == 1]
+    others_done = max(at for at, chat_id, _ in telegram.accepted if chat_id != 1)
+    gaps = ", ".join(f"{b - a:.2f}" for a, b in zip(busy_times, busy_times[1:]))
+    return f"busy chat gaps {gaps} s, other chats done {others_done - busy_times[0]:.1f} s after its first"
+
+
+async def reminder_batch(telegram: FakeTelegram, sender: OutboundSender, bot) -> str:
+    await asyncio.gather(*(
+        sender.send_message(1 + i % 50, f"reminder{i}", priority=PRIORITY_NOTIFICATION) for i in range(100)
+    ))
+    return f"avg queue wait {sender.stats.avg_wait:.2f} s"
+
+
+async def main():
+    for scenario in (mixed_load, busy_chat, reminder_batch):
+        await run(scenario)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,87 @@
+"""
+Ads feed page latency by depth: keyset cursor vs OFFSET
+
+Seeds 100k ads (90% active) and times fetching one 5-ad page at the given
+page depths with crud.get_ads_page and with the equivalent OFFSET query.
+"""
+
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import select, text
+
+from app.config import settings
+from app.database import AsyncSessionLocal, Ad, crud
+from app.database.database import engine
+from benchmarks import require_postgres
+
+ADS = 100000
+PAGE_SIZE = 5
+DEPTHS = (1, 100, 1000, 10000, 17000)
+RUNS = 50
+
+
+async def seed():
+    async with engine.begin() as conn:
+        await conn.execute(text("TRUNCATE ads, users RESTART IDENTITY CASCADE"))
+        await conn.execute(text(
+            "INSERT INTO users (telegram_id, language, is_active, created_at, updated_at) "
+            "VALUES (1, 'ru', true, now(), now())"
+        ))
+        await conn.execute(text(
+            "INSERT INTO ads (user_id, title, text, price, contact, is_active, created_at) "
+            f"SELECT 1, 'ad', 'text', '1', '@c', g % 10 <> 0, now() - (g / 3) * interval '1 second' "
+            f"FROM generate_series(1, {ADS}) g"
+        ))
+    async with engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("VACUUM ANALYZE ads"))
+
+
+async def timed(session, query) -> float:
+    """Median milliseconds of one page fetch"""
+    samples = []
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        await query(session)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+async def offset_page(session, query) -> list:
+    result = await session.execute(query)
+    return list(result.scalars().all())
+
+
+async def main():
+    require_postgres(settings.DATABASE_URL)
+    await seed()
+
+    async with AsyncSessionLocal() as session:
+        # Page keys at each depth, found by walking the feed once
+        keys, after = {}, None
+        for page in range(1, max(DEPTHS) + 1):
+            if page in DEPTHS:
+                keys[page] = after
+            _, after = await crud.get_ads_page(session, limit=PAGE_SIZE, after=after)
+
+        print(f"{ADS} ads, {PAGE_SIZE} per page, median of {RUNS} runs")
+        print(f"{'page':>6} {'keyset ms':>10} {'OFFSET ms':>10}")
+        for page in DEPTHS:
+            keyset = await timed(session, lambda s: crud.get_ads_page(s, limit=PAGE_SIZE, after=keys[page]))
+            offset_query = (
+                select(Ad)
+                .where(Ad.is_active == True)
+                .order_by(Ad.created_at.desc(), Ad.id.desc())
+                .offset((page - 1) * PAGE_SIZE)
+                .limit(PAGE_SIZE + 1)
+            )
+            offset = await timed(session, lambda s: offset_page(s, offset_query))
+            print(f"{page:>6} {keyset:>10.3f} {offset:>10.3f}")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,132 @@
+"""
+History on monthly partitions vs one plain table
+
+Fills the partitioned history table and a plain copy with the same rows
+spread over 12 months (50M by default, pass another count as the second
+argument), then compares batch insert and get_user_history latency and
+the cost of dropping the oldest month.
+"""
+
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from datetime import datetime
+
+from sqlalchemy import text
+
+from app.config import settings
+from app.database.database import engine
+from app.services.partition_manager import PartitionManager, _add_months
+from benchmarks import require_postgres
+
+ROWS = int(sys.argv[2]) if len(sys.argv) > 2 else 50_000_000
+USERS = 100_000
+MONTHS = 12
+RUNS = 200
+BATCH = 500
+
+HISTORY_QUERY = "SELECT * FROM {table} WHERE user_id = :user_id ORDER BY created_at DESC LIMIT 50"
+
+
+async def execute(statement: str, **params):
+    async with engine.begin() as conn:
+        return await conn.execute(text(statement), params)
+
+
+async def seed(first_month):
+    await execute("DROP TABLE IF EXISTS history_plain")
+    await execute("TRUNCATE history, users RESTART IDENTITY CASCADE")
+    await execute(
+        "INSERT INTO users (telegram_id, language, is_active, created_at, updated_at) "
+        f"SELECT g, 'ru', true, now(), now() FROM generate_series(1, {USERS}) g"
+    )
+
+    manager = PartitionManager(premake_months=0)
+    for offset in range(MONTHS + 1):
+        await manager.ensure_partitions("history", _add_months(first_month, offset))
+
+    span = (datetime.utcnow() - datetime.combine(first_month, datetime.min.time())).total_seconds()
+    started = time.perf_counter()
+    for low in range(0, ROWS, 5_000_000):
+        high = min(low + 5_000_000, ROWS)
+        await execute(
+            "INSERT INTO history (user_id, action, action_type, created_at) "
+            f"SELECT g % {USERS} + 1, 'button press', 'menu', "
+            f"timestamp '{first_month}' + (g::float8 / {ROWS} * {span}) * interval '1 second' "
+            f"FROM generate_series({low + 1}, {high}) g"
+        )
+    print(f"seeded {ROWS} partitioned rows in {time.perf_counter() - started:.0f}s")
+
+    started = time.perf_counter()
+    await execute("CREATE TABLE history_plain AS SELECT * FROM history")
+    await execute("ALTER TABLE history_plain ADD PRIMARY KEY (id)")
+    await execute("CREATE INDEX ON history_plain (user_id, created_at DESC, id DESC)")
+    print(f"copied to history_plain in {time.perf_counter() - started:.0f}s")
+
+    async with engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("VACUUM ANALYZE history"))
+        await conn.execute(text("VACUUM ANALYZE history_plain"))
+
+
+async def median_ms(run) -> float:
+    samples = []
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        await run()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+async def measure(table: str):
+    rnd = random.Random(1)
+
+    async def read():
+        async with engine.connect() as conn:
+            await conn.execute(text(HISTORY_QUERY.format(table=table)), {"user_id": rnd.randint(1, USERS)})
+
+    async def insert():
+        rows = [
+            {"user_id": rnd.randint(1, USERS), "created_at": datetime.utcnow()}
+            for _ in range(BATCH)
+        ]
+        await execute(
+            f"INSERT INTO {table} (id, user_id, action, action_type, created_at) "
+            "SELECT nextval('history_id_seq'), r.user_id, 'button press', 'menu', r.created_at "
+            "FROM jsonb_to_recordset(CAST(:rows AS jsonb)) AS r(user_id int, created_at timestamp)",
+            rows=json.dumps(rows, default=str),
+        )
+
+    return await median_ms(read), await median_ms(insert)
+
+
+async def main():
+    require_postgres(settings.DATABASE_URL)
+    first_month = _add_months(datetime.utcnow().date().replace(day=1), -MONTHS)
+    await seed(first_month)
+
+    print(f"{ROWS} rows over {MONTHS + 1} months, {USERS} users, median of {RUNS} runs")
+    for table in ("history", "history_plain"):
+        read, insert = await measure(table)
+        print(f"{table:>14}: get_user_history {read:.3f} ms, insert {BATCH} rows {insert:.3f} ms")
+
+    month_end = _add_months(first_month, 1)
+    started = time.perf_counter()
+    result = await execute(f"DELETE FROM history_plain WHERE created_at < '{month_end}'")
+    delete_s = time.perf_counter() - started
+
+    manager = PartitionManager(premake_months=0)
+    started = time.perf_counter()
+    dropped = await manager.drop_expired("history", month_end)
+    drop_s = time.perf_counter() - started
+    print(f"oldest month: DELETE {result.rowcount} rows {delete_s:.2f}s, drop {dropped} {drop_s * 1000:.1f} ms")
+
+    await execute("DROP TABLE history_plain")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
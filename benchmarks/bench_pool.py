@@ -0,0 +1,49 @@
+"""
+Sessions per second with NullPool vs the pooled engine
+
+Each session runs one SELECT, like a handler making a single query.
+"""
+
+import asyncio
+import time
+
+from sqlalchemy import text
+
+from app.config import settings
+from app.database.database import _create_engine, _instrument, pool_metrics
+from benchmarks import require_postgres
+
+SESSIONS = 2000
+CONCURRENCY = 10
+
+
+async def run(pooled: bool):
+    settings.DATABASE_POOL_ENABLED = pooled
+    engine = _instrument(_create_engine(settings.DATABASE_URL))
+    created = pool_metrics.connections_created
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def session():
+        async with semaphore, engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(session() for _ in range(SESSIONS)))
+    elapsed = time.perf_counter() - started
+    await engine.dispose()
+    return SESSIONS / elapsed, pool_metrics.connections_created - created
+
+
+async def main():
+    require_postgres(settings.DATABASE_URL)
+
+    null_rate, null_connections = await run(pooled=False)
+    pooled_rate, pooled_connections = await run(pooled=True)
+    print(f"{SESSIONS} sessions, {CONCURRENCY} concurrent")
+    print(f"NullPool: {null_rate:8.0f} sessions/s, {null_connections} connections opened")
+    print(f"pooled:   {pooled_rate:8.0f} sessions/s, {pooled_connections} connections opened "
+          f"({pooled_rate / null_rate:.1f}x)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
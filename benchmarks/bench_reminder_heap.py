@@ -0,0 +1,70 @@
+"""
+Reminder heap operations at 1M scheduled reminders
+
+Builds the scheduler heap from 1M fire times spread over a week (pass
+another count as the first argument), then times add, cancel, pop_due and
+next_fire_time per call. Needs no database.
+"""
+
+import heapq
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from app.services.reminder_scheduler import ReminderScheduler
+
+REMINDERS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+OPERATIONS = 100000
+
+
+def per_op_us(started: float, count: int) -> float:
+    return (time.perf_counter() - started) / count * 1e6
+
+
+def main():
+    rnd = random.Random(17)
+    now = datetime.utcnow()
+    scheduler = ReminderScheduler(mode="heap")
+    entries = [(now + timedelta(seconds=rnd.randrange(7 * 86400)), i) for i in range(REMINDERS)]
+
+    # Same steps as ReminderScheduler.load after streaming the rows
+    tracemalloc.start()
+    started = time.perf_counter()
+    scheduler.heap = list(entries)
+    scheduler.scheduled = {reminder_id: fire_at for fire_at, reminder_id in scheduler.heap}
+    heapq.heapify(scheduler.heap)
+    elapsed = time.perf_counter() - started
+    memory = tracemalloc.get_traced_memory()[0] / 2**20
+    tracemalloc.stop()
+    print(f"{REMINDERS} reminders: index and heapify {elapsed:.2f} s, {memory:.0f} MB traced")
+
+    started = time.perf_counter()
+    for i in range(OPERATIONS):
+        scheduler.add(REMINDERS + i, now + timedelta(seconds=rnd.randrange(7 * 86400)))
+    print(f"add      {per_op_us(started, OPERATIONS):.2f} us")
+
+    started = time.perf_counter()
+    for i in range(OPERATIONS):
+        scheduler.cancel(i)
+    print(f"cancel   {per_op_us(started, OPERATIONS):.2f} us")
+
+    started = time.perf_counter()
+    due = scheduler.pop_due(now + timedelta(days=1), limit=10**9)
+    print(f"pop_due  {per_op_us(started, len(due)):.2f} us per due reminder ({len(due)} due)")
+
+    rows = [
+        SimpleNamespace(reminder_type="daily", reminder_date=None, reminder_time="09:00", reminder_days=None),
+        SimpleNamespace(reminder_type="weekly", reminder_date=None, reminder_time="09:00", reminder_days="[0,2,4]"),
+    ]
+    for row in rows:
+        started = time.perf_counter()
+        for _ in range(20000):
+            scheduler.next_fire_time(row, now)
+        print(f"next_fire_time {row.reminder_type:<6} {per_op_us(started, 20000):.1f} us")
+
+
+if __name__ == "__main__":
+    main()
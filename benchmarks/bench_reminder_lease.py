@@ -0,0 +1,102 @@
+"""
+Lease-mode reminder throughput with several worker processes
+
+Seeds 40k one-time reminders, half due and half due 30 s later, runs 1, 2
+and 4 OS processes with a lease-mode scheduler each for a few seconds,
+sending through a stub that takes 2 ms per message, and reports reminders
+delivered and duplicates. With the default digest window every claim also
+takes the claimed users' reminders due within it.
+"""
+
+import asyncio
+import importlib
+import re
+import sys
+import time
+from datetime import datetime, timedelta
+from multiprocessing import Process, Queue
+
+from sqlalchemy import text
+
+from app.config import settings
+from app.database import AsyncSessionLocal, close_db
+from benchmarks import require_postgres
+
+REMINDERS = 40000
+USERS = 200
+SECONDS = 5
+SEND_SECONDS = 0.002
+DIGEST_WINDOW = settings.REMINDER_DIGEST_WINDOW
+
+
+async def seed():
+    now = datetime.utcnow()
+    async with AsyncSessionLocal() as session:
+        await session.execute(text("TRUNCATE reminders, users RESTART IDENTITY CASCADE"))
+        await session.execute(text(
+            "INSERT INTO users (telegram_id, language, is_active, created_at, updated_at) "
+            f"SELECT g, 'ru', true, now(), now() FROM generate_series(1, {USERS}) g"
+        ))
+        await session.execute(text(
+            "INSERT INTO reminders (user_id, text, reminder_type, reminder_date, is_active, created_at, next_fire_at) "
+            f"SELECT 1 + g % {USERS}, 'r' || g, 'one_time', :due, true, :created, CAST(:due AS timestamp) + (g / {USERS} % 2) * interval '30 seconds' "
+            f"FROM generate_series(1, {REMINDERS}) g"
+        ), {"due": now - timedelta(seconds=1), "created": now - timedelta(days=1)})
+        await session.commit()
+    await close_db()
+
+
+async def work(results: Queue):
+    from app.services.reminder_scheduler import ReminderScheduler
+    from app.services.sender import outbound_sender
+
+    sent = []
+
+    async def send_message(chat_id, text, priority=None, **kwargs):
+        await asyncio.sleep(SEND_SECONDS)
+        sent.extend(re.findall(r"\br\d+\b", text))
+
+    outbound_sender.send_message = send_message
+    scheduler = ReminderScheduler(mode="lease", poll_interval=0.2, digest_window=DIGEST_WINDOW)
+    await scheduler.start()
+    await asyncio.sleep(SECONDS)
+    await scheduler.stop()
+    await close_db()
+    results.put(sent)
+
+
+def run_worker(results: Queue):
+    asyncio.run(work(results))
+
+
+def main():
+    require_postgres(settings.DATABASE_URL)
+    # Imported for the side effect of registering the module before forking
+    importlib.import_module("app.services.reminder_scheduler")
+
+    print(
+        f"{REMINDERS} reminders (half due 30 s later), {SEND_SECONDS * 1000:.0f} ms per send, "
+        f"digest window {DIGEST_WINDOW} s, {SECONDS} s per run"
+    )
+    for workers in (1, 2, 4):
+        asyncio.run(seed())
+        results: Queue = Queue()
+        processes = [Process(target=run_worker, args=(results,)) for _ in range(workers)]
+        started = time.perf_counter()
+        for process in processes:
+            process.start()
+        sent = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+        elapsed = time.perf_counter() - started
+
+        delivered = [item for worker in sent for item in worker]
+        duplicates = len(delivered) - len(set(delivered))
+        print(
+            f"{workers} workers: {len(delivered)} delivered in {elapsed:.1f} s, "
+            f"per worker {[len(worker) for worker in sent]}, {duplicates} duplicates"
+        )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""
+Symptom keyword matching: Aho-Corasick vs `in` scans vs a combined regex
+
+Builds a KeywordMatcher over 10k random keywords and times it on 500 and
+4000 character messages against one `in` test per keyword and a single
+alternation regex, then compares match_symptoms with the bot's ~40 keywords
+to the previous per-category any() scans plus the separate emergency scan.
+Needs no database.
+"""
+
+import random
+import re
+import time
+
+from app.services import symptom_checker
+from app.services.symptom_checker import EMERGENCY_SYMPTOMS, SYMPTOM_CATEGORIES, KeywordMatcher
+
+VOCABULARY = 10000
+MESSAGES = 20
+LETTERS = "абвгдежзийклмнопрстуфхцчшщыэюяabcdefghijklmnopqrstuvwxyz"
+FILLER = "собака вялая второй день и плохо спит после прогулки".split()
+
+
+def per_message_ms(find, messages: list) -> float:
+    started = time.perf_counter()
+    for message in messages:
+        find(message)
+    return (time.perf_counter() - started) / len(messages) * 1000
+
+
+def previous_scans(text: str):
+    """Matching as before the matcher: any() per category, then the emergency list"""
+    text = text.lower()
+    categories = [category for category, (keywords, _) in SYMPTOM_CATEGORIES.items()
+                  if any(keyword in text for keyword in keywords)]
+    return categories, any(keyword in text for keyword in list(EMERGENCY_SYMPTOMS))
+
+
+def main():
+    rnd = random.Random(25)
+    vocabulary = set()
+    while len(vocabulary) < VOCABULARY:
+        vocabulary.add("".join(rnd.choices(LETTERS, k=rnd.randint(4, 12))))
+    vocabulary = sorted(vocabulary)
+    labels = [(keyword, f"c{i % 50}") for i, keyword in enumerate(vocabulary)]
+
+    bot_words = [keyword for keywords, _ in SYMPTOM_CATEGORIES.values() for keyword in keywords]
+    words = bot_words + list(EMERGENCY_SYMPTOMS) + vocabulary[:200]
+
+    def message(length: int) -> str:
+        parts = []
+        while sum(map(len, parts)) < length:
+            parts.append(rnd.choice(words) if rnd.random() < 0.05 else rnd.choice(FILLER))
+        return " ".join(parts)
+
+    started = time.perf_counter()
+    matcher = KeywordMatcher(labels)
+    build_ms = (time.perf_counter() - started) * 1000
+    print(f"{VOCABULARY} keywords: automaton of {len(matcher.goto)} states built in {build_ms:.0f} ms")
+
+    pattern = re.compile("|".join(map(re.escape, sorted(vocabulary, key=len, reverse=True))))
+    label_of = dict(labels)
+
+    def naive(text: str) -> frozenset:
+        text = text.lower()
+        return frozenset(label for keyword, label in labels if keyword in text)
+
+    def regex(text: str) -> frozenset:
+        return frozenset(label_of[match.group()] for match in pattern.finditer(text.lower()))
+
+    for length in (500, 4000):
+        messages = [message(length) for _ in range(MESSAGES)]
+        assert all(matcher.find(text) == naive(text) for text in messages)
+        timings = ", ".join(
+            f"{name} {per_message_ms(find, messages):.2f} ms"
+            for name, find in (("Aho-Corasick", matcher.find), ("`in` per keyword", naive), ("combined regex", regex))
+        )
+        print(f"{length} chars per message: {timings}")
+
+    for length in (64, 4000):
+        messages = [message(length) for _ in range(1000 if length < 1000 else 50)]
+        single = per_message_ms(symptom_checker.match_symptoms, messages) * 1000
+        previous = per_message_ms(previous_scans, messages) * 1000
+        print(f"bot vocabulary, {length} chars: match_symptoms {single:.1f} µs, previous any() scans {previous:.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+#!/bin/sh
+# Bring the database schema to the latest migration, then start the bot
+set -e
+
+alembic upgrade head
+
+exec "$@"
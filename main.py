@@ -5,17 +5,26 @@ PetHelper Bot - Main entry point
 import asyncio
 import logging
 import sys
+from pathlib import Path
 from aiogram import Bot, Dispatcher
 from aiogram.enums import ParseMode
 from aiogram.client.default import DefaultBotProperties
 
 from app.config import settings
-from app.database import init_db, close_db
-from app.middlewares import LanguageMiddleware
-from app.handlers import start, profile, clinic, reminder, ads, symptoms, other
+from app.database import init_db, close_db, replica_router
+from app.middlewares import DatabaseMiddleware, LanguageMiddleware
+from app.services import history_writer, partition_manager, reminder_scheduler, outbound_sender, broadcast_service
+from app.utils.cache import cache_invalidation_listener, get_cache_stats
+from app.utils.redis_client import close_redis
+from app.utils.fsm_storage import create_fsm_storage
+from app.utils.bot_session import PreserializedSession
+from app.keyboards import keyboard_registry
+from app.locales.loader import LOCALES
+from app.handlers import start, admin, profile, clinic, reminder, ads, symptoms, other
 
 
 # Configure logging
+Path('logs').mkdir(exist_ok=True)
 logging.basicConfig(
     level=getattr(logging, settings.LOG_LEVEL),
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -28,7 +37,7 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-async def on_startup():
+async def on_startup(bot: Bot):
     """Actions on bot startup"""
     logger.info("=" * 50)
     logger.info("🐾 VETERINARY BOT PETHELPER STARTING...")
@@ -51,18 +60,43 @@ async def on_startup():
     
     # Initialize database
     try:
-        logger.info("Initializing database...")
+        logger.info("Checking database schema...")
         await init_db()
-        logger.info("✅ Database initialized successfully!")
+        logger.info("✅ Database schema is up to date!")
     except Exception as e:
         logger.error(f"❌ Database initialization failed: {e}")
         raise
+    
+    await replica_router.start()
+    await cache_invalidation_listener.start()
+    await partition_manager.start()
+    await history_writer.start()
+    await outbound_sender.start(bot)
+    await reminder_scheduler.start()
+    await broadcast_service.start()
 
 
 async def on_shutdown():
     """Actions on bot shutdown"""
     logger.info("Shutting down bot...")
     
+    await broadcast_service.stop()
+    await reminder_scheduler.stop()
+    await outbound_sender.stop()
+    
+    # Write pending history entries
+    try:
+        await history_writer.stop()
+        logger.info("✅ History writer drained")
+    except Exception as e:
+        logger.error(f"Error stopping history writer: {e}")
+    
+    await partition_manager.stop()
+    
+    await cache_invalidation_listener.stop()
+    logger.info(f"Cache stats: {get_cache_stats()}")
+    await close_redis()
+    
     # Close database connections
     try:
         await close_db()
@@ -79,20 +113,28 @@ async def main():
     # Create bot instance
     bot = Bot(
         token=settings.BOT_TOKEN,
+        session=PreserializedSession(),
         default=DefaultBotProperties(
             parse_mode=ParseMode.HTML
         )
     )
     
+    # Build language-only keyboards once
+    logger.info(f"✅ Keyboards prepared: {keyboard_registry.warm_up(LOCALES)}")
+    
     # Create dispatcher
-    dp = Dispatcher()
+    dp = Dispatcher(storage=create_fsm_storage())
     
     # Register middleware
+    database_middleware = DatabaseMiddleware()
+    dp.message.middleware(database_middleware)
+    dp.callback_query.middleware(database_middleware)
     dp.message.middleware(LanguageMiddleware())
     dp.callback_query.middleware(LanguageMiddleware())
     
     # Register routers
     dp.include_router(start.router)
+    dp.include_router(admin.router)
     dp.include_router(profile.router)
     dp.include_router(clinic.router)
     dp.include_router(reminder.router)
@@ -0,0 +1,75 @@
+"""
+Alembic migration environment
+"""
+
+import asyncio
+import re
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import pool
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.config import settings
+from app.database.models import Base, PARTITIONED_TABLES
+
+config = context.config
+
+# Callers with their own logging setup (the tests) opt out via attributes
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+# Monthly/default partitions are managed at runtime, not by autogenerate
+PARTITION_NAME = re.compile(rf"^({'|'.join(PARTITIONED_TABLES)})_(\d{{4}}_\d{{2}}|default)$")
+
+
+def include_name(name, type_, parent_names) -> bool:
+    """Exclude runtime-managed partitions from autogenerate comparison"""
+    if type_ == "table":
+        return not PARTITION_NAME.match(name)
+    return True
+
+
+def run_migrations_offline() -> None:
+    """Run migrations in 'offline' mode (emit SQL without a connection)"""
+    context.configure(
+        url=settings.DATABASE_URL,
+        target_metadata=target_metadata,
+        include_name=include_name,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def do_run_migrations(connection: Connection) -> None:
+    """Run migrations on an open connection"""
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_name=include_name,
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_migrations_online() -> None:
+    """Run migrations in 'online' mode using the async engine"""
+    connectable = create_async_engine(settings.DATABASE_URL, poolclass=pool.NullPool)
+
+    async with connectable.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+
+    await connectable.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    asyncio.run(run_migrations_online())
@@ -0,0 +1,149 @@
+"""initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 10:49:03.942822
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('clinics',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('city', sa.String(length=100), nullable=False),
+    sa.Column('address', sa.String(length=500), nullable=False),
+    sa.Column('phone', sa.String(length=50), nullable=False),
+    sa.Column('working_hours', sa.String(length=255), nullable=False),
+    sa.Column('clinic_type', sa.String(length=50), nullable=False),
+    sa.Column('latitude', sa.Float(), nullable=True),
+    sa.Column('longitude', sa.Float(), nullable=True),
+    sa.Column('services', sa.Text(), nullable=True),
+    sa.Column('website', sa.String(length=255), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_clinics_city'), 'clinics', ['city'], unique=False)
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('telegram_id', sa.Integer(), nullable=False),
+    sa.Column('username', sa.String(length=255), nullable=True),
+    sa.Column('first_name', sa.String(length=255), nullable=True),
+    sa.Column('last_name', sa.String(length=255), nullable=True),
+    sa.Column('language', sa.String(length=2), nullable=False),
+    sa.Column('owner_name', sa.String(length=255), nullable=True),
+    sa.Column('owner_phone', sa.String(length=50), nullable=True),
+    sa.Column('city', sa.String(length=100), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_telegram_id'), 'users', ['telegram_id'], unique=True)
+    op.create_table('ads',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('text', sa.Text(), nullable=False),
+    sa.Column('price', sa.String(length=100), nullable=False),
+    sa.Column('contact', sa.String(length=255), nullable=False),
+    sa.Column('category', sa.String(length=100), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('history',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('action', sa.String(length=500), nullable=False),
+    sa.Column('action_type', sa.String(length=50), nullable=True),
+    sa.Column('metadata', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('pets',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('owner_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('pet_type', sa.String(length=100), nullable=False),
+    sa.Column('breed', sa.String(length=255), nullable=True),
+    sa.Column('age', sa.Integer(), nullable=True),
+    sa.Column('weight', sa.Float(), nullable=True),
+    sa.Column('color', sa.String(length=100), nullable=True),
+    sa.Column('allergies', sa.Text(), nullable=True),
+    sa.Column('diseases', sa.Text(), nullable=True),
+    sa.Column('vaccinations', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('reminders',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('text', sa.String(length=500), nullable=False),
+    sa.Column('reminder_type', sa.String(length=50), nullable=False),
+    sa.Column('reminder_date', sa.DateTime(), nullable=True),
+    sa.Column('reminder_time', sa.String(length=10), nullable=True),
+    sa.Column('reminder_days', sa.String(length=100), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('last_sent', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('symptoms',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('pet_type', sa.String(length=100), nullable=False),
+    sa.Column('symptoms_text', sa.Text(), nullable=False),
+    sa.Column('recommendations', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('vet_profiles',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('vet_name', sa.String(length=255), nullable=False),
+    sa.Column('vet_phone', sa.String(length=50), nullable=False),
+    sa.Column('vet_city', sa.String(length=100), nullable=False),
+    sa.Column('specialization', sa.String(length=255), nullable=False),
+    sa.Column('experience_years', sa.Integer(), nullable=False),
+    sa.Column('education', sa.Text(), nullable=False),
+    sa.Column('telegram_contact', sa.String(length=255), nullable=False),
+    sa.Column('consultation_price', sa.String(length=100), nullable=False),
+    sa.Column('additional_info', sa.Text(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('vet_profiles')
+    op.drop_table('symptoms')
+    op.drop_table('reminders')
+    op.drop_table('pets')
+    op.drop_table('history')
+    op.drop_table('ads')
+    op.drop_index(op.f('ix_users_telegram_id'), table_name='users')
+    op.drop_table('users')
+    op.drop_index(op.f('ix_clinics_city'), table_name='clinics')
+    op.drop_table('clinics')
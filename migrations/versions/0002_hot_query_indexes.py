@@ -0,0 +1,57 @@
+"""hot query indexes
+
+Indexes matching the filters and orderings used in app/database/crud.py.
+Built CONCURRENTLY so they can be applied to a live database.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 11:05:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        # get_user_pets
+        op.create_index('ix_pets_owner_id', 'pets', ['owner_id'], unique=False,
+                        postgresql_concurrently=True)
+        # get_user_reminders
+        op.create_index('ix_reminders_user_id_is_active', 'reminders', ['user_id', 'is_active'], unique=False,
+                        postgresql_concurrently=True)
+        # get_user_ads
+        op.create_index('ix_ads_user_id_is_active', 'ads', ['user_id', 'is_active'], unique=False,
+                        postgresql_concurrently=True)
+        # get_all_ads: WHERE is_active ORDER BY created_at DESC
+        op.create_index('ix_ads_active_created_at', 'ads', [sa.text('created_at DESC')], unique=False,
+                        postgresql_where=sa.text('is_active'), postgresql_concurrently=True)
+        # get_user_history: WHERE user_id = ? ORDER BY created_at DESC
+        op.create_index('ix_history_user_id_created_at', 'history', ['user_id', sa.text('created_at DESC')],
+                        unique=False, postgresql_concurrently=True)
+        # get_active_vets: WHERE is_active [AND vet_city = ?]
+        op.create_index('ix_vet_profiles_active_city', 'vet_profiles', ['vet_city'], unique=False,
+                        postgresql_where=sa.text('is_active'), postgresql_concurrently=True)
+        # get_clinics_by_city: WHERE city = ? AND is_active [AND clinic_type = ?]
+        op.create_index('ix_clinics_active_city_type', 'clinics', ['city', 'clinic_type'], unique=False,
+                        postgresql_where=sa.text('is_active'), postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_clinics_active_city_type', table_name='clinics', postgresql_concurrently=True)
+        op.drop_index('ix_vet_profiles_active_city', table_name='vet_profiles', postgresql_concurrently=True)
+        op.drop_index('ix_history_user_id_created_at', table_name='history', postgresql_concurrently=True)
+        op.drop_index('ix_ads_active_created_at', table_name='ads', postgresql_concurrently=True)
+        op.drop_index('ix_ads_user_id_is_active', table_name='ads', postgresql_concurrently=True)
+        op.drop_index('ix_reminders_user_id_is_active', table_name='reminders', postgresql_concurrently=True)
+        op.drop_index('ix_pets_owner_id', table_name='pets', postgresql_concurrently=True)
@@ -0,0 +1,42 @@
+"""keyset pagination indexes
+
+Extend the ads feed and history indexes with the id tie-breaker so that
+(created_at, id) keyset pages are served straight from the index.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 11:40:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_ads_active_created_at_id', 'ads', [sa.text('created_at DESC'), sa.text('id DESC')],
+                        unique=False, postgresql_where=sa.text('is_active'), postgresql_concurrently=True)
+        op.create_index('ix_history_user_id_created_at_id', 'history',
+                        ['user_id', sa.text('created_at DESC'), sa.text('id DESC')],
+                        unique=False, postgresql_concurrently=True)
+        op.drop_index('ix_ads_active_created_at', table_name='ads', postgresql_concurrently=True)
+        op.drop_index('ix_history_user_id_created_at', table_name='history', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_history_user_id_created_at', 'history', ['user_id', sa.text('created_at DESC')],
+                        unique=False, postgresql_concurrently=True)
+        op.create_index('ix_ads_active_created_at', 'ads', [sa.text('created_at DESC')], unique=False,
+                        postgresql_where=sa.text('is_active'), postgresql_concurrently=True)
+        op.drop_index('ix_history_user_id_created_at_id', table_name='history', postgresql_concurrently=True)
+        op.drop_index('ix_ads_active_created_at_id', table_name='ads', postgresql_concurrently=True)
@@ -0,0 +1,31 @@
+"""users.telegram_id as bigint
+
+Telegram user IDs no longer fit into a 32-bit integer, which made the
+/start upsert fail for newer accounts.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 12:10:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.alter_column('users', 'telegram_id', type_=sa.BigInteger(), existing_type=sa.Integer(),
+                    existing_nullable=False)
+
+
+def downgrade() -> None:
+    op.alter_column('users', 'telegram_id', type_=sa.Integer(), existing_type=sa.BigInteger(),
+                    existing_nullable=False)
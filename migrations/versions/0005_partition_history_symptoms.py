@@ -0,0 +1,125 @@
+"""partition history and symptoms by month
+
+Converts the append-only history and symptoms tables into tables
+range-partitioned on created_at with one partition per month and a
+default partition. Existing rows are copied into the new layout; further
+partitions are created (and expired ones dropped) by
+app.services.partition_manager.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 12:40:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Column definitions shared by the partitioned and plain layouts
+COLUMNS = {
+    'history': (
+        "user_id INTEGER NOT NULL REFERENCES users (id) ON DELETE CASCADE, "
+        "action VARCHAR(500) NOT NULL, "
+        "action_type VARCHAR(50), "
+        "metadata JSON, "
+        "created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL"
+    ),
+    'symptoms': (
+        "user_id INTEGER NOT NULL REFERENCES users (id) ON DELETE CASCADE, "
+        "pet_type VARCHAR(100) NOT NULL, "
+        "symptoms_text TEXT NOT NULL, "
+        "recommendations TEXT, "
+        "created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL"
+    ),
+}
+
+COLUMN_NAMES = {
+    'history': "id, user_id, action, action_type, metadata, created_at",
+    'symptoms': "id, user_id, pet_type, symptoms_text, recommendations, created_at",
+}
+
+# Months created ahead of time; the partition manager keeps extending this
+PREMAKE_MONTHS = 3
+
+
+def _replace_table(table: str, partitioned: bool) -> None:
+    """Recreate table in the requested layout and move its rows over"""
+    legacy = f"{table}_legacy"
+
+    op.execute(f"ALTER TABLE {table} RENAME TO {legacy}")
+    op.execute(f"ALTER TABLE {legacy} RENAME CONSTRAINT {table}_pkey TO {legacy}_pkey")
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY NONE")
+    if table == 'history':
+        op.execute("DROP INDEX IF EXISTS ix_history_user_id_created_at_id")
+
+    if partitioned:
+        op.execute(
+            f"CREATE TABLE {table} ("
+            f"id INTEGER NOT NULL DEFAULT nextval('{table}_id_seq'), "
+            f"{COLUMNS[table]}, "
+            f"CONSTRAINT {table}_pkey PRIMARY KEY (id, created_at)"
+            f") PARTITION BY RANGE (created_at)"
+        )
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+        op.execute(f"""
+            DO $$
+            DECLARE
+                month_start DATE;
+            BEGIN
+                FOR month_start IN
+                    SELECT generate_series(
+                        date_trunc('month', COALESCE((SELECT min(created_at) FROM {legacy}), now())),
+                        date_trunc('month', now()) + interval '{PREMAKE_MONTHS} months',
+                        interval '1 month'
+                    )::date
+                LOOP
+                    EXECUTE format(
+                        'CREATE TABLE %I PARTITION OF {table} FOR VALUES FROM (%L) TO (%L)',
+                        '{table}_' || to_char(month_start, 'YYYY_MM'),
+                        month_start,
+                        (month_start + interval '1 month')::date
+                    );
+                END LOOP;
+            END
+            $$
+        """)
+    else:
+        op.execute(
+            f"CREATE TABLE {table} ("
+            f"id INTEGER NOT NULL DEFAULT nextval('{table}_id_seq'), "
+            f"{COLUMNS[table]}, "
+            f"CONSTRAINT {table}_pkey PRIMARY KEY (id)"
+            f")"
+        )
+
+    op.execute(
+        f"INSERT INTO {table} ({COLUMN_NAMES[table]}) "
+        f"SELECT {COLUMN_NAMES[table]} FROM {legacy}"
+    )
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+    # On downgrade the legacy table is partitioned; its partitions go with it
+    op.execute(f"DROP TABLE {legacy} CASCADE")
+
+    if table == 'history':
+        op.execute(
+            "CREATE INDEX ix_history_user_id_created_at_id "
+            "ON history (user_id, created_at DESC, id DESC)"
+        )
+
+
+def upgrade() -> None:
+    _replace_table('history', partitioned=True)
+    _replace_table('symptoms', partitioned=True)
+
+
+def downgrade() -> None:
+    _replace_table('symptoms', partitioned=False)
+    _replace_table('history', partitioned=False)
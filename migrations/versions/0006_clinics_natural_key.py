@@ -0,0 +1,37 @@
+"""clinics natural key
+
+Unique (clinic_type, city, name, address) index used as the conflict
+target of the bulk clinic importer. Duplicates that already exist are
+collapsed to the oldest row first.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 13:10:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "DELETE FROM clinics a USING clinics b "
+        "WHERE a.id > b.id AND a.clinic_type = b.clinic_type AND a.city = b.city "
+        "AND a.name = b.name AND a.address = b.address"
+    )
+    with op.get_context().autocommit_block():
+        op.create_index('uq_clinics_natural_key', 'clinics', ['clinic_type', 'city', 'name', 'address'],
+                        unique=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('uq_clinics_natural_key', table_name='clinics', postgresql_concurrently=True)
@@ -0,0 +1,36 @@
+"""reminders next_fire_at
+
+Persisted next fire time of each reminder (naive UTC), so the scheduler
+loads fire times instead of deriving them for every row on start. Existing
+rows are filled by the scheduler on start or by
+python -m app.services.recurrence.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 15:20:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('reminders', sa.Column('next_fire_at', sa.DateTime(), nullable=True))
+    with op.get_context().autocommit_block():
+        op.create_index('ix_reminders_active_next_fire_at', 'reminders', ['next_fire_at'], unique=False,
+                        postgresql_where=sa.text('is_active'), postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_reminders_active_next_fire_at', table_name='reminders', postgresql_concurrently=True)
+    op.drop_column('reminders', 'next_fire_at')
@@ -0,0 +1,33 @@
+"""reminders dispatch lease
+
+Worker ID and lease expiry of reminders claimed for delivery when several
+bot replicas dispatch reminders (REMINDER_DISPATCH_MODE=lease). Due
+reminders are looked up through ix_reminders_active_next_fire_at, so no
+new index is needed.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 16:30:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('reminders', sa.Column('lease_owner', sa.String(length=64), nullable=True))
+    op.add_column('reminders', sa.Column('lease_expires_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('reminders', 'lease_expires_at')
+    op.drop_column('reminders', 'lease_owner')
@@ -0,0 +1,80 @@
+"""news
+
+News items with a body per language, read newest first with keyset
+pagination on (published_at, id). The items that used to be hard-coded
+in the news menu are inserted as the initial feed.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18 20:30:00.000000
+"""
+
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0010'
+down_revision: Union[str, None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INITIAL_NEWS = [
+    (
+        "Новый закон о защите животных в Узбекистане",
+        "New animal protection law in Uzbekistan",
+        "O'zbekistonda hayvonlarni himoya qilish to'g'risida yangi qonun",
+    ),
+    (
+        "Конкурс на лучший зоомагазин Узбекистана 2024",
+        "Best pet shop of Uzbekistan 2024 contest",
+        "O'zbekistonning eng yaxshi zoodo'koni 2024 tanlovi",
+    ),
+    (
+        "Бесплатная вакцинация собак от бешенства в Самарканде",
+        "Free rabies vaccination for dogs in Samarkand",
+        "Samarqandda itlarni quturishga qarshi bepul emlash",
+    ),
+    (
+        "В Ташкенте открылся новый приют для бездомных животных",
+        "A new shelter for homeless animals opened in Tashkent",
+        "Toshkentda uysiz hayvonlar uchun yangi boshpana ochildi",
+    ),
+]
+
+
+def upgrade() -> None:
+    news = op.create_table(
+        'news',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('body_ru', sa.Text(), nullable=False),
+        sa.Column('body_en', sa.Text(), nullable=True),
+        sa.Column('body_uz', sa.Text(), nullable=True),
+        sa.Column('is_published', sa.Boolean(), nullable=False),
+        sa.Column('published_at', sa.DateTime(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_news_published_at_id', 'news', [sa.text('published_at DESC'), sa.text('id DESC')],
+                    unique=False, postgresql_where=sa.text('is_published'))
+
+    now = datetime.utcnow()
+    op.bulk_insert(news, [
+        {
+            'body_ru': body_ru,
+            'body_en': body_en,
+            'body_uz': body_uz,
+            'is_published': True,
+            'published_at': now,
+            'created_at': now,
+        }
+        for body_ru, body_en, body_uz in INITIAL_NEWS
+    ])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_news_published_at_id', table_name='news', postgresql_where=sa.text('is_published'))
+    op.drop_table('news')
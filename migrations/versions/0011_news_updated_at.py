@@ -0,0 +1,32 @@
+"""news updated_at
+
+Time of the last change to a news item (naive UTC). The feed version is
+built from it, so edits and unpublishing invalidate cached pages. Existing
+rows take their creation time.
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-18 23:10:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0011'
+down_revision: Union[str, None] = '0010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('news', sa.Column('updated_at', sa.DateTime(), nullable=True))
+    op.execute("UPDATE news SET updated_at = created_at")
+    op.alter_column('news', 'updated_at', nullable=False)
+
+
+def downgrade() -> None:
+    op.drop_column('news', 'updated_at')
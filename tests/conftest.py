@@ -0,0 +1,91 @@
+"""
+Shared test fixtures
+
+Tests run against a throwaway SQLite database by default. Set
+TEST_DATABASE_URL to a PostgreSQL database (it is migrated to the latest
+revision and truncated between tests) to also run the tests of
+PostgreSQL-only SQL, which are skipped otherwise.
+"""
+
+import asyncio
+import os
+import tempfile
+
+import pytest
+import pytest_asyncio
+
+os.environ.setdefault("BOT_TOKEN", "123456:TEST")
+os.environ["DATABASE_URL"] = os.environ.get("TEST_DATABASE_URL") or (
+    f"sqlite+aiosqlite:///{os.path.join(tempfile.gettempdir(), 'vetbot_test.db')}"
+)
+
+_migrated = False
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "postgres: test needs TEST_DATABASE_URL (PostgreSQL)")
+
+
+def pytest_collection_modifyitems(config, items):
+    if os.environ["DATABASE_URL"].startswith("postgresql"):
+        return
+    skip = pytest.mark.skip(reason="needs TEST_DATABASE_URL pointing to PostgreSQL")
+    for item in items:
+        if "postgres" in item.keywords:
+            item.add_marker(skip)
+
+
+def _upgrade():
+    from alembic import command
+    from alembic.config import Config
+    from app.database.database import ALEMBIC_CONFIG_PATH
+
+    config = Config(str(ALEMBIC_CONFIG_PATH))
+    # Keep the logging setup of the tests (fileConfig disables app loggers)
+    config.attributes["configure_logger"] = False
+    command.upgrade(config, "head")
+
+
+async def _reset_schema(engine):
+    """Create an empty schema: migrations on PostgreSQL, create_all on SQLite"""
+    global _migrated
+    from sqlalchemy import text
+    from app.database.models import Base, PARTITIONED_TABLES
+
+    if engine.dialect.name == "sqlite":
+        # Partitioned tables need PostgreSQL (composite key with identity)
+        tables = [table for table in Base.metadata.sorted_tables if table.name not in PARTITIONED_TABLES]
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all, tables=tables)
+            await conn.run_sync(Base.metadata.create_all, tables=tables)
+        return
+
+    if not _migrated:
+        # env.py runs its own event loop
+        await asyncio.to_thread(_upgrade)
+        _migrated = True
+    tables = ", ".join(table.name for table in Base.metadata.sorted_tables)
+    async with engine.begin() as conn:
+        await conn.execute(text(f"TRUNCATE {tables} RESTART IDENTITY CASCADE"))
+
+
+@pytest_asyncio.fixture
+async def db():
+    """Empty database; yields the engine and disposes its pool afterwards"""
+    from app.database.database import engine
+
+    try:
+        await _reset_schema(engine)
+        yield engine
+    finally:
+        # Pooled connections belong to this test's event loop
+        await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def session(db):
+    """Session on an empty database"""
+    from app.database import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as session:
+        yield session
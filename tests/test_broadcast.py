@@ -0,0 +1,161 @@
+"""
+Broadcasts: every active user is messaged, and a restart resumes from the checkpoint
+"""
+
+import asyncio
+from collections import Counter
+
+import pytest
+from aiogram.exceptions import TelegramForbiddenError
+from sqlalchemy import insert, select
+
+from app.database import AsyncSessionLocal, crud, get_pool_stats
+from app.database.models import Broadcast, User
+from app.services.broadcast import BroadcastService
+from app.services.sender import outbound_sender
+
+pytestmark = pytest.mark.asyncio
+
+USERS = 600
+BLOCKED_EVERY = 50  # users whose telegram_id is a multiple of this blocked the bot
+
+
+class FakeSender:
+    """Stands in for outbound_sender.enqueue; answers each message after a delay"""
+
+    def __init__(self, delay: float = 0.02):
+        self.delay = delay
+        self.delivered = Counter()  # telegram_id -> messages that reached Telegram
+
+    def enqueue(self, method, priority=None) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        asyncio.get_running_loop().call_later(self.delay, self._answer, method, future)
+        return future
+
+    def _answer(self, method, future: asyncio.Future):
+        if future.cancelled():
+            return
+        self.delivered[method.chat_id] += 1
+        if method.chat_id % BLOCKED_EVERY == 0:
+            future.set_exception(TelegramForbiddenError(method=method, message="Forbidden: bot was blocked by the user"))
+        else:
+            future.set_result(None)
+
+
+@pytest.fixture
+def sender(monkeypatch):
+    sender = FakeSender()
+    monkeypatch.setattr(outbound_sender, "enqueue", sender.enqueue)
+    return sender
+
+
+async def seed_users():
+    async with AsyncSessionLocal() as session:
+        await session.execute(insert(User), [{"telegram_id": 1000 + i, "language": "ru"} for i in range(USERS)])
+        await session.commit()
+
+
+def _service() -> BroadcastService:
+    return BroadcastService(segment_size=100, in_flight=20, checkpoint_interval=0.05)
+
+
+async def broadcast_row(broadcast_id: int) -> Broadcast:
+    async with AsyncSessionLocal() as session:
+        return await crud.get_broadcast(session, broadcast_id)
+
+
+async def finish(service: BroadcastService):
+    await asyncio.gather(*list(service.tasks.values()))
+
+
+async def assert_finished(broadcast_id: int):
+    broadcast = await broadcast_row(broadcast_id)
+    assert broadcast.status == "done"
+    assert broadcast.last_user_id == USERS
+    assert broadcast.blocked == USERS // BLOCKED_EVERY
+    assert (broadcast.sent, broadcast.failed) == (USERS - broadcast.blocked, 0)
+
+    async with AsyncSessionLocal() as session:
+        inactive = await session.scalars(select(User.telegram_id).where(User.is_active == False))
+        assert sorted(inactive) == [1000 + i for i in range(USERS) if (1000 + i) % BLOCKED_EVERY == 0]
+
+
+async def wait_handled(service: BroadcastService, broadcast_id: int, count: int):
+    while service.progress[broadcast_id].handled < count:
+        await asyncio.sleep(0.01)
+
+
+async def test_broadcast_reaches_every_active_user_once(db, sender):
+    await seed_users()
+    service = _service()
+
+    broadcast_id = await service.create("hello", 1)
+    await finish(service)
+
+    assert set(sender.delivered) == {1000 + i for i in range(USERS)}
+    assert max(sender.delivered.values()) == 1
+    await assert_finished(broadcast_id)
+
+
+async def test_no_connection_held_while_sending(db, sender, monkeypatch):
+    await seed_users()
+    checked_out = []
+    enqueue = sender.enqueue
+
+    def spy(method, priority=None):
+        checked_out.append(get_pool_stats()["checked_out"])
+        return enqueue(method, priority)
+
+    monkeypatch.setattr(outbound_sender, "enqueue", spy)
+    service = _service()
+    await service.create("hello", 1)
+    await finish(service)
+
+    assert len(checked_out) == USERS
+    assert set(checked_out) == {0}
+
+
+async def test_graceful_stop_resumes_without_repeats(db, sender):
+    await seed_users()
+    service = _service()
+    broadcast_id = await service.create("hello", 1)
+    await wait_handled(service, broadcast_id, USERS // 2)
+
+    await service.stop()
+    stopped_at = (await broadcast_row(broadcast_id)).last_user_id
+    assert USERS // 2 <= stopped_at < USERS
+
+    resumed = _service()
+    await resumed.start()
+    await finish(resumed)
+
+    assert set(sender.delivered) == {1000 + i for i in range(USERS)}
+    assert max(sender.delivered.values()) == 1
+    await assert_finished(broadcast_id)
+
+
+async def test_crash_repeats_only_messages_after_the_checkpoint(db, sender, monkeypatch):
+    await seed_users()
+    service = _service()
+    broadcast_id = await service.create("hello", 1)
+    await wait_handled(service, broadcast_id, USERS // 2)
+
+    # A crash: the task dies without storing a final checkpoint
+    async def no_checkpoint(*args, **kwargs):
+        pass
+
+    monkeypatch.setattr(service, "_checkpoint", no_checkpoint)
+    task = service.tasks[broadcast_id]
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    checkpoint = (await broadcast_row(broadcast_id)).last_user_id
+    assert 0 < checkpoint < USERS
+
+    resumed = _service()
+    await resumed.start()
+    await finish(resumed)
+
+    assert set(sender.delivered) == {1000 + i for i in range(USERS)}
+    repeated = [telegram_id - 999 for telegram_id, count in sender.delivered.items() if count > 1]
+    assert all(user_id > checkpoint for user_id in repeated)
+    await assert_finished(broadcast_id)
@@ -0,0 +1,178 @@
+"""
+Tests for the two-tier cache: single-flight loads and invalidation races
+"""
+
+import asyncio
+import itertools
+import json
+
+import pytest
+
+from app.utils import cache as cache_module
+from app.utils.cache import TwoTierCache
+
+pytestmark = pytest.mark.asyncio
+
+_namespaces = itertools.count()
+
+
+def _cache(**kwargs) -> TwoTierCache:
+    kwargs.setdefault("use_redis", False)
+    return TwoTierCache(f"test{next(_namespaces)}", maxsize=100, ttl=60, jitter=0, **kwargs)
+
+
+class Source:
+    """Loader returning the current value once released"""
+
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def load(self):
+        self.calls += 1
+        value = self.value
+        self.started.set()
+        await self.release.wait()
+        return value
+
+
+async def test_concurrent_misses_share_one_load():
+    cache = _cache()
+    source = Source({"v": 1})
+    source.release.set()
+
+    results = await asyncio.gather(*(cache.get_or_load("k", source.load) for _ in range(500)))
+
+    assert source.calls == 1
+    assert all(result == {"v": 1} for result in results)
+    assert cache.stats.coalesced == 499
+    assert await cache.get_or_load("k", source.load) == {"v": 1}
+    assert source.calls == 1
+
+
+async def test_none_is_cached_and_errors_are_not():
+    cache = _cache()
+    calls = []
+
+    async def missing():
+        calls.append(1)
+
+    async def failing():
+        calls.append(1)
+        raise RuntimeError("database down")
+
+    assert await cache.get_or_load("none", missing) is None
+    assert await cache.get_or_load("none", missing) is None
+    assert len(calls) == 1
+
+    results = await asyncio.gather(*(cache.get_or_load("err", failing) for _ in range(3)), return_exceptions=True)
+    assert [type(result) for result in results] == [RuntimeError] * 3
+    assert len(calls) == 2
+    assert cache.stats.load_errors == 1
+    with pytest.raises(RuntimeError):
+        await cache.get_or_load("err", failing)
+
+
+async def test_cancelled_caller_does_not_cancel_shared_load():
+    cache = _cache()
+    source = Source(5)
+
+    first = asyncio.create_task(cache.get_or_load("k", source.load))
+    await source.started.wait()
+    second = asyncio.create_task(cache.get_or_load("k", source.load))
+    await asyncio.sleep(0)
+    first.cancel()
+    source.release.set()
+
+    assert await second == 5
+    assert source.calls == 1
+
+
+@pytest.mark.parametrize("change", ["invalidate", "invalidate_all", "invalidate_local", "set"])
+async def test_change_during_load_is_not_overwritten(change):
+    cache = _cache()
+    source = Source("old")
+
+    stale = asyncio.create_task(cache.get_or_load("k", source.load))
+    await source.started.wait()
+
+    # The value changes while the load is running
+    source.value = "new"
+    if change == "invalidate":
+        await cache.invalidate("k")
+    elif change == "invalidate_all":
+        await cache.invalidate()
+    elif change == "invalidate_local":
+        cache.invalidate_local("k")
+    else:
+        await cache.set("k", "new")
+
+    # A caller arriving now does not join the stale load
+    fresh = asyncio.create_task(cache.get_or_load("k", source.load))
+    source.release.set()
+
+    assert await stale == "old"
+    assert await fresh == "new"
+    assert await cache.get("k") == "new"
+    assert source.calls == (1 if change == "set" else 2)
+    assert cache.stats.stale_loads == 1
+
+
+class StubRedis:
+    """Dictionary-backed subset of the redis client; get() can be held"""
+
+    def __init__(self):
+        self.values = {}
+        self.published = []
+        self.hold = None
+
+    async def get(self, key):
+        value = self.values.get(key)
+        if self.hold is not None:
+            await self.hold.wait()
+        return value
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = value.encode() if isinstance(value, str) else value
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+
+    async def scan_iter(self, match, count=None):
+        prefix = match.rstrip("*")
+        for key in [key for key in self.values if key.startswith(prefix)]:
+            yield key
+
+    async def publish(self, channel, message):
+        self.published.append(json.loads(message))
+
+
+async def test_redis_tiers_not_refilled_by_stale_reads(monkeypatch):
+    redis = StubRedis()
+    monkeypatch.setattr(cache_module, "get_redis", lambda: redis)
+    cache = _cache(use_redis=True)
+    source = Source("old")
+    source.release.set()
+
+    assert await cache.get_or_load("k", source.load) == "old"
+    cache.invalidate_local("k")
+
+    # A local miss reads "old" from Redis while the key is invalidated
+    redis.hold = asyncio.Event()
+    read = asyncio.create_task(cache.get("k"))
+    await asyncio.sleep(0)
+    await cache.invalidate("k")
+    redis.hold.set()
+    redis.hold = None
+
+    assert await read == "old"
+    assert cache.local.get("k") is None
+    assert redis.values == {}
+    assert redis.published[-1]["key"] == "k"
+
+    source.value = "new"
+    assert await cache.get_or_load("k", source.load) == "new"
+    assert json.loads(redis.values[cache._redis_key("k")]) == "new"
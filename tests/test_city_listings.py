@@ -0,0 +1,88 @@
+"""
+Tests for cached city listings and their invalidation after clinic changes
+"""
+
+import json
+
+import pytest
+import pytest_asyncio
+
+from app.database import AsyncSessionLocal, Clinic, count_queries
+from app.services import city_listings
+from app.services.city_listings import get_city_listing, get_city_listing_cache_stats, invalidate_city_listings
+from app.services.clinic_importer import _run_import
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest_asyncio.fixture
+async def listings(db):
+    """Empty clinics table with nothing cached"""
+    await invalidate_city_listings()
+    yield
+    await invalidate_city_listings()
+
+
+async def _view(city_key: str = "tashkent", clinic_type: str = "clinic", language: str = "ru"):
+    """Render a listing in its own session; returns (text, statements issued)"""
+    async with AsyncSessionLocal() as session:
+        with count_queries() as counter:
+            text, _ = await get_city_listing(session, city_key, clinic_type, language)
+    return text, counter.count
+
+
+async def _add_clinic(name: str, city: str = "tashkent", clinic_type: str = "clinic"):
+    async with AsyncSessionLocal() as session:
+        session.add(Clinic(name=name, city=city, address="Amir Temur 1", phone="+998901234567",
+                           working_hours="9-18", clinic_type=clinic_type))
+        await session.commit()
+
+
+async def test_repeated_view_issues_no_queries(listings):
+    await _add_clinic("Vet Plus")
+
+    text, queries = await _view()
+    assert "Vet Plus" in text
+    assert queries == 1
+
+    for _ in range(3):
+        assert await _view() == (text, 0)
+    assert get_city_listing_cache_stats()["size"] == 1
+
+    # Each language is a separate entry
+    assert (await _view(language="en"))[1] == 1
+
+
+async def test_invalidation_scopes(listings):
+    for city_key in ("tashkent", "samarkand"):
+        await _view(city_key)
+    await _add_clinic("Vet Plus")
+    await _add_clinic("Samarkand Vet", city="samarkand")
+
+    assert "Vet Plus" not in (await _view())[0]
+    await invalidate_city_listings("tashkent", "pharmacy")
+    assert (await _view())[1] == 0
+
+    await invalidate_city_listings("tashkent")
+    text, queries = await _view()
+    assert "Vet Plus" in text and queries == 1
+    assert (await _view("samarkand"))[1] == 0
+
+
+@pytest.mark.postgres
+async def test_clinic_import_forces_reload(listings, tmp_path):
+    # Sample clinics while the table is empty
+    before, _ = await _view()
+    assert all(entry in before for entry in city_listings.SAMPLE_LISTINGS["clinic"]["tashkent"])
+
+    (tmp_path / "clinics.ndjson").write_text(json.dumps({
+        "name": "Imported Vet", "city": "Tashkent", "address": "Amir Temur 1", "phone": "+998901234567",
+        "working_hours": "9-18", "clinic_type": "clinic",
+    }) + "\n")
+    stats = await _run_import(tmp_path, chunk_size=100)
+    assert stats.imported == 1
+
+    text, queries = await _view()
+    assert queries == 1
+    assert "Imported Vet" in text
+    assert "Pet Care" not in text
@@ -0,0 +1,101 @@
+"""
+Tests for the streaming clinic importer
+"""
+
+import json
+
+import pytest
+from sqlalchemy import select
+
+from app.database import Clinic
+from app.services.clinic_importer import (
+    COLUMNS, ImportStats, ValidationError, import_clinics, iter_chunks, iter_rows, validate_row,
+)
+
+ROW = {
+    "name": "Vet Plus", "city": "Tashkent", "address": "Amir Temur 1", "phone": "+998901234567",
+    "working_hours": "9-18", "clinic_type": "clinic",
+}
+
+
+def _write_ndjson(path, lines):
+    path.write_text("\n".join(line if isinstance(line, str) else json.dumps(line) for line in lines) + "\n")
+    return path
+
+
+def test_non_string_values_are_coerced():
+    record = dict(zip(COLUMNS, validate_row({**ROW, "phone": 998901234567, "website": 1, "is_active": 0})))
+
+    assert record["phone"] == "998901234567"
+    assert record["website"] == "1"
+    assert record["is_active"] is False
+
+
+@pytest.mark.parametrize("row", [
+    None,
+    42,
+    "text",
+    [ROW],
+    {**ROW, "name": None},
+    {**ROW, "name": {"ru": "Vet"}},
+    {**ROW, "phone": ["1", "2"]},
+    {**ROW, "clinic_type": "zoo"},
+    {**ROW, "latitude": "north"},
+])
+def test_invalid_rows_raise_validation_error(row):
+    with pytest.raises(ValidationError):
+        validate_row(row)
+
+
+def test_malformed_lines_are_counted_not_fatal(tmp_path):
+    file = _write_ndjson(tmp_path / "clinics.ndjson", [
+        ROW,
+        '{"name": "broken',
+        "[1, 2]",
+        "42",
+        "",
+        {**ROW, "name": "Second", "phone": 123},
+    ])
+    stats = ImportStats()
+
+    chunks = list(iter_chunks(iter_rows(file), chunk_size=10, stats=stats))
+
+    assert stats.read == 5
+    assert stats.invalid == 3
+    assert [[record[0] for record in chunk] for chunk in chunks] == [["Vet Plus", "Second"]]
+    # Staging records end with the source row number
+    assert [chunk[-1] for chunk in chunks[0]] == [1, 5]
+
+
+def test_malformed_csv_line_is_counted(tmp_path):
+    file = tmp_path / "clinics.csv"
+    header = ",".join(ROW)
+    good = ",".join(ROW.values())
+    # A field over csv.field_size_limit() makes the reader raise csv.Error
+    file.write_text(f"{header}\n{good}\n{'x' * 200_000},{good}\n{good}\n")
+    stats = ImportStats()
+
+    records = [record for chunk in iter_chunks(iter_rows(file), 10, stats) for record in chunk]
+
+    assert stats.read == 3
+    assert stats.invalid == 1
+    assert len(records) == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.postgres
+async def test_last_duplicate_wins(db, tmp_path):
+    # Duplicates of the natural key within one chunk and across chunks
+    lines = [{**ROW, "phone": f"phone {i}"} for i in range(5)]
+    lines.insert(2, {**ROW, "city": " TASHKENT ", "phone": "upper-case city"})
+    lines.append({**ROW, "name": "Other", "phone": "other"})
+    _write_ndjson(tmp_path / "a.ndjson", lines)
+    _write_ndjson(tmp_path / "b.ndjson", [{**ROW, "name": "Other", "phone": "other, last"}])
+
+    for chunk_size in (100, 4):
+        stats = await import_clinics(tmp_path, chunk_size=chunk_size)
+        assert stats.invalid == 0
+
+        async with db.connect() as conn:
+            result = await conn.execute(select(Clinic.name, Clinic.city, Clinic.phone).order_by(Clinic.name))
+            assert result.all() == [("Other", "tashkent", "other, last"), ("Vet Plus", "tashkent", "phone 4")]
@@ -0,0 +1,77 @@
+"""
+Tests for the per-update unit of work and the session-scoped user lookup
+"""
+
+import pytest
+from sqlalchemy import select
+
+from app.database import AsyncSessionLocal, User, count_queries, crud
+from app.database.database import pool_metrics
+from app.middlewares.database import DatabaseMiddleware
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _stored_users() -> list:
+    async with AsyncSessionLocal() as session:
+        return list(await session.scalars(select(User.telegram_id).order_by(User.telegram_id)))
+
+
+async def test_one_session_per_update(db):
+    middleware = DatabaseMiddleware()
+    sessions = []
+
+    async def handler(event, data):
+        sessions.append(data["session"])
+        await crud.get_user(data["session"], 1)
+        await crud.create_user(data["session"], 100 + len(sessions))
+        await crud.get_user(data["session"], 3)
+
+    async def idle(event, data):
+        sessions.append(data["session"])
+
+    await middleware(handler, object(), {})
+    checkouts = pool_metrics.checkouts
+    await middleware(idle, object(), {})
+    await middleware(handler, object(), {})
+
+    assert len(set(map(id, sessions))) == 3
+    # The idle update never checked out a connection
+    assert pool_metrics.checkouts - checkouts == 1
+    assert middleware.stats.updates == 3
+    assert middleware.stats.sessions_used == 2
+    assert middleware.stats.max_queries_per_update == middleware.stats.queries / 2
+    assert middleware.stats.queries_per_update == middleware.stats.queries / 3
+
+
+async def test_commit_on_success_rollback_on_error(db):
+    middleware = DatabaseMiddleware()
+
+    async def handler(event, data):
+        await crud.create_user(data["session"], event)
+
+    async def failing(event, data):
+        await crud.create_user(data["session"], event)
+        raise RuntimeError("handler failed")
+
+    await middleware(handler, 1, {})
+    with pytest.raises(RuntimeError):
+        await middleware(failing, 2, {})
+
+    assert await _stored_users() == [1]
+    assert middleware.stats.rollbacks == 1
+    assert middleware.stats.updates == 2
+
+
+async def test_repeated_get_user_is_memoized(session):
+    await crud.create_user(session, 5)
+    await session.commit()
+
+    async with AsyncSessionLocal() as update_session:
+        with count_queries() as counter:
+            user = await crud.get_user(update_session, 5)
+            assert counter.count == 1
+            assert await crud.get_user(update_session, 5) is user
+            assert await crud.get_user(update_session, 6) is None
+            assert await crud.get_user(update_session, 6) is None
+        assert counter.count == 2
@@ -0,0 +1,39 @@
+"""
+Tests for the instrumented connection pool
+"""
+
+import pytest
+from sqlalchemy import text
+
+from app.config import settings
+from app.database import AsyncSessionLocal, get_pool_stats
+from app.database.database import InstrumentedQueuePool, pool_metrics
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_pool_reuses_connections(db):
+    await db.dispose()
+    created = pool_metrics.connections_created
+    checkouts = pool_metrics.checkouts
+
+    for _ in range(20):
+        async with AsyncSessionLocal() as session:
+            await session.execute(text("SELECT 1"))
+
+    stats = get_pool_stats()
+    assert stats["pool_class"] == InstrumentedQueuePool.__name__
+    assert stats["checkouts"] - checkouts == 20
+    assert pool_metrics.connections_created - created == 1
+    assert stats["checked_out"] == 0
+    assert stats["saturation"] == 0.0
+
+
+async def test_pool_reports_saturation(db):
+    async with AsyncSessionLocal() as first, AsyncSessionLocal() as second:
+        await first.execute(text("SELECT 1"))
+        await second.execute(text("SELECT 1"))
+        stats = get_pool_stats()
+
+    assert stats["checked_out"] == 2
+    assert stats["saturation"] == 2 / (settings.DATABASE_POOL_SIZE + settings.DATABASE_MAX_OVERFLOW)
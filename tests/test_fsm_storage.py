@@ -0,0 +1,134 @@
+"""
+Tests for FSM storages with per-state TTLs
+"""
+
+import time
+
+import pytest
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+
+from app.config import settings
+from app.handlers.profile import ProfileStates
+from app.handlers.reminder import ReminderStates
+from app.utils.fsm_storage import BoundedMemoryStorage, TTLRedisStorage, state_ttl
+
+pytestmark = pytest.mark.asyncio
+
+KEY = StorageKey(bot_id=1, chat_id=2, user_id=2)
+
+
+class StubRedis:
+    """Dictionary-backed subset of the redis client, recording key TTLs"""
+
+    def __init__(self):
+        self.values = {}
+        self.ttls = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = value.encode() if isinstance(value, str) else value
+        self.ttls[key] = ex
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+            self.ttls.pop(key, None)
+
+    async def expire(self, key, ttl):
+        if key in self.values:
+            self.ttls[key] = ttl
+
+    def pipeline(self, transaction=True):
+        return StubPipeline(self)
+
+
+class StubPipeline:
+    """Pipeline of StubRedis, commands run on execute()"""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def set(self, *args, **kwargs):
+        self.calls.append(self.redis.set(*args, **kwargs))
+
+    def expire(self, *args):
+        self.calls.append(self.redis.expire(*args))
+
+    async def execute(self):
+        for call in self.calls:
+            await call
+
+
+def _ttls(storage: TTLRedisStorage) -> tuple:
+    ttls = storage.redis.ttls
+    return ttls.get(storage.key_builder.build(KEY, "state")), ttls.get(storage.key_builder.build(KEY, "data"))
+
+
+async def test_redis_data_key_gets_state_ttl():
+    storage = TTLRedisStorage(StubRedis())
+    profile_ttl = state_ttl(ProfileStates.waiting_for_owner_name.state)
+    reminder_ttl = state_ttl(ReminderStates.waiting_for_reminder_text.state)
+    assert profile_ttl != reminder_ttl != settings.FSM_STATE_TTL
+
+    # Data written without a state lives for the default TTL
+    await storage.set_data(KEY, {"step": 0})
+    assert _ttls(storage) == (None, settings.FSM_STATE_TTL)
+
+    await storage.set_state(KEY, ProfileStates.waiting_for_owner_name)
+    await storage.set_data(KEY, {"step": 1})
+    assert _ttls(storage) == (profile_ttl, profile_ttl)
+
+    await storage.set_state(KEY, ReminderStates.waiting_for_reminder_text)
+    assert _ttls(storage) == (reminder_ttl, reminder_ttl)
+    await storage.set_data(KEY, {"step": 2})
+    assert _ttls(storage) == (reminder_ttl, reminder_ttl)
+    assert await storage.get_data(KEY) == {"step": 2}
+
+    await storage.set_state(KEY, None)
+    await storage.set_data(KEY, {})
+    assert storage.redis.values == {}
+
+
+async def test_memory_flow_expires_with_state_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    storage = BoundedMemoryStorage(max_entries=10)
+    ttl = state_ttl(ReminderStates.waiting_for_reminder_text.state)
+
+    await storage.set_state(KEY, ReminderStates.waiting_for_reminder_text)
+    now[0] += ttl - 1
+    # Updating data keeps the flow alive for another state TTL
+    await storage.set_data(KEY, {"text": "feed"})
+    now[0] += ttl - 1
+    assert await storage.get_data(KEY) == {"text": "feed"}
+    assert await storage.get_state(KEY) == ReminderStates.waiting_for_reminder_text.state
+
+    now[0] += 2
+    assert await storage.get_data(KEY) == {}
+    assert await storage.get_state(KEY) is None
+    assert not storage.storage
+
+
+async def test_memory_storage_is_bounded():
+    storage = BoundedMemoryStorage(max_entries=100)
+    for i in range(1000):
+        context = FSMContext(storage, StorageKey(bot_id=1, chat_id=i, user_id=i))
+        await context.set_state(ProfileStates.waiting_for_owner_phone)
+        await context.update_data(owner_name=f"name {i}")
+
+    assert len(storage.storage) == 100
+    assert storage.evictions == 900
+    last = FSMContext(storage, StorageKey(bot_id=1, chat_id=999, user_id=999))
+    assert await last.get_data() == {"owner_name": "name 999"}
+    await last.clear()
+    assert len(storage.storage) == 99
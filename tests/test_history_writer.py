@@ -0,0 +1,142 @@
+"""
+Tests for the buffered history writer
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+
+from app.database import AsyncSessionLocal, History, User
+from app.services.history_writer import HistoryWriter, BACKPRESSURE_BLOCK, BACKPRESSURE_DROP_OLDEST
+
+pytestmark = pytest.mark.asyncio
+
+
+class HeldWriter(HistoryWriter):
+    """Writer whose flushes wait for release and are recorded instead of written"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.release = asyncio.Event()
+        self.flushing = asyncio.Event()
+        self.written = []
+
+    async def _flush(self, batch):
+        if not batch:
+            return
+        self.flushing.set()
+        await self.release.wait()
+        self.written.extend(entry["action"] for entry in batch)
+
+
+async def _stop_while_full(backpressure: str) -> HeldWriter:
+    writer = HeldWriter(queue_size=5, batch_size=1, flush_interval=60, backpressure=backpressure)
+    await writer.start()
+
+    # The writer takes the first entry and is held inside its flush
+    await writer.add(1, "a0")
+    await writer.flushing.wait()
+
+    stop = asyncio.create_task(writer.stop())
+    await asyncio.sleep(0)
+    for i in range(1, 6 if backpressure == BACKPRESSURE_BLOCK else 21):
+        await writer.add(1, f"a{i}")
+    assert writer.queue.full()
+
+    writer.release.set()
+    await asyncio.wait_for(stop, timeout=2)
+    assert writer.task is None
+    return writer
+
+
+async def test_stop_with_full_queue_drop_oldest():
+    writer = await _stop_while_full(BACKPRESSURE_DROP_OLDEST)
+
+    assert writer.written == ["a0", "a16", "a17", "a18", "a19", "a20"]
+    assert writer.stats.dropped == 15
+    assert writer.queue_depth == 0
+
+
+async def test_stop_with_full_queue_block():
+    writer = await _stop_while_full(BACKPRESSURE_BLOCK)
+
+    assert writer.written == ["a0", "a1", "a2", "a3", "a4", "a5"]
+    assert writer.stats.dropped == 0
+
+
+async def test_block_does_not_wait_after_stop():
+    writer = HeldWriter(queue_size=2, batch_size=1, flush_interval=60, backpressure=BACKPRESSURE_BLOCK)
+    await writer.start()
+    await writer.add(1, "a0")
+    await writer.flushing.wait()
+
+    # Blocked on a full queue when stop() is called
+    await writer.add(1, "a1")
+    await writer.add(1, "a2")
+    blocked = asyncio.create_task(writer.add(1, "a3"))
+    await asyncio.sleep(0)
+    stop = asyncio.create_task(writer.stop())
+    await asyncio.wait_for(blocked, timeout=1)
+    writer.release.set()
+    await asyncio.wait_for(stop, timeout=1)
+
+    # Full again with no writer running
+    for i in range(4, 7):
+        await asyncio.wait_for(writer.add(1, f"a{i}"), timeout=1)
+
+    assert writer.written == ["a0", "a1", "a2"]
+    assert writer.stats.dropped == 2
+    assert writer.queue_depth == 2
+
+
+async def test_stop_idle_writer_and_restart():
+    writer = HeldWriter(queue_size=5, batch_size=10, flush_interval=60)
+    writer.release.set()
+
+    await writer.start()
+    await asyncio.wait_for(writer.stop(), timeout=1)
+
+    await writer.start()
+    await writer.add(1, "after restart")
+    await asyncio.wait_for(writer.stop(), timeout=1)
+    assert writer.written == ["after restart"]
+
+
+async def test_batches_by_size():
+    writer = HeldWriter(queue_size=100, batch_size=10, flush_interval=60)
+    writer.release.set()
+    batches = []
+    flush = writer._flush
+
+    async def record(batch):
+        batches.append(len(batch))
+        await flush(batch)
+
+    writer._flush = record
+    await writer.start()
+    for i in range(25):
+        await writer.add(1, f"a{i}")
+    await writer.stop()
+
+    assert [size for size in batches if size] == [10, 10, 5]
+
+
+@pytest.mark.postgres
+async def test_entries_written_in_bulk(db):
+    async with AsyncSessionLocal() as session:
+        user = User(telegram_id=1)
+        session.add(user)
+        await session.commit()
+
+    writer = HistoryWriter(queue_size=200, batch_size=50, flush_interval=0.05)
+    await writer.start()
+    for i in range(120):
+        await writer.add(user.id, f"action {i}", "test", {"i": i})
+    await writer.stop()
+
+    async with AsyncSessionLocal() as session:
+        count = await session.scalar(select(func.count()).select_from(History))
+    assert count == 120
+    assert writer.stats.written == 120
+    assert writer.stats.batches == 3
@@ -0,0 +1,96 @@
+"""
+Tests for memoized frozen keyboards and their pre-serialized JSON
+"""
+
+import json
+
+import pytest
+from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.methods import EditMessageText
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+from pydantic import ValidationError
+
+from app.keyboards import create_cities_keyboard, get_main_menu
+from app.keyboards.registry import FrozenInlineKeyboardMarkup, KeyboardRegistry, keyboard_registry
+from app.locales.loader import LOCALES
+from app.utils.bot_session import PreserializedSession
+
+
+def _registry_with_counter():
+    registry = KeyboardRegistry()
+    calls = []
+
+    @registry.register
+    def menu(user_id: int, language: str = "ru", page: int = 0) -> InlineKeyboardMarkup:
+        calls.append((user_id, language, page))
+        return InlineKeyboardMarkup(inline_keyboard=[[
+            InlineKeyboardButton(text=f"{language} {page}", callback_data=f"page:{page}")
+        ]])
+
+    return registry, menu, calls
+
+
+def test_built_once_per_arguments_ignoring_user_id():
+    registry, menu, calls = _registry_with_counter()
+
+    first = menu(1, "ru")
+    assert menu(2, "ru") is first
+    assert menu(user_id=3, language="ru") is first
+    assert menu(4, "ru", 0) is first
+    assert menu(1, "en") is not first
+    assert menu(1, "ru", page=1) is not first
+
+    assert len(calls) == 3
+    assert registry.stats() == {"keyboards": 3, "hits": 3, "misses": 3}
+
+
+def test_keyboards_are_frozen():
+    keyboard = get_main_menu(1, "ru")
+
+    assert isinstance(keyboard, FrozenInlineKeyboardMarkup)
+    with pytest.raises(ValidationError):
+        keyboard.inline_keyboard = []
+    with pytest.raises(ValidationError):
+        keyboard.inline_keyboard[0][0].text = "changed"
+    with pytest.raises(TypeError):
+        keyboard.inline_keyboard.append([])
+    with pytest.raises(TypeError):
+        keyboard.inline_keyboard[0][0] = InlineKeyboardButton(text="changed", callback_data="x")
+    with pytest.raises(TypeError):
+        keyboard.inline_keyboard[0] += []
+
+    # Extending a copy of the rows works
+    extended = InlineKeyboardMarkup(inline_keyboard=[*keyboard.inline_keyboard, []])
+    assert len(extended.inline_keyboard) == len(keyboard.inline_keyboard) + 1
+    assert get_main_menu(2, "ru") is keyboard
+
+
+def test_warm_up_builds_language_keyboards():
+    keyboard_registry.warm_up(LOCALES)
+    misses = keyboard_registry.misses
+
+    # Language-only keyboards are served from the registry afterwards
+    for language in LOCALES:
+        get_main_menu(0, language)
+        create_cities_keyboard(language)
+    assert keyboard_registry.misses == misses
+
+
+@pytest.mark.parametrize("language", sorted(LOCALES))
+@pytest.mark.parametrize("builder, args", [(get_main_menu, (123,)), (create_cities_keyboard, ())])
+def test_preserialized_form_matches_aiogram(builder, args, language):
+    bot = Bot("1:test")
+    uncached = builder.build_uncached(*args, language)
+    frozen = builder(*args, language)
+
+    def form_fields(session, markup):
+        method = EditMessageText(chat_id=1, message_id=2, text="text", reply_markup=markup)
+        return {field[0]["name"]: field[2] for field in session.build_form_data(bot, method)._fields}
+
+    expected = form_fields(AiohttpSession(), uncached)
+    actual = form_fields(PreserializedSession(), frozen)
+
+    assert actual.keys() == expected.keys()
+    assert json.loads(actual.pop("reply_markup")) == json.loads(expected.pop("reply_markup"))
+    assert actual == expected
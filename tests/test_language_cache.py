@@ -0,0 +1,53 @@
+"""
+Tests for the user language cache
+"""
+
+import pytest
+from sqlalchemy import select
+
+from app.database import AsyncSessionLocal, User
+from app.locales.loader import cache_user_language, get_user_language, set_user_language
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _stored_language(telegram_id: int) -> str:
+    async with AsyncSessionLocal() as session:
+        return await session.scalar(select(User.language).where(User.telegram_id == telegram_id))
+
+
+async def test_cache_updated_after_commit(session, monkeypatch):
+    session.add(User(telegram_id=7, language="ru"))
+    await session.commit()
+    await cache_user_language(7, "ru")
+
+    cached_at_commit = []
+    commit = session.commit
+
+    async def spy():
+        cached_at_commit.append(await get_user_language(7))
+        await commit()
+
+    monkeypatch.setattr(session, "commit", spy)
+    await set_user_language(session, 7, "en")
+
+    assert cached_at_commit == ["ru"]
+    assert await get_user_language(7) == "en"
+    assert await _stored_language(7) == "en"
+
+
+async def test_failed_commit_keeps_cache(session, monkeypatch):
+    session.add(User(telegram_id=8, language="ru"))
+    await session.commit()
+    await cache_user_language(8, "ru")
+
+    async def fail():
+        raise RuntimeError("commit failed")
+
+    monkeypatch.setattr(session, "commit", fail)
+    with pytest.raises(RuntimeError):
+        await set_user_language(session, 8, "uz")
+    await session.rollback()
+
+    assert await get_user_language(8) == "ru"
+    assert await _stored_language(8) == "ru"
@@ -0,0 +1,76 @@
+"""
+Tests for precompiled locale templates and locale consistency checks
+"""
+
+import random
+import string
+
+import pytest
+
+from app.locales.loader import LOCALES, TEMPLATES, Template, check_locales, get_text
+
+
+def _arguments(template: Template, rnd: random.Random) -> dict:
+    return {field: rnd.choice([rnd.randrange(-10**6, 10**6), "".join(rnd.choices("ab {}:%", k=5)), 1.5])
+            for field in template.fields}
+
+
+def test_real_texts_match_str_format():
+    rnd = random.Random(14)
+    for language, texts in LOCALES.items():
+        for key, text in texts.items():
+            assert get_text(0, key, language) == text
+            template = TEMPLATES[language][key]
+            if not template.fields:
+                continue
+            kwargs = _arguments(template, rnd)
+            assert get_text(0, key, language, **kwargs) == text.format(**kwargs), (language, key)
+
+
+def _random_template(rnd: random.Random) -> str:
+    parts = []
+    for _ in range(rnd.randrange(8)):
+        kind = rnd.randrange(6)
+        if kind == 0:
+            parts.append("{" + rnd.choice("abc") + "}")
+        elif kind == 1:
+            parts.append("{" + rnd.choice("abc") + rnd.choice([":>6", ":.2f", "!r", ":,"]) + "}")
+        elif kind == 2:
+            parts.append(rnd.choice(["{{", "}}"]))
+        else:
+            parts.append("".join(rnd.choices(string.ascii_letters + " :.%", k=rnd.randrange(6))))
+    return "".join(parts)
+
+
+def test_fuzzed_templates_match_str_format():
+    rnd = random.Random(1)
+    for _ in range(5000):
+        text = _random_template(rnd)
+        template = Template(text)
+        kwargs = {name: rnd.choice([rnd.random() * 1000, rnd.randrange(10**9)]) for name in "abc"}
+        assert template.render("fuzz", kwargs) == text.format(**kwargs), text
+
+
+def test_missing_arguments_keep_placeholders(caplog):
+    template = Template("Hello {name}, you have {count} pets")
+
+    assert template.render("greeting", {"name": "Ann"}) == "Hello Ann, you have {count} pets"
+    assert "['count']" in caplog.text
+
+
+def test_unknown_key_and_language():
+    assert get_text(0, "no_such_key", "en") == "no_such_key"
+    assert get_text(0, "main_menu", "xx") == LOCALES["ru"]["main_menu"]
+
+
+def test_check_locales_reports_every_problem():
+    with pytest.raises(ValueError) as error:
+        check_locales({
+            "ru": {"a": "{x}", "b": "text"},
+            "en": {"a": "{y}", "c": "text"},
+        })
+
+    message = str(error.value)
+    assert "en: missing key 'b'" in message
+    assert "en: unknown key 'c'" in message
+    assert "en: placeholders of 'a' are ['y'], expected ['x']" in message
@@ -0,0 +1,110 @@
+"""
+News feed: version cache around publishing and the localized pager
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+
+from app.database import AsyncSessionLocal, crud
+from app.handlers import other
+from app.locales import get_text
+from app.services import news_feed
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest_asyncio.fixture
+async def feed(db):
+    """Empty feed with nothing cached"""
+    await news_feed._version_cache.invalidate()
+    await news_feed._page_cache.invalidate()
+    yield
+    await news_feed._version_cache.invalidate()
+    await news_feed._page_cache.invalidate()
+
+
+async def test_publish_during_version_load_is_not_overwritten(feed, monkeypatch):
+    load_version = crud.get_news_version
+    started, release = asyncio.Event(), asyncio.Event()
+
+    async def slow_version(session):
+        version = await load_version(session)
+        started.set()
+        await release.wait()
+        return version
+
+    async with AsyncSessionLocal() as reader:
+        # A request reads the version just before news is published
+        monkeypatch.setattr(crud, "get_news_version", slow_version)
+        stale = asyncio.create_task(news_feed.get_news_version(reader))
+        await started.wait()
+        monkeypatch.setattr(crud, "get_news_version", load_version)
+
+        async with AsyncSessionLocal() as writer:
+            await news_feed.publish_news(writer, "Новость")
+        release.set()
+        assert await stale == "0.0"
+
+        # The new version is cached by publish_news, no load needed
+        loads = news_feed._version_cache.stats.loads
+        version = await news_feed.get_news_version(reader)
+        assert version.startswith("1.") and version == await crud.get_news_version(reader)
+        assert news_feed._version_cache.stats.loads == loads
+        text, _ = await news_feed.get_news_page(reader, "ru")
+    assert "Новость" in text
+
+
+async def test_edit_and_unpublish_change_the_version(feed):
+    async with AsyncSessionLocal() as session:
+        first = await news_feed.publish_news(session, "Старая новость")
+        await news_feed.publish_news(session, "Другая новость")
+        versions = [await news_feed.get_news_version(session)]
+        text, _ = await news_feed.get_news_page(session, "ru")
+        assert "Старая новость" in text
+
+        await news_feed.update_news(session, first.id, body_ru="Исправленная новость")
+        versions.append(await news_feed.get_news_version(session))
+        text, _ = await news_feed.get_news_page(session, "ru")
+        assert "Исправленная новость" in text and "Старая новость" not in text
+
+        await news_feed.update_news(session, first.id, is_published=False)
+        versions.append(await news_feed.get_news_version(session))
+        text, _ = await news_feed.get_news_page(session, "ru")
+        assert "Исправленная новость" not in text and "Другая новость" in text
+
+        assert await news_feed.update_news(session, first.id + 100, body_ru="Нет такой") is None
+
+    assert len(set(versions)) == 3
+    assert [version.split(".")[0] for version in versions] == ["2", "2", "1"]
+
+
+@pytest.mark.parametrize("language", ["ru", "en", "uz"])
+async def test_pager_buttons_are_localized(feed, monkeypatch, language):
+    async with AsyncSessionLocal() as session:
+        for i in range(news_feed.NEWS_PAGE_SIZE + 2):
+            await crud.create_news(session, f"news {i}")
+        await session.commit()
+
+    shown = []
+
+    async def safe_edit_message(message, text, reply_markup=None):
+        shown.append([[button.text for button in row] for row in reply_markup.inline_keyboard])
+
+    async def answer(*args, **kwargs):
+        pass
+
+    monkeypatch.setattr(other, "safe_edit_message", safe_edit_message)
+    callback = SimpleNamespace(from_user=SimpleNamespace(id=1), data="menu_news", message=None, answer=answer)
+
+    async with AsyncSessionLocal() as session:
+        await other.news_menu(callback, session, language)
+        next_page = get_text(0, "next_page", language)
+        assert shown[-1] == [[next_page], [get_text(0, "refresh_news", language)], [get_text(0, "back_to_menu", language)]]
+
+        _, cursor = await news_feed.get_news_page(session, language)
+        callback.data = f"news_page:{cursor}"
+        await other.news_menu(callback, session, language)
+        assert shown[-1] == [[get_text(0, "newest_news", language)], [get_text(0, "back_to_menu", language)]]
@@ -0,0 +1,228 @@
+"""
+Tests for the outbound sender: token buckets and a run against a fake Bot API
+"""
+
+import asyncio
+import collections
+import time
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import SendMessage
+
+from app.services.sender import PRIORITY_BULK, PRIORITY_NOTIFICATION, OutboundSender, TokenBucket
+
+
+class FakeTelegram:
+    """
+    sendMessage endpoint enforcing Telegram's flood limits
+
+    Answers 429 with retry_after when more than global_limit messages arrive
+    within one second, when a chat gets two messages closer than
+    chat_interval, or once for each chat in force_flood.
+    """
+
+    def __init__(self, global_limit: int = 30, chat_interval: float = 0.95):
+        self.global_limit = global_limit
+        self.chat_interval = chat_interval
+        self.window = collections.deque()
+        self.last_by_chat = {}
+        self.force_flood = set()
+        self.accepted = []  # (arrival time, chat_id, text)
+        self.rejected = 0
+        self.runner = None
+
+    async def start(self) -> str:
+        """Serve on a free local port; returns the API base URL"""
+        app = web.Application()
+        app.router.add_post("/bot{token}/sendMessage", self.handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, "127.0.0.1", 0).start()
+        host, port = self.runner.addresses[0][:2]
+        return f"http://{host}:{port}"
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+    async def handle(self, request: web.Request) -> web.Response:
+        data = await request.post()
+        chat_id = int(data["chat_id"])
+        now = time.monotonic()
+        while self.window and now - self.window[0] >= 1.0:
+            self.window.popleft()
+
+        flood = chat_id in self.force_flood
+        self.force_flood.discard(chat_id)
+        if (
+            flood
+            or len(self.window) >= self.global_limit
+            or now - self.last_by_chat.get(chat_id, float("-inf")) < self.chat_interval
+        ):
+            self.rejected += 1
+            return web.json_response({
+                "ok": False,
+                "error_code": 429,
+                "description": "Too Many Requests: retry after 1",
+                "parameters": {"retry_after": 1},
+            })
+
+        self.window.append(now)
+        self.last_by_chat[chat_id] = now
+        self.accepted.append((now, chat_id, data["text"]))
+        return web.json_response({"ok": True, "result": {
+            "message_id": len(self.accepted),
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "private"},
+            "text": data["text"],
+        }})
+
+    def peak_per_second(self) -> int:
+        """Most messages accepted within any 1 s window"""
+        times = [at for at, _, _ in self.accepted]
+        peak = start = 0
+        for end in range(len(times)):
+            while times[end] - times[start] >= 1.0:
+                start += 1
+            peak = max(peak, end - start + 1)
+        return peak
+
+
+async def start_fake_bot(telegram: FakeTelegram) -> Bot:
+    base = await telegram.start()
+    return Bot("123456:TEST", session=AiohttpSession(api=TelegramAPIServer.from_base(base)))
+
+
+# ==================== TOKEN BUCKET ====================
+
+
+def test_bucket_refills_at_rate_up_to_capacity():
+    bucket = TokenBucket(rate=10, capacity=2, now=0.0)
+    bucket.consume(0.0)
+    bucket.consume(0.0)
+
+    assert bucket.delay(0.0) == pytest.approx(0.1)
+    assert bucket.delay(0.05) == pytest.approx(0.05)
+    assert bucket.delay(0.1) == 0
+    assert bucket.delay(100.0) == 0
+    assert bucket.tokens == 2
+
+
+def test_bucket_debt_is_paid_before_next_token():
+    bucket = TokenBucket(rate=1, capacity=1, now=0.0)
+    for _ in range(3):
+        bucket.consume(0.0)
+
+    assert bucket.tokens == -2
+    assert bucket.delay(0.0) == pytest.approx(3.0)
+    assert bucket.delay(2.5) == pytest.approx(0.5)
+
+
+def test_bucket_pause_and_idle():
+    bucket = TokenBucket(rate=30, capacity=1, now=0.0)
+    bucket.pause(5, now=1.0)
+
+    assert not bucket.is_idle(3.0)
+    assert bucket.delay(3.0) == pytest.approx(3.0)
+    assert bucket.delay(6.0) == 0
+    assert bucket.is_idle(6.0)
+
+
+def test_bucket_spacing_counts_from_last_send():
+    bucket = TokenBucket(rate=2, capacity=1, now=0.0)
+    assert bucket.spacing(0.0) == 0
+
+    bucket.last_sent = 1.0
+    assert bucket.spacing(1.2) == pytest.approx(0.3)
+    assert bucket.spacing(1.5) == 0
+
+
+# ==================== FAKE BOT API ====================
+
+
+@pytest_asyncio.fixture
+async def telegram():
+    # Arrival times jitter around the send times, so allow a little slack
+    telegram = FakeTelegram(global_limit=52, chat_interval=0.15)
+    bot = await start_fake_bot(telegram)
+    sender = OutboundSender(global_rate=50, chat_rate=5, workers=8, max_retries=2)
+    await sender.start(bot)
+    try:
+        yield telegram, sender, bot
+    finally:
+        await sender.stop(timeout=0)
+        await bot.session.close()
+        await telegram.stop()
+
+
+@pytest.mark.asyncio
+async def test_limits_hold_and_notifications_overtake_bulk(telegram):
+    telegram, sender, bot = telegram
+
+    bulk = [sender.enqueue(SendMessage(chat_id=1000 + i % 20, text=f"bulk{i}"), PRIORITY_BULK) for i in range(120)]
+    await asyncio.sleep(0.5)
+    notes = [sender.enqueue(SendMessage(chat_id=1 + i, text=f"note{i}"), PRIORITY_NOTIFICATION) for i in range(10)]
+    await asyncio.gather(*bulk, *notes)
+
+    texts = [text for _, _, text in telegram.accepted]
+    assert len(texts) == 130
+    assert telegram.rejected == 0
+    assert telegram.peak_per_second() <= 51
+    assert sender.stats.sent_by_priority == {"bulk": 120, "notification": 10}
+
+    # Notifications queued after the bulk went out ahead of most of it
+    last_note = max(i for i, text in enumerate(texts) if text.startswith("note"))
+    assert sum(1 for text in texts[last_note:] if text.startswith("bulk")) > 50
+
+    # Each chat got at most chat_rate messages per second
+    by_chat = collections.defaultdict(list)
+    for at, chat_id, _ in telegram.accepted:
+        by_chat[chat_id].append(at)
+    for sends in by_chat.values():
+        assert all(b - a >= 0.15 for a, b in zip(sends, sends[1:]))
+
+
+@pytest.mark.asyncio
+async def test_flood_wait_is_retried_and_charged(telegram):
+    telegram, sender, bot = telegram
+    telegram.force_flood = {7}
+
+    started = time.monotonic()
+    message = await sender.send_message(7, "hello")
+
+    assert message.text == "hello"
+    assert time.monotonic() - started >= 1.0
+    assert telegram.rejected == 1
+    assert sender.stats.retry_after == 1
+    assert sender.stats.sent == 1
+
+
+@pytest.mark.asyncio
+async def test_retries_are_bounded(telegram):
+    telegram, sender, bot = telegram
+    sender.max_retries = 0
+    telegram.force_flood = {7}
+
+    with pytest.raises(TelegramRetryAfter):
+        await sender.send_message(7, "hello")
+    assert sender.stats.failed == 1
+
+
+@pytest.mark.asyncio
+async def test_interactive_replies_are_charged_not_queued(telegram):
+    telegram, sender, bot = telegram
+    bulk = [sender.enqueue(SendMessage(chat_id=1000 + i, text=f"bulk{i}"), PRIORITY_BULK) for i in range(50)]
+
+    started = time.monotonic()
+    await bot.send_message(9000, "reply")
+    assert time.monotonic() - started < 0.5
+
+    await asyncio.gather(*bulk)
+    assert sender.stats.interactive == 1
+    assert telegram.rejected == 0
+    assert telegram.peak_per_second() <= 51
@@ -0,0 +1,112 @@
+"""
+Tests for keyset pagination cursors and pages
+"""
+
+import random
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app.database import Ad, User, crud
+from app.handlers import other
+from app.handlers.ads import _ads_page_keyboard
+from app.locales import get_text
+from app.utils.pagination import encode_cursor, decode_cursor
+
+
+def test_cursor_round_trip():
+    rnd = random.Random(5)
+    keys = [
+        (datetime(1970, 1, 1), 0),
+        (datetime(1969, 12, 31, 23, 59, 59, 999999), 1),
+        (datetime(2100, 1, 1), 2**32 - 1),
+    ]
+    keys += [
+        (datetime(2020, 1, 1) + timedelta(microseconds=rnd.randrange(10**16)), rnd.randrange(2**32))
+        for _ in range(1000)
+    ]
+
+    for key in keys:
+        cursor = encode_cursor(key)
+        assert len(cursor) == 16
+        assert decode_cursor(cursor) == key
+        # Fits Telegram's 64-byte callback_data with the longest prefix
+        assert len(f"history_page:{cursor}".encode()) <= 64
+
+
+@pytest.mark.parametrize("cursor", ["", "abc", "!!!!!!!!!!!!!!!!", "A" * 40])
+def test_malformed_cursor(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+@pytest.mark.asyncio
+async def test_ads_pages_cover_feed_once(session):
+    user = User(telegram_id=1)
+    session.add(user)
+    await session.flush()
+
+    # Shared timestamps make the id tie-breaker matter
+    started = datetime(2026, 1, 1)
+    session.add_all([
+        Ad(user_id=user.id, title=f"ad {i}", text="t", price="1", contact="c",
+           is_active=i % 7 != 0, created_at=started + timedelta(minutes=i // 3))
+        for i in range(100)
+    ])
+    await session.commit()
+
+    seen, after, pages = [], None, 0
+    while True:
+        ads, after = await crud.get_ads_page(session, limit=5, after=after)
+        seen.extend(ad.id for ad in ads)
+        pages += 1
+        if after is None:
+            break
+        after = decode_cursor(encode_cursor(after))
+
+    expected = await crud.get_all_ads(session, limit=1000)
+    assert len(seen) == len(set(seen)) == 85
+    assert pages == 17
+    assert set(seen) == {ad.id for ad in expected}
+
+
+def test_ads_page_keyboard_is_localized():
+    for language, label in (("ru", "➡️ Далее"), ("en", "➡️ Next"), ("uz", "➡️ Keyingi")):
+        keyboard = _ads_page_keyboard(1, language, "A" * 16)
+        assert keyboard.inline_keyboard[0][0].text == label
+        assert keyboard.inline_keyboard[0][0].callback_data == "ads_page:" + "A" * 16
+        callbacks = [row[0].callback_data for row in keyboard.inline_keyboard[1:]]
+        assert callbacks == ["post_ad", "view_ads", "my_ads", "back_to_menu"]
+
+    assert _ads_page_keyboard(1, "en", None).inline_keyboard[0][0].callback_data == "post_ad"
+
+
+@pytest.mark.asyncio
+@pytest.mark.postgres
+async def test_clear_history_deletes_only_own_entries(session, monkeypatch):
+    users = [User(telegram_id=1), User(telegram_id=2)]
+    session.add_all(users)
+    await session.flush()
+    await crud.add_history_bulk(session, [
+        {"user_id": user.id, "action": f"action {i}"} for user in users for i in range(3)
+    ])
+    await session.commit()
+
+    shown, answers = [], []
+
+    async def safe_edit_message(message, text, reply_markup=None):
+        shown.append(text)
+
+    async def answer(text=None, **kwargs):
+        answers.append(text)
+
+    monkeypatch.setattr(other, "safe_edit_message", safe_edit_message)
+    callback = SimpleNamespace(from_user=SimpleNamespace(id=1), data="clear_history", message=None, answer=answer)
+    await other.clear_history(callback, session, "en")
+    await session.commit()
+
+    assert answers[0] == get_text(1, "history_cleared", "en")
+    assert shown == [get_text(1, "history_empty", "en")]
+    assert await crud.get_user_history(session, users[0].id) == []
+    assert len(await crud.get_user_history(session, users[1].id)) == 3
@@ -0,0 +1,88 @@
+"""
+Tests for monthly partition maintenance
+"""
+
+from datetime import date, datetime
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+
+from app.database import AsyncSessionLocal, User
+from app.database.models import PARTITIONED_TABLES
+from app.services.partition_manager import PartitionManager, _partitions
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.postgres]
+
+
+@pytest_asyncio.fixture
+async def user_id(db):
+    async with AsyncSessionLocal() as session:
+        user = User(telegram_id=1)
+        session.add(user)
+        await session.commit()
+
+    yield user.id
+
+    # Partitions outlive TRUNCATE; drop the ones the tests created
+    async with db.begin() as conn:
+        for table in PARTITIONED_TABLES:
+            for name in await _partitions(conn, table):
+                if name.startswith(f"{table}_203"):
+                    await conn.execute(text(f"DROP TABLE {name}"))
+
+
+async def _insert(db, user_id: int, *created_at: datetime):
+    async with db.begin() as conn:
+        for value in created_at:
+            await conn.execute(
+                text("INSERT INTO history (user_id, action, created_at) VALUES (:user_id, 'a', :created_at)"),
+                {"user_id": user_id, "created_at": value},
+            )
+
+
+async def _count(db, table: str) -> int:
+    async with db.connect() as conn:
+        return (await conn.execute(text(f"SELECT count(*) FROM {table}"))).scalar()
+
+
+async def test_rows_in_default_partition_are_moved(db, user_id):
+    await _insert(db, user_id, datetime(2031, 5, 1), datetime(2031, 5, 31, 23, 59), datetime(2031, 6, 2))
+    assert await _count(db, "history_default") == 3
+
+    manager = PartitionManager(premake_months=1)
+    created = await manager.ensure_partitions("history", date(2031, 5, 1))
+
+    assert created == ["history_2031_05", "history_2031_06"]
+    assert await _count(db, "history_default") == 0
+    assert await _count(db, "history_2031_05") == 2
+    assert await _count(db, "history_2031_06") == 1
+    assert await _count(db, "history") == 3
+
+    # The default partition is attached again and still catches stray rows
+    await _insert(db, user_id, datetime(2032, 1, 1))
+    assert await _count(db, "history_default") == 1
+    assert await manager._check_default("history") == 1
+
+
+async def test_default_rows_of_expired_months_are_dropped(db, user_id):
+    await _insert(db, user_id, datetime(2031, 1, 15), datetime(2031, 1, 16), datetime(2032, 5, 20))
+
+    manager = PartitionManager(premake_months=0, retention_months={"history": 12, "symptoms": 0})
+    await manager.maintain(today=date(2032, 6, 1))
+
+    async with db.connect() as conn:
+        partitions = await _partitions(conn, "history")
+    assert "history_2031_01" not in partitions
+    assert "history_2032_05" in partitions
+    assert await _count(db, "history_default") == 0
+    assert await _count(db, "history") == 1
+
+
+async def test_maintain_is_idempotent(db, user_id):
+    manager = PartitionManager(premake_months=2)
+    first = await manager.ensure_partitions("history", date(2033, 1, 1))
+    second = await manager.ensure_partitions("history", date(2033, 1, 1))
+
+    assert first == ["history_2033_01", "history_2033_02", "history_2033_03"]
+    assert second == []
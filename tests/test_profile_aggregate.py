@@ -0,0 +1,89 @@
+"""
+Tests for the profile aggregate query
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app.database import Pet, Reminder, User, VetProfile, count_queries, crud
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _seed(session, telegram_id: int, pets: int, reminders: int, vet: bool) -> User:
+    user = User(telegram_id=telegram_id, owner_name="Owner", city="Tashkent")
+    session.add(user)
+    await session.flush()
+
+    session.add_all(Pet(owner_id=user.id, name=f"pet {i}", pet_type="cat") for i in range(pets))
+    # Every third reminder is inactive and must not be loaded
+    session.add_all(
+        Reminder(user_id=user.id, text=f"reminder {i}", reminder_type="one_time",
+                 reminder_date=datetime(2026, 1, 1) + timedelta(days=reminders - i),
+                 next_fire_at=datetime(2026, 1, 1) + timedelta(days=reminders - i), is_active=i % 3 != 0)
+        for i in range(reminders)
+    )
+    if vet:
+        session.add(VetProfile(
+            user_id=user.id, vet_name="Vet", vet_phone="1", vet_city="Tashkent", specialization="general",
+            experience_years=3, education="edu", telegram_contact="@vet", consultation_price="100",
+        ))
+    await session.commit()
+    return user
+
+
+@pytest.mark.parametrize("pets, reminders, vet", [(0, 0, False), (3, 12, True), (20, 40, False)])
+async def test_profile_aggregate_takes_two_statements(session, pets, reminders, vet):
+    await _seed(session, 1, pets, reminders, vet)
+    session.expunge_all()
+
+    with count_queries() as counter:
+        profile = await crud.get_profile_aggregate(session, 1)
+
+    assert counter.count == 2
+    assert len(profile.pets) == pets
+    assert (profile.vet_profile is not None) == vet
+    active = [i for i in range(reminders) if i % 3 != 0]
+    expected = [f"reminder {i}" for i in sorted(active, reverse=True)][:crud.PROFILE_REMINDERS_LIMIT]
+    assert [r.text for r in profile.reminders] == expected
+
+
+async def test_missing_user_takes_one_statement(session):
+    with count_queries() as counter:
+        assert await crud.get_profile_aggregate(session, 404) is None
+
+    assert counter.count == 1
+
+
+async def test_heavy_user_loads_only_shown_reminders(db, session):
+    user = await _seed(session, 1, 0, 0, False)
+    session.add_all(
+        Reminder(user_id=user.id, text=f"daily {i}", reminder_type="daily", reminder_time="09:00",
+                 next_fire_at=datetime(2026, 1, 1, 9) + timedelta(minutes=i))
+        for i in range(1000)
+    )
+    session.add(Reminder(user_id=user.id, text="unscheduled", reminder_type="daily", next_fire_at=None))
+    session.add(Reminder(user_id=user.id, text="soonest", reminder_type="one_time",
+                         next_fire_at=datetime(2025, 12, 31)))
+    await session.commit()
+    session.expunge_all()
+
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.sync_engine, "before_cursor_execute", capture)
+    try:
+        profile = await crud.get_profile_aggregate(session, 1, reminders_limit=3)
+    finally:
+        event.remove(db.sync_engine, "before_cursor_execute", capture)
+
+    assert [r.text for r in profile.reminders] == ["soonest", "daily 0", "daily 1"]
+    assert "LIMIT" in statements[-1]
+    assert "FROM reminders" in statements[-1]
+
+    profile = await crud.get_profile_aggregate(session, 1, reminders_limit=1003)
+    assert profile.reminders[-1].text == "unscheduled"
@@ -0,0 +1,136 @@
+"""
+EXPLAIN checks that the crud query shapes are served by their indexes
+
+Every statement a crud function issues is captured and explained on a
+seeded, analyzed dataset; the plan must read the table through the
+expected index instead of scanning it.
+"""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event, text
+
+from app.database import crud
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.postgres]
+
+USERS = 10000
+CITIES = 500
+
+SEED = [
+    f"""INSERT INTO users (telegram_id, language, is_active, created_at, updated_at)
+        SELECT g, 'ru', true, now(), now() FROM generate_series(1, {USERS}) g""",
+    f"""INSERT INTO pets (owner_id, name, pet_type, created_at, updated_at)
+        SELECT g % {USERS} + 1, 'pet', 'dog', now(), now() FROM generate_series(1, 50000) g""",
+    f"""INSERT INTO reminders (user_id, text, reminder_type, is_active, created_at)
+        SELECT g % {USERS} + 1, 'feed', 'daily', g % 4 <> 0, now() FROM generate_series(1, 50000) g""",
+    f"""INSERT INTO ads (user_id, title, text, price, contact, is_active, created_at)
+        SELECT g % {USERS} + 1, 'ad', 'text', '1', '@c', g % 10 <> 0, now() - g * interval '1 minute'
+        FROM generate_series(1, 50000) g""",
+    f"""INSERT INTO history (user_id, action, action_type, created_at)
+        SELECT g % {USERS} + 1, 'action', 'test', now() - (g % 50) * interval '1 hour'
+        FROM generate_series(1, 200000) g""",
+    f"""INSERT INTO vet_profiles (user_id, vet_name, vet_phone, vet_city, specialization, experience_years,
+                                  education, telegram_contact, consultation_price, is_active, created_at, updated_at)
+        SELECT g, 'vet', '1', 'city' || g % {CITIES}, 'general', 1, 'edu', '@v', '1', g % 2 = 0, now(), now()
+        FROM generate_series(1, {USERS}) g""",
+    f"""INSERT INTO clinics (name, city, address, phone, working_hours, clinic_type, is_active, created_at)
+        SELECT 'clinic ' || g, 'city' || g % {CITIES}, 'street ' || g, '1', '9-18',
+               (ARRAY['clinic', 'pharmacy', 'shelter'])[g % 3 + 1], g % 5 <> 0, now()
+        FROM generate_series(1, 50000) g""",
+]
+
+INDEX_SCANS = ("Index Scan", "Index Only Scan", "Bitmap Index Scan")
+
+QUERIES = [
+    ("get_user_pets", lambda s: crud.get_user_pets(s, 42), "pets", "ix_pets_owner_id"),
+    ("get_user_reminders", lambda s: crud.get_user_reminders(s, 42), "reminders", "ix_reminders_user_id_is_active"),
+    ("get_user_ads", lambda s: crud.get_user_ads(s, 42), "ads", "ix_ads_user_id_is_active"),
+    ("get_all_ads", lambda s: crud.get_all_ads(s, limit=20), "ads", "ix_ads_active_created_at_id"),
+    ("get_ads_page", lambda s: crud.get_ads_page(s, limit=5), "ads", "ix_ads_active_created_at_id"),
+    (
+        "get_ads_page deep",
+        lambda s: crud.get_ads_page(s, limit=5, after=(datetime(2000, 1, 1), 10**9)),
+        "ads",
+        "ix_ads_active_created_at_id",
+    ),
+    ("get_user_history", lambda s: crud.get_user_history(s, 42), "history", "user_id_created_at_id"),
+    ("get_user_history_page", lambda s: crud.get_user_history_page(s, 42), "history", "user_id_created_at_id"),
+    ("get_active_vets", lambda s: crud.get_active_vets(s, "city7"), "vet_profiles", "ix_vet_profiles_active_city"),
+    ("get_clinics_by_city", lambda s: crud.get_clinics_by_city(s, "city7"), "clinics", "ix_clinics_active_city_type"),
+    (
+        "get_clinics_by_city with type",
+        lambda s: crud.get_clinics_by_city(s, "city7", "pharmacy"),
+        "clinics",
+        "ix_clinics_active_city_type",
+    ),
+]
+
+
+def _plan_nodes(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+def _index_name(node: dict) -> str:
+    """Index a scan node reads, looking through bitmap heap scans"""
+    if node["Node Type"] == "Bitmap Heap Scan":
+        return " ".join(_index_name(child) for child in node["Plans"])
+    if node["Node Type"] in ("BitmapAnd", "BitmapOr"):
+        return " ".join(_index_name(child) for child in node["Plans"])
+    if node["Node Type"] in INDEX_SCANS:
+        return node["Index Name"]
+    return ""
+
+
+async def _explain(engine, session, query) -> list:
+    """Run a crud query and return the plans of the statements it issued"""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        await query(session)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+    plans = []
+    async with engine.connect() as conn:
+        for statement, parameters in statements:
+            result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+            plans.append(result.scalar()[0]["Plan"])
+    return plans
+
+
+async def test_crud_queries_use_indexes(db, session):
+    # Seeded once for all query shapes
+    async with db.begin() as conn:
+        for statement in SEED:
+            await conn.execute(text(statement))
+    async with db.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("ANALYZE"))
+        # Empty history partitions of future months are rightly scanned
+        result = await conn.execute(text("SELECT relname FROM pg_class WHERE relkind = 'r' AND reltuples > 0"))
+        populated = set(result.scalars())
+
+    problems = []
+    for name, query, table, index in QUERIES:
+        plans = await _explain(db, session, query)
+        nodes = [
+            node
+            for plan in plans
+            for node in _plan_nodes(plan)
+            if node.get("Relation Name", "").startswith(table) and node["Relation Name"] in populated
+        ]
+        if len(plans) != 1 or not nodes:
+            problems.append(f"{name}: {len(plans)} statements, {len(nodes)} {table} scans")
+        for node in nodes:
+            if index not in _index_name(node):
+                problems.append(f"{name}: {node['Node Type']} {_index_name(node)} on {node['Relation Name']}")
+
+    assert not problems, "\n".join(problems)
@@ -0,0 +1,113 @@
+"""
+Tests for the recurrence rules: vectorized results equal the scalar ones
+"""
+
+import json
+import random
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from zoneinfo import ZoneInfo
+
+import pytest
+from sqlalchemy import insert, select
+
+from app.database import AsyncSessionLocal
+from app.database.models import Reminder, User
+from app.services import recurrence
+
+BASE = datetime(2026, 3, 20)
+
+
+def random_reminders(rnd: random.Random, count: int) -> list:
+    """(reminder, after) pairs of every type, with times around DST changes"""
+    rows = []
+    for _ in range(count):
+        reminder_type = rnd.choice(["one_time", "daily", "weekly", "custom"])
+        days = None
+        if reminder_type == "weekly":
+            days = json.dumps(rnd.sample(range(7), rnd.randint(0, 3)))
+        elif reminder_type == "custom":
+            days = json.dumps([
+                (BASE + timedelta(days=rnd.randint(0, 60))).date().isoformat() for _ in range(rnd.randint(0, 4))
+            ])
+        reminder = SimpleNamespace(
+            reminder_type=reminder_type,
+            reminder_date=BASE + timedelta(days=rnd.randint(0, 40), minutes=rnd.randint(0, 1439))
+            if reminder_type == "one_time" else None,
+            reminder_time=rnd.choice([None, "00:30", "02:30", "03:00", "09:00", "23:59", "01:15"]),
+            reminder_days=days,
+        )
+        rows.append((reminder, BASE + timedelta(days=rnd.randint(0, 40), seconds=rnd.randint(0, 86400))))
+    return rows
+
+
+@pytest.mark.parametrize("timezone", ["Asia/Tashkent", "Europe/Berlin", "America/New_York", "Australia/Lord_Howe"])
+def test_bulk_matches_scalar(timezone):
+    tz = ZoneInfo(timezone)
+    rows = random_reminders(random.Random(18), 5000)
+
+    bulk = recurrence.next_fire_times(
+        [r.reminder_type for r, _ in rows],
+        [r.reminder_date for r, _ in rows],
+        [r.reminder_time for r, _ in rows],
+        [r.reminder_days for r, _ in rows],
+        [after for _, after in rows],
+        tz,
+    ).tolist()
+
+    mismatches = [
+        (reminder, after, expected, actual)
+        for (reminder, after), actual in zip(rows, bulk)
+        if (expected := recurrence.next_fire_time(reminder, after, tz)) != actual
+    ]
+    assert not mismatches[:5]
+
+
+def test_daily_across_dst_gap():
+    tz = ZoneInfo("Europe/Berlin")
+    reminder = SimpleNamespace(reminder_type="daily", reminder_date=None, reminder_time="02:30", reminder_days=None)
+
+    # 02:30 does not exist in Berlin on 2026-03-29 and fires at 03:30 CEST
+    fire_at = recurrence.next_fire_time(reminder, datetime(2026, 3, 28, 12), tz)
+    assert fire_at == datetime(2026, 3, 29, 1, 30)
+    assert recurrence.next_fire_time(reminder, fire_at, tz) == datetime(2026, 3, 30, 0, 30)
+
+
+def test_finished_reminders_have_no_fire_time():
+    tz = ZoneInfo("Asia/Tashkent")
+    one_time = SimpleNamespace(reminder_type="one_time", reminder_date=BASE, reminder_time="09:00", reminder_days=None)
+    custom = SimpleNamespace(reminder_type="custom", reminder_date=None, reminder_time="09:00",
+                             reminder_days=json.dumps(["2026-03-01"]))
+
+    assert recurrence.next_fire_time(one_time, BASE + timedelta(days=1), tz) is None
+    assert recurrence.next_fire_time(custom, BASE, tz) is None
+
+
+@pytest.mark.asyncio
+async def test_recompute_leaves_live_leases_alone(db):
+    now = datetime.utcnow()
+    leases = [
+        (None, None),
+        ("live-worker", now + timedelta(minutes=1)),
+        ("dead-worker", now - timedelta(minutes=1)),
+    ]
+    async with AsyncSessionLocal() as session:
+        await session.execute(insert(User), [{"telegram_id": 1, "language": "ru"}])
+        await session.execute(insert(Reminder), [
+            {"user_id": 1, "text": "feed", "reminder_type": "daily", "reminder_time": "09:00",
+             "created_at": now - timedelta(days=1), "next_fire_at": now - timedelta(hours=1),
+             "lease_owner": owner, "lease_expires_at": expires}
+            for owner, expires in leases
+        ])
+        await session.commit()
+
+    await recurrence.recompute_next_fire_times(timezone="Asia/Tashkent")
+
+    async with AsyncSessionLocal() as session:
+        rows = (await session.execute(
+            select(Reminder.next_fire_at, Reminder.lease_owner).order_by(Reminder.id)
+        )).all()
+    # The live lease is kept and its row left to the worker delivering it
+    assert rows[1] == (now - timedelta(hours=1), "live-worker")
+    assert [owner for _, owner in rows] == [None, "live-worker", None]
+    assert rows[0][0] == rows[2][0] != now - timedelta(hours=1)
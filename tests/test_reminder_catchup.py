@@ -0,0 +1,107 @@
+"""
+Catch-up after downtime: missed reminders are spread out and sent once
+"""
+
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert, select
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.database.models import Reminder, User
+from app.locales import get_text
+from app.services.reminder_scheduler import ReminderScheduler
+
+pytestmark = pytest.mark.asyncio
+
+NOW = datetime(2026, 3, 10, 12, 0)
+
+
+async def seed(rows: list) -> list:
+    """Reminders of user 1 (created if missing) with the given columns; returns their IDs in order"""
+    async with AsyncSessionLocal() as session:
+        if await session.get(User, 1) is None:
+            await session.execute(insert(User), [{"telegram_id": 1, "language": "ru"}])
+        reminders = [
+            Reminder(user_id=1, text="r", reminder_type="daily", reminder_time="09:00",
+                     created_at=NOW - timedelta(days=30), **row)
+            for row in rows
+        ]
+        session.add_all(reminders)
+        await session.commit()
+        return [reminder.id for reminder in reminders]
+
+
+async def fire_times(ids: list) -> list:
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(select(Reminder.id, Reminder.next_fire_at).where(Reminder.id.in_(ids)))
+        fire_at = dict(result.all())
+    return [fire_at[reminder_id] for reminder_id in ids]
+
+
+async def test_overdue_reminders_spread_oldest_first(db):
+    # Missed during a 6 h outage, listed newest first
+    overdue = await seed([{"next_fire_at": NOW - timedelta(hours=1, minutes=i)} for i in range(10)])
+    untouched_rows = [
+        {"next_fire_at": NOW - timedelta(seconds=30)},  # within the grace period
+        {"next_fire_at": NOW + timedelta(hours=1)},
+        {"next_fire_at": NOW - timedelta(hours=6), "lease_owner": "other", "lease_expires_at": NOW + timedelta(minutes=1)},
+        {"next_fire_at": NOW - timedelta(hours=6), "is_active": False},
+    ]
+    untouched = await seed(untouched_rows)
+    scheduler = ReminderScheduler(mode="heap", catchup_grace=60, catchup_window=600)
+
+    assert await scheduler.catch_up(NOW) == 10
+
+    assert await fire_times(overdue[::-1]) == [NOW + timedelta(seconds=60 * i) for i in range(10)]
+    assert await fire_times(untouched) == [row["next_fire_at"] for row in untouched_rows]
+    assert await scheduler.catch_up(NOW) == 0
+
+
+async def test_window_stretches_to_the_outbound_rate(db):
+    count = 1200
+    ids = await seed([{"next_fire_at": NOW - timedelta(hours=6, seconds=i)} for i in range(count)])
+    scheduler = ReminderScheduler(mode="heap", catchup_grace=60, catchup_window=10)
+
+    assert await scheduler.catch_up(NOW) == count
+
+    times = await fire_times(ids)
+    assert min(times) == NOW
+    span = (max(times) - NOW).total_seconds()
+    assert span == pytest.approx(count / settings.OUTBOUND_GLOBAL_RATE, abs=1)
+    per_second = Counter(fire_at.replace(microsecond=0) for fire_at in times)
+    assert max(per_second.values()) <= settings.OUTBOUND_GLOBAL_RATE
+
+
+async def test_one_message_mentions_missed_occurrences():
+    scheduler = ReminderScheduler(timezone="Asia/Tashkent")
+    # 09:00 in Tashkent is 04:00 UTC; 03-08, 03-09 and 03-10 were missed
+    reminder = Reminder(text="Give <pill>", reminder_type="daily", reminder_time="09:00",
+                        last_sent=datetime(2026, 3, 7, 4, 0), created_at=NOW - timedelta(days=30))
+    on_time = Reminder(text="Walk", reminder_type="daily", reminder_time="16:00",
+                       last_sent=datetime(2026, 3, 9, 11, 0), created_at=NOW - timedelta(days=30))
+
+    text = scheduler.reminder_text([reminder], NOW)
+    assert text.endswith("Пропущено, пока бот был недоступен: 3</i>\n\nGive &lt;pill&gt;")
+    assert "Пропущено" not in scheduler.reminder_text([on_time], NOW)
+
+    digest = scheduler.reminder_text([reminder, on_time], NOW)
+    assert digest.count("Пропущено") == 1
+
+
+@pytest.mark.parametrize("language", ["ru", "en", "uz"])
+async def test_reminder_text_is_localized(language):
+    scheduler = ReminderScheduler(timezone="Asia/Tashkent")
+    reminder = Reminder(text="Give pill", reminder_type="daily", reminder_time="09:00",
+                        last_sent=datetime(2026, 3, 7, 4, 0), created_at=NOW - timedelta(days=30))
+    on_time = Reminder(text="Walk", reminder_type="daily", reminder_time="16:00",
+                       last_sent=datetime(2026, 3, 9, 11, 0), created_at=NOW - timedelta(days=30))
+
+    text = scheduler.reminder_text([reminder], NOW, language)
+    assert text.startswith(get_text(0, "reminder_title", language))
+    assert get_text(0, "reminder_missed", language, count=3) in text
+
+    digest = scheduler.reminder_text([reminder, on_time], NOW, language)
+    assert digest.startswith(get_text(0, "reminder_digest_title", language, count=2))
@@ -0,0 +1,197 @@
+"""
+Tests for the reminder scheduler heap
+"""
+
+import asyncio
+import random
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert, select
+
+from app.database import AsyncSessionLocal, crud
+from app.database.models import Reminder, User
+from app.locales import get_text
+from app.services.reminder_scheduler import ReminderScheduler
+from app.services.sender import outbound_sender
+
+NOW = datetime(2026, 3, 1, 12, 0)
+
+
+def _scheduler() -> ReminderScheduler:
+    return ReminderScheduler(mode="heap")
+
+
+def test_pop_due_in_fire_time_order():
+    scheduler = _scheduler()
+    rnd = random.Random(17)
+    fire_times = {i: NOW + timedelta(seconds=rnd.randrange(-3600, 3600)) for i in range(1000)}
+    for reminder_id, fire_at in fire_times.items():
+        scheduler.add(reminder_id, fire_at)
+
+    due = scheduler.pop_due(NOW, limit=10**6)
+
+    expected = sorted((at, i) for i, at in fire_times.items() if at <= NOW)
+    assert due == [i for _, i in expected]
+    assert scheduler.next_due() == min(at for at in fire_times.values() if at > NOW)
+    assert len(scheduler.scheduled) == 1000 - len(due)
+
+
+def test_cancel_and_reschedule_drop_stale_entries():
+    scheduler = _scheduler()
+    for i in range(5):
+        scheduler.add(i, NOW - timedelta(minutes=5 - i))
+
+    scheduler.cancel(0)
+    scheduler.add(1, NOW + timedelta(hours=1))
+    scheduler.add(2, None)
+    scheduler.add(3, NOW - timedelta(hours=1))
+
+    assert scheduler.pop_due(NOW) == [3, 4]
+    assert scheduler.next_due() == NOW + timedelta(hours=1)
+    # Only the live entry is left once stale ones reached the top
+    assert scheduler.heap == [(NOW + timedelta(hours=1), 1)]
+
+
+def test_pop_due_respects_limit():
+    scheduler = _scheduler()
+    for i in range(10):
+        scheduler.add(i, NOW - timedelta(seconds=10 - i))
+
+    assert scheduler.pop_due(NOW, limit=4) == [0, 1, 2, 3]
+    assert scheduler.pop_due(NOW, limit=4) == [4, 5, 6, 7]
+    assert scheduler.pop_due(NOW, limit=4) == [8, 9]
+    assert scheduler.next_due() is None
+
+
+@pytest.mark.asyncio
+async def test_earlier_reminder_wakes_the_loop():
+    scheduler = _scheduler()
+    scheduler.add(1, NOW + timedelta(hours=1))
+    scheduler._wakeup.clear()
+
+    scheduler.add(2, NOW + timedelta(hours=2))
+    assert not scheduler._wakeup.is_set()
+
+    scheduler.add(3, NOW + timedelta(minutes=1))
+    await asyncio.wait_for(scheduler._wakeup.wait(), timeout=1)
+
+
+async def _seed_due(*fire_times: datetime, language: str = "ru") -> list:
+    """One-time reminders of one user firing at the given times; returns their IDs"""
+    async with AsyncSessionLocal() as session:
+        await session.execute(insert(User), [{"telegram_id": 1, "language": language}])
+        reminders = [
+            Reminder(user_id=1, text=f"r{i}", reminder_type="one_time", reminder_date=fire_at,
+                     next_fire_at=fire_at, created_at=fire_at - timedelta(days=1))
+            for i, fire_at in enumerate(fire_times)
+        ]
+        session.add_all(reminders)
+        await session.commit()
+        return [reminder.id for reminder in reminders]
+
+
+async def _stored(reminder_id: int) -> tuple:
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(Reminder.is_active, Reminder.last_sent, Reminder.next_fire_at).where(Reminder.id == reminder_id)
+        )
+        return tuple(result.one())
+
+
+@pytest.mark.asyncio
+async def test_failed_send_keeps_reminder_active_and_due(db, monkeypatch):
+    due_at = datetime.utcnow() - timedelta(seconds=1)
+    [reminder_id] = await _seed_due(due_at)
+    scheduler = ReminderScheduler(mode="heap", retry_delay=0)
+    scheduler.add(reminder_id, due_at)
+    sent = []
+
+    async def fail(chat_id, text, **kwargs):
+        raise RuntimeError("Telegram is down")
+
+    async def send_message(chat_id, text, **kwargs):
+        sent.append(chat_id)
+
+    monkeypatch.setattr(outbound_sender, "send_message", fail)
+    await scheduler._process_reminders()
+
+    is_active, last_sent, next_fire_at = await _stored(reminder_id)
+    assert is_active and last_sent is None
+    assert due_at < next_fire_at <= datetime.utcnow()
+    assert scheduler.scheduled == {reminder_id: next_fire_at}
+    assert scheduler.stats.failed == 1
+
+    monkeypatch.setattr(outbound_sender, "send_message", send_message)
+    await scheduler._process_reminders()
+
+    is_active, last_sent, next_fire_at = await _stored(reminder_id)
+    assert sent == [1]
+    assert not is_active and last_sent is not None and next_fire_at is None
+    assert scheduler.scheduled == {}
+
+
+@pytest.mark.asyncio
+async def test_failed_send_is_retried_after_the_delay(db, monkeypatch):
+    now = datetime.utcnow()
+    ids = await _seed_due(now - timedelta(seconds=1), now + timedelta(minutes=5))
+    scheduler = ReminderScheduler(mode="heap", retry_delay=120, digest_window=600)
+    scheduler.add(ids[0], now - timedelta(seconds=1))
+    scheduler.add(ids[1], now + timedelta(minutes=5))
+
+    async def fail(chat_id, text, **kwargs):
+        raise RuntimeError("Telegram is down")
+
+    monkeypatch.setattr(outbound_sender, "send_message", fail)
+    await scheduler._process_reminders()
+
+    # The digest item due later than the retry keeps its own fire time
+    retry_at, later = [(await _stored(reminder_id))[2] for reminder_id in ids]
+    assert (retry_at - now).total_seconds() == pytest.approx(120, abs=5)
+    assert later == now + timedelta(minutes=5)
+    assert scheduler.scheduled == {ids[0]: retry_at, ids[1]: later}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("failing", ["get_due_reminders", "mark_reminders_sent"])
+async def test_database_error_puts_popped_reminders_back(db, monkeypatch, failing):
+    now = datetime.utcnow()
+    fire_times = [now - timedelta(seconds=2), now - timedelta(seconds=1), now + timedelta(seconds=30)]
+    ids = await _seed_due(*fire_times)
+    scheduler = ReminderScheduler(mode="heap", digest_window=60)
+    for reminder_id, fire_at in zip(ids, fire_times):
+        scheduler.add(reminder_id, fire_at)
+
+    async def broken(*args, **kwargs):
+        raise ConnectionError("database went away")
+
+    async def send_message(chat_id, text, **kwargs):
+        pass
+
+    monkeypatch.setattr(outbound_sender, "send_message", send_message)
+    monkeypatch.setattr(crud, failing, broken)
+    with pytest.raises(ConnectionError):
+        await scheduler._process_reminders()
+
+    assert scheduler.scheduled == dict(zip(ids, fire_times))
+    assert scheduler.pop_due(now) == ids[:2]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("language", ["en", "uz"])
+async def test_reminders_sent_in_user_language(db, monkeypatch, language):
+    now = datetime.utcnow()
+    ids = await _seed_due(now - timedelta(seconds=1), language=language)
+    scheduler = ReminderScheduler(mode="heap")
+    scheduler.add(ids[0], now - timedelta(seconds=1))
+    sent = []
+
+    async def send_message(chat_id, text, reply_markup=None, **kwargs):
+        sent.append((text, [[button.text for button in row] for row in reply_markup.inline_keyboard]))
+
+    monkeypatch.setattr(outbound_sender, "send_message", send_message)
+    await scheduler._process_reminders()
+
+    [(text, buttons)] = sent
+    assert text.startswith(get_text(0, "reminder_title", language))
+    assert buttons == [["✅ " + get_text(0, "reminder_done", language), "🔕"]]
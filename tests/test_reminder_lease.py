@@ -0,0 +1,190 @@
+"""
+Lease-mode reminder dispatch: concurrent workers deliver every reminder once
+"""
+
+import asyncio
+import importlib
+import re
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+
+from app.database import AsyncSessionLocal, crud
+from app.services.reminder_scheduler import ReminderScheduler
+from app.services.sender import outbound_sender
+
+# app.services re-exports the scheduler instance under the module's name
+scheduler_module = importlib.import_module("app.services.reminder_scheduler")
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.postgres]
+
+USERS = 200
+
+
+async def seed_due_reminders(count: int, due_at: datetime):
+    """Active one-time reminders "r<n>" (numbered on from earlier calls) due at due_at, spread over USERS users"""
+    async with AsyncSessionLocal() as session:
+        await session.execute(text(
+            "INSERT INTO users (telegram_id, language, is_active, created_at, updated_at) "
+            f"SELECT g, 'ru', true, now(), now() FROM generate_series(1, {USERS}) g ON CONFLICT DO NOTHING"
+        ))
+        first = await session.scalar(text("SELECT coalesce(max(id), 0) + 1 FROM reminders"))
+        await session.execute(text(
+            "INSERT INTO reminders (user_id, text, reminder_type, reminder_date, is_active, created_at, next_fire_at) "
+            f"SELECT 1 + g % {USERS}, 'r' || g, 'one_time', :due, true, :created, :due "
+            "FROM generate_series(CAST(:first AS integer), CAST(:last AS integer)) g"
+        ), {"first": first, "last": first + count - 1, "due": due_at, "created": due_at - timedelta(days=1)})
+        await session.commit()
+
+
+async def reminder_state() -> tuple:
+    """Active and leased reminder counts"""
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(text(
+            "SELECT count(*) FILTER (WHERE is_active), count(*) FILTER (WHERE lease_owner IS NOT NULL) FROM reminders"
+        ))
+        return tuple(result.one())
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    """Texts of the reminders passed to the outbound sender (digests hold several)"""
+    sent = []
+
+    async def send_message(chat_id, text, priority=None, **kwargs):
+        await asyncio.sleep(0.001)
+        sent.extend(re.findall(r"\br\d+\b", text))
+
+    monkeypatch.setattr(outbound_sender, "send_message", send_message)
+    monkeypatch.setattr(scheduler_module, "DISPATCH_BATCH_SIZE", 50)
+    return sent
+
+
+async def run_workers(count: int, digest_window: float = 0) -> list:
+    """Run lease-mode schedulers until nothing is left to claim; claimed counts per worker"""
+    workers = [ReminderScheduler(mode="lease", digest_window=digest_window) for _ in range(count)]
+
+    async def drain(worker: ReminderScheduler) -> int:
+        total = 0
+        while claimed := await worker._process_claimed():
+            total += claimed
+        return total
+
+    return await asyncio.gather(*(drain(worker) for worker in workers))
+
+
+async def test_concurrent_workers_deliver_each_reminder_once(db, sent):
+    await seed_due_reminders(2000, datetime.utcnow() - timedelta(seconds=1))
+
+    claimed = await run_workers(4)
+
+    assert sum(claimed) == 2000
+    assert sum(1 for count in claimed if count) > 1
+    assert len(sent) == 2000
+    assert not [item for item, count in Counter(sent).items() if count > 1]
+    assert await reminder_state() == (0, 0)
+
+
+async def test_concurrent_digest_claims_do_not_deadlock(db, sent):
+    # Every user has due reminders and more coming up within the digest window
+    now = datetime.utcnow()
+    await seed_due_reminders(1000, now - timedelta(seconds=1))
+    await seed_due_reminders(1000, now + timedelta(seconds=30))
+
+    claimed = await run_workers(4, digest_window=60)
+
+    assert sum(claimed) == 2000
+    assert sum(1 for count in claimed if count) > 1
+    assert len(sent) == 2000
+    assert not [item for item, count in Counter(sent).items() if count > 1]
+    assert await reminder_state() == (0, 0)
+
+
+async def test_digest_claim_skips_rows_locked_by_another_claim(db):
+    now = datetime.utcnow()
+    await seed_due_reminders(USERS, now - timedelta(seconds=1))
+    await seed_due_reminders(USERS, now + timedelta(seconds=30))
+
+    async with AsyncSessionLocal() as other, AsyncSessionLocal() as session:
+        # Another worker's claim holds a row in this batch's digest window
+        await other.execute(text("SELECT id FROM reminders WHERE text = :text FOR UPDATE"), {"text": f"r{USERS + 1}"})
+
+        await session.execute(text("SET LOCAL lock_timeout = '2s'"))
+        rows = await crud.claim_due_reminders(
+            session, "worker", now, now + timedelta(minutes=1), USERS, digest_until=now + timedelta(minutes=1)
+        )
+        await session.commit()
+        await other.rollback()
+
+    assert len(rows) == 2 * USERS - 1
+    assert USERS + 1 not in {row.id for row in rows}
+
+
+async def test_failed_send_releases_lease_and_keeps_reminder(db, monkeypatch):
+    now = datetime.utcnow()
+    await seed_due_reminders(100, now - timedelta(seconds=1))
+
+    async def send_message(chat_id, text, priority=None, **kwargs):
+        if chat_id % 2:
+            raise RuntimeError("Telegram is down")
+
+    monkeypatch.setattr(outbound_sender, "send_message", send_message)
+    worker = ReminderScheduler(mode="lease", digest_window=0, retry_delay=300)
+    assert await worker._process_claimed() == 100
+
+    async with AsyncSessionLocal() as session:
+        failed = (await session.execute(text(
+            "SELECT count(*), min(next_fire_at), max(next_fire_at) FROM reminders "
+            "WHERE is_active AND last_sent IS NULL AND lease_owner IS NULL"
+        ))).one()
+    assert failed[0] == 50
+    assert failed[1] == failed[2] and failed[1] > now + timedelta(seconds=290)
+    assert await reminder_state() == (50, 0)
+    # Not due again before the retry delay
+    assert await worker._process_claimed() == 0
+
+
+async def test_expired_lease_is_claimed_again(db, sent):
+    now = datetime.utcnow()
+    await seed_due_reminders(500, now - timedelta(seconds=1))
+
+    # A worker claimed a batch and died; its lease has run out
+    async with AsyncSessionLocal() as session:
+        dead = await crud.claim_due_reminders(session, "dead-worker", now, now - timedelta(milliseconds=1), 300)
+        await session.commit()
+    assert len(dead) == 300
+
+    claimed = await run_workers(3)
+
+    assert sum(claimed) == 500
+    assert sorted(sent) == sorted(f"r{i}" for i in range(1, 501))
+    assert await reminder_state() == (0, 0)
+
+
+async def test_live_lease_is_skipped_and_stale_completion_ignored(db, sent):
+    now = datetime.utcnow()
+    await seed_due_reminders(10, now - timedelta(seconds=1))
+
+    async with AsyncSessionLocal() as session:
+        held = await crud.claim_due_reminders(session, "slow-worker", now, now + timedelta(minutes=5), 4)
+        await session.commit()
+
+    claimed = await run_workers(2)
+    assert sum(claimed) == 6
+    assert await reminder_state() == (4, 4)
+
+    # The slow worker lost its lease to another worker before completing
+    async with AsyncSessionLocal() as session:
+        stolen = await crud.claim_due_reminders(
+            session, "other-worker", now + timedelta(minutes=6), now + timedelta(minutes=10), 10
+        )
+        await session.commit()
+        assert sorted(row.id for row in stolen) == sorted(row.id for row in held)
+
+        await crud.mark_reminders_sent(
+            session, [row.id for row in held], now, {row.id: None for row in held}, lease_owner="slow-worker"
+        )
+        await session.commit()
+    assert await reminder_state() == (4, 4)
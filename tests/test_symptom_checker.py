@@ -0,0 +1,71 @@
+"""
+Tests for the symptom keyword matcher and the advice built from its matches
+"""
+
+import random
+
+from app.services import symptom_checker
+from app.services.symptom_checker import (
+    EMERGENCY,
+    GENERAL_ADVICE,
+    SYMPTOM_CATEGORIES,
+    KeywordMatcher,
+    analyze_symptoms,
+    is_emergency,
+    match_symptoms,
+)
+
+ALL_KEYWORDS = [
+    (keyword, category) for category, (keywords, _) in SYMPTOM_CATEGORIES.items() for keyword in keywords
+] + [(keyword, EMERGENCY) for keyword in symptom_checker.EMERGENCY_SYMPTOMS]
+
+
+def naive_find(keywords: list, text: str) -> frozenset:
+    """What the matcher replaces: one `in` test per keyword"""
+    text = text.lower()
+    return frozenset(label for keyword, label in keywords if keyword.lower() in text)
+
+
+def test_fuzzed_keywords_match_substring_test():
+    rnd = random.Random(25)
+    # A small alphabet makes keywords share prefixes and suffixes, exercising fail links
+    alphabet = "abаб Aİ"
+    for _ in range(3000):
+        keywords = [
+            ("".join(rnd.choices(alphabet, k=rnd.randint(1, 5))), f"l{rnd.randrange(4)}")
+            for _ in range(rnd.randint(1, 10))
+        ]
+        matcher = KeywordMatcher(keywords)
+        for _ in range(5):
+            text = "".join(rnd.choices(alphabet, k=rnd.randrange(60)))
+            assert matcher.find(text) == naive_find(keywords, text), (keywords, text)
+
+
+def test_bot_vocabulary_matches_substring_test():
+    rnd = random.Random(7)
+    words = [keyword for keyword, _ in ALL_KEYWORDS] + ["собака", "вялая", "Dog", "НЕ", "ест", "дыш"]
+    for _ in range(2000):
+        text = rnd.choice([" ", ", ", ""]).join(rnd.choices(words, k=rnd.randrange(8)))
+        text = "".join(char.upper() if rnd.random() < 0.1 else char for char in text)
+        assert match_symptoms(text) == naive_find(ALL_KEYWORDS, text), text
+
+
+def test_overlapping_keywords_all_reported():
+    assert match_symptoms("Собака НЕ ДЫШИТ") == {EMERGENCY, "respiratory"}
+    assert match_symptoms("кот не ест, рвота") == {"appetite", "digestive"}
+    assert match_symptoms("всё хорошо") == frozenset()
+
+
+def test_advice_has_a_block_per_category_in_table_order():
+    text = "хромает, рвота и не дышит"
+    matches = match_symptoms(text)
+
+    advice = analyze_symptoms(text, matches=matches)
+    blocks = [block for category, (_, block) in SYMPTOM_CATEGORIES.items() if category in matches]
+    assert [category for category in SYMPTOM_CATEGORIES if category in matches] == ["digestive", "respiratory", "pain"]
+    assert "".join(blocks) in advice
+    assert GENERAL_ADVICE not in advice
+    assert is_emergency(text, matches)
+
+    assert GENERAL_ADVICE in analyze_symptoms("вялый")
+    assert not is_emergency("вялый")
@@ -0,0 +1,89 @@
+"""
+Tests for the single-statement user upsert run by /start
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import func, select, text, update
+
+from app.database import AsyncSessionLocal, User, count_queries, crud
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.postgres]
+
+
+async def _row_version(telegram_id: int) -> int:
+    """xmin of the user's row; changes on every write"""
+    async with AsyncSessionLocal() as session:
+        return await session.scalar(
+            text("SELECT xmin::text::bigint FROM users WHERE telegram_id = :telegram_id"),
+            {"telegram_id": telegram_id},
+        )
+
+
+async def _upsert(telegram_id: int, **fields) -> User:
+    async with AsyncSessionLocal() as session:
+        with count_queries() as counter:
+            user = await crud.upsert_user(session, telegram_id, **fields)
+        await session.commit()
+    assert counter.count == 1
+    return user
+
+
+async def test_first_upsert_inserts(db):
+    user = await _upsert(1, username="rex", first_name="Rex", language="en")
+
+    assert user.id is not None
+    assert (user.username, user.first_name, user.last_name, user.language) == ("rex", "Rex", None, "en")
+    assert user.is_active
+
+
+async def test_unchanged_user_is_not_written(db):
+    created = await _upsert(1, username="rex", first_name="Rex")
+    version = await _row_version(1)
+
+    user = await _upsert(1, username="rex", first_name="Rex", language="uz")
+
+    assert user.id == created.id
+    assert user.updated_at == created.updated_at
+    assert user.language == "ru"
+    assert await _row_version(1) == version
+
+
+async def test_changed_fields_are_updated(db):
+    created = await _upsert(1, username="rex", first_name="Rex", language="en")
+    async with AsyncSessionLocal() as session:
+        await session.execute(update(User).where(User.telegram_id == 1).values(is_active=False))
+        await session.commit()
+
+    user = await _upsert(1, username="rex2", first_name="Rex", last_name="Dog", language="uz")
+
+    assert user.id == created.id
+    assert (user.username, user.first_name, user.last_name) == ("rex2", "Rex", "Dog")
+    assert user.language == "en"
+    assert user.is_active
+    assert user.updated_at > created.updated_at
+
+    # Coming back after blocking the bot reactivates an otherwise unchanged user
+    async with AsyncSessionLocal() as session:
+        await session.execute(update(User).where(User.telegram_id == 1).values(is_active=False))
+        await session.commit()
+    assert (await _upsert(1, username="rex2", first_name="Rex", last_name="Dog")).is_active
+
+
+async def test_concurrent_start_creates_one_row(db):
+    async with AsyncSessionLocal() as first, AsyncSessionLocal() as second:
+        inserted = await crud.upsert_user(first, 1, username="rex")
+
+        # The second insert waits on the first one's uncommitted row
+        waiting = asyncio.create_task(crud.upsert_user(second, 1, username="rex"))
+        await asyncio.sleep(0.2)
+        assert not waiting.done()
+
+        await first.commit()
+        user = await asyncio.wait_for(waiting, timeout=5)
+        await second.commit()
+
+    assert user.id == inserted.id
+    async with AsyncSessionLocal() as session:
+        assert await session.scalar(select(func.count()).select_from(User)) == 1